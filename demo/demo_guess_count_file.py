@@ -1,5 +1,6 @@
 from sys import path as sys_path
 from os import path as os_path
+import os
 from subprocess import Popen, PIPE
 import time
 import logging
@@ -13,12 +14,15 @@ from config import john_nick_names, hc_nick_names
 from common import PasswordPolicyConf, FilePath
 from argparsing import setup_args, parse_args
 from guess_count import GuessCount
-from tokenstr import TokenString
-from utility import read_passwords,read_wordlist,read_rulelist,get_look_cmd,build_trie_from_wordlist
+from utility import read_passwords_in_chunks,read_wordlist,read_rulelist,get_look_cmd,get_wordlist_trie
 from utility import filter_passwords_with_password_policy
+from utility import get_checkpoint_key, store_checkpoint, restore_checkpoint, remove_checkpoint
 from preprocess import precomputation
-from invert_rule import invert_one_rule
-from demo_common import match_inversion_result, search_exist_data, search_trie, estimate_guess_number
+from results_writer import ResultsWriter
+from wordlist_stats import get_wordlist_stats
+from profiler import INVERSION_PROFILE
+from demo_common import invert_rules_for_passwords_in_parallel, log_inversion_events, start_inversion_pool, close_inversion_pool, close_bash_process
+from demo_common import deduplicate_passwords, fan_out_events, RulelistIndex
 
 
 def start_processing():
@@ -27,7 +31,7 @@ def start_processing():
     Steps:
         1. read rulelist and do precomputation (detect invertibility)
         2. read wordlist/pwlist, and get count for each rule
-        3. Rule Inversion (for each rule, invert all pwds)
+        3. Rule Inversion (for each chunk of pwds, for each rule, invert all pwds in the chunk)
     """
 
     stime = time.perf_counter()
@@ -36,16 +40,28 @@ def start_processing():
     # initialize a bash exe for communication
     external_bash_process = Popen(['/bin/bash'], stdin=PIPE, stdout=PIPE)
 
+    # Restore the last checkpoint, drop the log written after it
+    checkpoint_key = get_checkpoint_key()
+    checkpoint = restore_checkpoint(checkpoint_key) if RUNTIME_CONFIG['resume'] == True else None
+    if checkpoint is not None:
+        print("Resuming From Checkpoint: {} Passwords Done\n".format(checkpoint['number_of_pwds']))
+        with open(RUNTIME_CONFIG.get_log_addr(), 'r+b') as f:
+            f.truncate(checkpoint['log_size'])
+    elif RUNTIME_CONFIG['resume'] == True:
+        print("Warning: No Checkpoint Found, Starting From Scratch\n")
+
     # Logging Basic Info
     logging.basicConfig(filename=RUNTIME_CONFIG.get_log_addr(),level=logging.DEBUG)
-    logging.info("Starting Time: {}\n\nConfigurations: {}\n".format(time.strftime("%Y-%m-%d %H:%M"), RUNTIME_CONFIG.short_config_string()))
-    logging.info("PasswordPolicy: {}\n".format(RUNTIME_CONFIG['password_policy'].to_debug_string()))
+    if checkpoint is None:
+        logging.info("Starting Time: {}\n\nConfigurations: {}\n".format(time.strftime("%Y-%m-%d %H:%M"), RUNTIME_CONFIG.short_config_string()))
+        logging.info("PasswordPolicy: {}\n".format(RUNTIME_CONFIG['password_policy'].to_debug_string()))
 
     print("Reading Rulelist\n")
     rulelist = read_rulelist(RUNTIME_CONFIG['rulelist_path']['name'], RUNTIME_CONFIG['rulelist_path']['prefix'])
 
     print("Start Precomputation\n")
     rulelist = precomputation(rulelist)
+    rulelist_index = RulelistIndex(rulelist)
 
     print("Reading Wordlist and Password Set\n")
     wordlist = read_wordlist(RUNTIME_CONFIG['wordlist_path']['name'], RUNTIME_CONFIG['wordlist_path']['prefix'])
@@ -54,100 +70,77 @@ def start_processing():
     counts, cumsum = GuessCount.get_counts(wordlist, rulelist, RUNTIME_CONFIG['preprocess_path'])
 
     # read other things
-    pwlist = read_passwords(RUNTIME_CONFIG['pwlist_path']['addr'])
-    # filter out pwds not consistent with the policy
-    not_filtered_pwds, filtered_pwds = filter_passwords_with_password_policy(pwlist)
-    trie = build_trie_from_wordlist(wordlist)
+    trie = get_wordlist_trie(wordlist)
+    wordlist_stats = get_wordlist_stats(wordlist) if RUNTIME_CONFIG['wordlist_pruning'] == True else None
 
     ##################### Start Inversion #####################
     print("Start Inverting Rules\n")
     i_time = time.perf_counter()
-    # guessability of pwds
-    is_guessable = [False] * len(pwlist)
-    is_enable_regex = RUNTIME_CONFIG['enable_regex']
-    is_debug = RUNTIME_CONFIG['debug']
-    lookup_threshold = RUNTIME_CONFIG['lookup_threshold']
-    # tokenize pwds once.
-    tokenized_pwds = [TokenString(pwd) for pw_idx, pwd in not_filtered_pwds]
-
-    # invert rules (with special memory handling and other staff)
-    for r_idx, r in enumerate(rulelist):
-        if is_debug == True:
-            print(r.raw)
-            
-        if r.feasibility.is_invertible(): # invertible, if blow up, use trie
-            for token_pwd, (pw_idx, pwd) in zip(tokenized_pwds,not_filtered_pwds):
-                result = invert_one_rule(token_pwd,r,is_enable_regex,r.feasibility.special_idx)
-                if result.is_normal():
-                    if result.get_number_of_strings() <= lookup_threshold:
-                        ret_vals = match_inversion_result(result, wordlist)
-                    else:
-                        ret_vals = search_trie(result, trie)
-
-                    if len(ret_vals) != 0:
-                        is_guessable[pw_idx] = True
-                        for v in ret_vals:
-                            logging.info("\nPasswordIdx:{}\nPassword:{}\nRule:{}\nWord:{}\nGuess:{} ( {} - {} )\n".format(pw_idx, pwd, r.raw, v, *estimate_guess_number(counts, cumsum, v, r_idx, wordlist)))
-
-                elif result.is_out_of_scope():
-                    ret_vals = []
-                    logging.info("Inversion error for {}(RL) {}(pw), error msg: {}\n".format(r.raw, pwd, "out_of_scope"))
-                    print("Inversion error for {}(RL) {}(pw), error msg: {}".format(r.raw, pwd, "out_of_scope"))
-
-                else:
-                    ret_vals = []
-                    logging.info("Inversion error for {}(RL) {}(pw), error msg: {}\n".format(r.raw, pwd, result.error_msg))
-                    print("Inversion error for {}(RL) {}(pw), error msg: {}".format(r.raw, pwd, result.error_msg))
-
-        elif r.feasibility.is_optimizable(): # uninvertible, if cannot handle, binary
-            # where the binary file is stored
-            enumerated_data_addr = "{}/enumerated/rule{}.txt".format(RUNTIME_CONFIG['preprocess_path'],r_idx)
-            for token_pwd, (pw_idx, pwd) in zip(tokenized_pwds,not_filtered_pwds):
-                result = invert_one_rule(token_pwd,r,is_enable_regex)
-
-                if result.is_normal():
-                    if result.get_number_of_strings() <= lookup_threshold:
-                        ret_vals = match_inversion_result(result, wordlist)
-                    else:
-                        ret_vals = search_exist_data(pwd,enumerated_data_addr,external_bash_process)
-                    
-                    if len(ret_vals) != 0:
-                        is_guessable[pw_idx] = True
-                        for v in ret_vals:
-                            logging.info("\nPasswordIdx:{}\nPassword:{}\nRule:{}\nWord:{}\nGuess:{} ( {} - {} )\n".format(pw_idx, pwd, r.raw, v, *estimate_guess_number(counts, cumsum, v, r_idx, wordlist)))
-
-                elif result.is_out_of_scope():
-                    ret_vals = search_exist_data(pwd,enumerated_data_addr,external_bash_process)
-                    if len(ret_vals) != 0:
-                        is_guessable[pw_idx] = True
-                        for v in ret_vals:
-                            logging.info("\nPasswordIdx:{}\nPassword:{}\nRule:{}\nWord:{}\nGuess:{} ( {} - {} )\n".format(pw_idx, pwd, r.raw, v, *estimate_guess_number(counts, cumsum, v, r_idx, wordlist)))
-                else:
-                    ret_vals = []
-                    logging.info("Inversion error for {}(RL) {}(pw), error msg: {}\n".format(r.raw, pwd, result.error_msg))
-                    print("Inversion error for {}(RL) {}(pw), error msg: {}".format(r.raw, pwd, result.error_msg))
-
-        else: # binary
-            # where the binary file is stored
-            enumerated_data_addr = "{}/enumerated/rule{}.txt".format(RUNTIME_CONFIG['preprocess_path'],r_idx)
-            for token_pwd, (pw_idx, pwd) in zip(tokenized_pwds,not_filtered_pwds):
-                ret_vals = search_exist_data(pwd,enumerated_data_addr,external_bash_process)
-
-                if len(ret_vals) != 0:
-                    is_guessable[pw_idx] = True
-                    for v in ret_vals:
-                        logging.info("\nPasswordIdx:{}\nPassword:{}\nRule:{}\nWord:{}\nGuess:{} ( {} - {} )\n".format(pw_idx, pwd, r.raw, v, *estimate_guess_number(counts, cumsum, v, r_idx, wordlist)))
+    number_of_pwds = 0
+    is_text_log = RUNTIME_CONFIG['text_log']
+    results_writer = None
+    if RUNTIME_CONFIG['results_format'] is not None:
+        results_writer = ResultsWriter(RUNTIME_CONFIG.get_results_prefix(), RUNTIME_CONFIG['results_format'], state=checkpoint['results'] if checkpoint is not None else None)
+    # fork the workers once, all chunks are sharded across them
+    pool = start_inversion_pool(rulelist, wordlist, trie, counts, cumsum, RUNTIME_CONFIG['workers'], wordlist_stats, rulelist_index)
+
+    # read pwds in chunks, so only one chunk is in memory at a time
+    for pwlist in read_passwords_in_chunks(RUNTIME_CONFIG['pwlist_path']['addr'], RUNTIME_CONFIG['chunk_size']):
+        # skip chunks done before the checkpoint
+        if checkpoint is not None and number_of_pwds < checkpoint['number_of_pwds']:
+            number_of_pwds += len(pwlist)
+            continue
+
+        # filter out pwds not consistent with the policy
+        not_filtered_pwds, filtered_pwds = filter_passwords_with_password_policy(pwlist, number_of_pwds)
+        number_of_pwds += len(pwlist)
+
+        # invert each distinct pwd once
+        pwds = [(pos, pwd) for pos, (pw_idx, pwd) in enumerate(not_filtered_pwds)]
+        distinct_pwds, duplicates = deduplicate_passwords(pwds)
+        if RUNTIME_CONFIG['debug'] == True:
+            print("Inverting {} distinct passwords out of {}\n".format(len(distinct_pwds), len(pwds)))
+
+        # invert rules (with special memory handling and other staff), shard pwds across workers
+        events = invert_rules_for_passwords_in_parallel(rulelist, distinct_pwds, wordlist, trie, counts, cumsum, external_bash_process, RUNTIME_CONFIG['workers'], wordlist_stats, rulelist_index, pool)
+        events = fan_out_events(events, duplicates)
+        # guessability of pwds
+        min_guesses = log_inversion_events(events, rulelist, not_filtered_pwds, wordlist, results_writer, is_text_log)
+
+        # Write Not Guessable Data
+        if is_text_log == True:
+            for pw_idx, pwd in filtered_pwds:
+                logging.info("\nPasswordIdx:{}\nPassword:{}\nNot Guessable\n".format(pw_idx, pwd))
+
+            for pos, (pw_idx, pwd) in enumerate(not_filtered_pwds):
+                if pos not in min_guesses:
+                    logging.info("\nPasswordIdx:{}\nPassword:{}\nNot Guessable\n".format(pw_idx, pwd))
+
+        # Write min guess of each pwd
+        if results_writer is not None:
+            min_guess_of_pwds = {pw_idx: min_guesses.get(pos) for pos, (pw_idx, pwd) in enumerate(not_filtered_pwds)}
+            for pw_idx in range(number_of_pwds - len(pwlist), number_of_pwds):
+                results_writer.add_summary(pw_idx, min_guess_of_pwds.get(pw_idx))
+
+        # Save progress after each chunk
+        store_checkpoint(checkpoint_key, {
+            'number_of_pwds': number_of_pwds,
+            'log_size': os.path.getsize(RUNTIME_CONFIG.get_log_addr()),
+            'results': results_writer.checkpoint() if results_writer is not None else None,
+        })
+
     ##################### End of Inversion #####################
-    
-    # Write Not Guessable Data
-    for pw_idx, pwd in filtered_pwds:
-        logging.info("\nPasswordIdx:{}\nPassword:{}\nNot Guessable\n".format(pw_idx, pwd))
+    close_inversion_pool(pool)
+    close_bash_process(external_bash_process)
+
+    if results_writer is not None:
+        results_writer.close()
 
-    for is_guessed, (pw_idx, pwd) in zip(is_guessable, not_filtered_pwds):
-        if is_guessed == False:
-            logging.info("\nPasswordIdx:{}\nPassword:{}\nNot Guessable\n".format(pw_idx, pwd))
+    if RUNTIME_CONFIG['profile'] == True:
+        INVERSION_PROFILE.write(RUNTIME_CONFIG.get_results_prefix(), rulelist)
 
     logging.info("Total guesses made by this configuration: {}\n".format(np.sum(counts)))
+    remove_checkpoint(checkpoint_key)
 
     print("Finished Inverting Rules, Total Time: {}".format(time.perf_counter()-i_time))
 
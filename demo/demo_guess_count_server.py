@@ -0,0 +1,160 @@
+from sys import path as sys_path
+from os import path as os_path
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from collections import deque
+import threading
+import time
+import json
+import numpy as np
+
+sys_path.append(os_path.abspath('../src'))
+
+from config import RUNTIME_CONFIG
+from argparsing import setup_args, parse_args
+from estimator import GuessNumberEstimator
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    """ An HTTPServer that serves each client in its own thread (http.server has one only since Python 3.7) """
+    daemon_threads = True
+
+
+class EstimationService():
+    """ Keeps a GuessNumberEstimator in memory, answers guess number queries and records their latency.
+
+    Everything is loaded once in the constructor, so a query only pays for the inversion.
+    """
+
+    def __init__(self, estimator, latency_window=10000):
+        """ Args:
+            estimator: a GuessNumberEstimator
+
+            latency_window: number of most recent queries used for latency statistics
+        """
+        self.estimator = estimator
+        self.stats_lock = threading.Lock()
+        self.latencies = deque(maxlen=latency_window)
+        self.number_of_queries = 0
+        self.number_of_passwords = 0
+
+    def estimate(self, passwords):
+        """ Return the guesses of each password, in the same order as passwords """
+        stime = time.perf_counter()
+        results = self.estimator.estimate_many(passwords)
+        latency = time.perf_counter() - stime
+
+        with self.stats_lock:
+            self.latencies.append(latency)
+            self.number_of_queries += 1
+            self.number_of_passwords += len(passwords)
+
+        return results
+
+    def get_stats(self):
+        """ Return the number of queries and latency percentiles (in ms) of the most recent queries """
+        with self.stats_lock:
+            latencies = np.array(self.latencies) * 1000
+            stats = {
+                'queries': self.number_of_queries,
+                'passwords': self.number_of_passwords,
+                'window': len(latencies),
+            }
+
+        for name, q in (('p50_ms', 50), ('p99_ms', 99)):
+            stats[name] = float(np.percentile(latencies, q)) if len(latencies) != 0 else None
+
+        return stats
+
+
+class EstimationRequestHandler(BaseHTTPRequestHandler):
+    """ JSON endpoints of the estimation server.
+
+    POST /estimate with {"passwords": [...]} returns {"results": [...], "latency_ms": ...}
+    GET /stats returns the number of queries and p50/p99 latency
+    """
+
+    def do_POST(self):
+        if self.path != '/estimate':
+            self.send_json(404, {'error': 'Unknown path {}'.format(self.path)})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            passwords = json.loads(self.rfile.read(length).decode('utf-8'))['passwords']
+            if not isinstance(passwords, list) or not all(isinstance(pwd, str) for pwd in passwords):
+                raise ValueError("passwords should be a list of strings")
+        except (ValueError, KeyError, TypeError) as e:
+            self.send_json(400, {'error': 'Bad request: {}'.format(e)})
+            return
+
+        stime = time.perf_counter()
+        results = self.server.service.estimate(passwords)
+        self.send_json(200, {'results': results, 'latency_ms': (time.perf_counter() - stime) * 1000})
+
+    def do_GET(self):
+        if self.path != '/stats':
+            self.send_json(404, {'error': 'Unknown path {}'.format(self.path)})
+            return
+
+        self.send_json(200, self.server.service.get_stats())
+
+    def send_json(self, code, content):
+        body = json.dumps(content).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if RUNTIME_CONFIG['debug'] == True:
+            BaseHTTPRequestHandler.log_message(self, format, *args)
+
+
+def start_server(host, port):
+    """ Load everything once, then answer queries until interrupted. Each client is served in its own thread. """
+    estimator = GuessNumberEstimator(
+        RUNTIME_CONFIG['wordlist_path']['addr'],
+        RUNTIME_CONFIG['rulelist_path']['addr'],
+        RUNTIME_CONFIG['running_style'],
+        RUNTIME_CONFIG['password_policy'],
+        preprocess_path=RUNTIME_CONFIG['preprocess_path'],
+        debug=RUNTIME_CONFIG['debug'],
+        first_crack_only=RUNTIME_CONFIG['first_crack_only'],
+        token_type=RUNTIME_CONFIG['token_type'],
+        wordlist_pruning=RUNTIME_CONFIG['wordlist_pruning'],
+        trie_guided_inversion=RUNTIME_CONFIG['trie_guided_inversion'],
+        trie_cache=RUNTIME_CONFIG['trie_cache'],
+        reversed_trie=RUNTIME_CONFIG['reversed_trie'],
+        optimizable_trie_search=RUNTIME_CONFIG['optimizable_trie_search'])
+    service = EstimationService(estimator)
+
+    server = ThreadingHTTPServer((host, port), EstimationRequestHandler)
+    server.service = service
+
+    print("Serving on http://{}:{}\n".format(*server.server_address[:2]))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        estimator.close()
+        print("Stats: {}".format(service.get_stats()))
+
+def main():
+
+    args = setup_args(is_server=True) # set up args
+
+    try:
+        parse_args(args) # parse args
+
+    except:
+        raise
+
+    start_server(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
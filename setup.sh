@@ -6,7 +6,7 @@ cd analytic-password-cracking
 
 python3 -m pip install numpy==1.13.1 --user
 python3 -m pip install pyparsing==2.2.0 --user
-python3 -m pip install cython==0.26.1 --user
+python3 -m pip install cython==0.29.37 --user
 
 git submodule init 
 git submodule update
@@ -2,11 +2,16 @@
 
 import argparse
 from config import john_nick_names, hc_nick_names, RUNTIME_CONFIG
-from common import PasswordPolicyConf, FilePath
+from common import PasswordPolicyConf, FilePath, FatalRuntimeError
+from results_writer import RESULTS_FORMATS
 
 
-def setup_args():
-    """ set up valid args and parse them. """
+def setup_args(is_server=False):
+    """ set up valid args and parse them.
+
+    Args:
+        is_server: if True, set up args for the estimation server, which takes passwords from requests instead of a test set.
+    """
     parser = argparse.ArgumentParser()
     # Parse Command Line Flags
     # pointing to the wordlist
@@ -25,14 +30,28 @@ def setup_args():
         dest='rulelist_addr',
         help='Pointing To rule list',
         required=True)
-    # pointing to the test set
-    parser.add_argument(
-        '-p',
-        '--pw',
-        action='store',
-        dest='pwlist_addr',
-        help='Pointing to test/victim set',
-        required=True)
+    if is_server == False:
+        # pointing to the test set
+        parser.add_argument(
+            '-p',
+            '--pw',
+            action='store',
+            dest='pwlist_addr',
+            help='Pointing to test/victim set',
+            required=True)
+    else:
+        # address the estimation server listens on
+        parser.add_argument(
+            '--host',
+            action='store',
+            help='Host the estimation server listens on',
+            default='127.0.0.1')
+        parser.add_argument(
+            '--port',
+            action='store',
+            help='Port the estimation server listens on',
+            type=int,
+            default=8080)
     # debug lvl
     parser.add_argument(
         "-d",
@@ -47,6 +66,100 @@ def setup_args():
         help="Run the program in JtR/HC style",
         choices=john_nick_names + hc_nick_names,
         required=True)
+    if is_server == False:
+        # number of processes used for inversion
+        parser.add_argument(
+            '--workers',
+            action='store',
+            help='Number of processes used for inversion',
+            type=int,
+            default=1)
+    # only report the smallest guess number of each password
+    parser.add_argument(
+        '--first-crack',
+        action='store_true',
+        dest='first_crack',
+        help='Only report the smallest guess number of each password',
+        default=False)
+    if is_server == False:
+        # number of passwords read and inverted at a time
+        parser.add_argument(
+            '--chunk-size',
+            action='store',
+            dest='chunk_size',
+            help='Number of passwords read and inverted at a time, a checkpoint is written after each chunk',
+            type=int,
+            default=None)
+        # write structured results
+        parser.add_argument(
+            '--results-format',
+            action='store',
+            dest='results_format',
+            help='Write structured results in npy/csv format',
+            choices=RESULTS_FORMATS,
+            default=None)
+        # don't write each guess to the text log
+        parser.add_argument(
+            '--no-text-log',
+            action='store_true',
+            dest='no_text_log',
+            help="Don't write each guess to the text log",
+            default=False)
+        # continue from the last checkpoint
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Continue from the last checkpoint',
+            default=False)
+        # record the cost of each rule and inversion command
+        parser.add_argument(
+            '--profile',
+            action='store_true',
+            help='Write the cost of each rule and inversion command',
+            default=False)
+    # how the set of chars of each position is stored
+    parser.add_argument(
+        '--token-type',
+        action='store',
+        dest='token_type',
+        help='Store the chars of each position as a set or a bitmask, or the whole tokenstring as an array',
+        choices=['set', 'bitmask', 'array'],
+        default='set')
+    # don't prune preimages with wordlist statistics
+    parser.add_argument(
+        '--no-wordlist-pruning',
+        action='store_true',
+        dest='no_wordlist_pruning',
+        help="Don't prune preimages to the lengths and chars of words in the wordlist",
+        default=False)
+    # don't walk the trie to invert rules starting with truncation
+    parser.add_argument(
+        '--no-trie-guided-inversion',
+        action='store_true',
+        dest='no_trie_guided_inversion',
+        help="Look up enumerated data for rules starting with 'N or HC xNM, instead of walking the trie",
+        default=False)
+    # don't save/map the trie of the wordlist
+    parser.add_argument(
+        '--no-trie-cache',
+        action='store_true',
+        dest='no_trie_cache',
+        help="Build the trie and the stats of the wordlist in each run, instead of using the ones saved in preprocess_path",
+        default=False)
+    # also build the trie of reversed words
+    parser.add_argument(
+        '--reversed-word-trie',
+        action='store_true',
+        dest='reversed_trie',
+        help="Also build the trie of reversed words, and search each preimage from its narrower end",
+        default=False)
+    # search preimages of uninvertible rules in the trie
+    parser.add_argument(
+        '--trie-search-uninvertible',
+        action='store_true',
+        dest='optimizable_trie_search',
+        help="Search preimages of uninvertible rules in the trie when there are more than lookup_threshold, instead of looking up enumerated data",
+        default=False)
     # whether to enable regex
     # parser.add_argument('--enable_regex', action='store_true', help='Whether to enable regex', default=False)
 
@@ -103,13 +216,57 @@ def parse_args(args):
     # parse pathes
     RUNTIME_CONFIG['wordlist_path'] = FilePath(args.wordlist_addr)
     RUNTIME_CONFIG['rulelist_path'] = FilePath(args.rulelist_addr)
-    RUNTIME_CONFIG['pwlist_path'] = FilePath(args.pwlist_addr)
+    if getattr(args, 'pwlist_addr', None) is not None:
+        RUNTIME_CONFIG['pwlist_path'] = FilePath(args.pwlist_addr)
 
     # parse other flags
     # if args.enable_regex:
     #RUNTIME_CONFIG['enable_regex'] = True
     #print("Warning: Regex Is Slow and Only For Demo Purpose, Should Be Disabled in Real Running\n")
 
+    if args.first_crack == True:
+        RUNTIME_CONFIG['first_crack_only'] = True
+
+    # the server takes passwords from requests, it has no test set to split, log or profile
+    if getattr(args, 'pwlist_addr', None) is not None:
+        if args.workers < 1:
+            raise FatalRuntimeError("Number of workers should be at least 1")
+        RUNTIME_CONFIG['workers'] = args.workers
+
+        if args.chunk_size is not None:
+            if args.chunk_size < 1:
+                raise FatalRuntimeError("Chunk size should be at least 1")
+            RUNTIME_CONFIG['chunk_size'] = args.chunk_size
+
+        if args.results_format is not None:
+            RUNTIME_CONFIG['results_format'] = args.results_format
+
+        if args.no_text_log == True:
+            RUNTIME_CONFIG['text_log'] = False
+
+        if args.resume == True:
+            RUNTIME_CONFIG['resume'] = True
+
+        if args.profile == True:
+            RUNTIME_CONFIG['profile'] = True
+
+    RUNTIME_CONFIG['token_type'] = args.token_type
+
+    if args.no_wordlist_pruning == True:
+        RUNTIME_CONFIG['wordlist_pruning'] = False
+
+    if args.no_trie_guided_inversion == True:
+        RUNTIME_CONFIG['trie_guided_inversion'] = False
+
+    if args.no_trie_cache == True:
+        RUNTIME_CONFIG['trie_cache'] = False
+
+    if args.reversed_trie == True:
+        RUNTIME_CONFIG['reversed_trie'] = True
+
+    if args.optimizable_trie_search == True:
+        RUNTIME_CONFIG['optimizable_trie_search'] = True
+
     if args.debug == True:
         RUNTIME_CONFIG['debug'] = True
         print("Enabling Extra Debug Information\n")
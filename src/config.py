@@ -3,6 +3,8 @@
 from common import RunningStyle, PasswordPolicyConf
 from copy import deepcopy
 from sys import platform
+from contextlib import contextmanager
+import threading
 
 # possible jtr names
 john_nick_names = [
@@ -13,19 +15,10 @@ hc_nick_names = ['h', 'hc', 'HC', 'hashcat', 'H', 'Hashcat', 'Hc']
 
 # For detailed information about what each field means, please refer to readme.md
 
-# jtr's default configuration
-jtr_default_config = {
-    'running_style':
-    RunningStyle.JTR,
-    'max_password_length':
-    127,  # input/output greater than this are ignored
-    'min_cut_length':
-    128,  # max_password_length + 1
+# default configuration shared by jtr and hc
+common_default_config = {
     'm_threshold':
     2,
-    'executable_path':
-    "../JohnTheRipper/run/john"
-    if platform != "win32" else "../JohnTheRipper/run/john.exe",
     'password_policy':
     PasswordPolicyConf(),
     'preprocess_path':
@@ -38,7 +31,46 @@ jtr_default_config = {
     'look',
     'lookup_threshold':
     131073, #2^17 + 1
+    'workers':
+    1, # number of processes used for inversion
+    'first_crack_only':
+    False, # only report the smallest guess number of each password
+    'chunk_size':
+    100000, # number of passwords read and inverted at a time, None for the whole file. a checkpoint is written after each chunk
+    'results_format':
+    None, # write structured results (npy/csv), None for text log only
+    'text_log':
+    True, # write each guess to the text log
+    'resume':
+    False, # continue from the last checkpoint, checkpoints are written after each chunk
+    'profile':
+    False, # record the cost of each rule and inversion command
+    'token_type':
+    "set", # how a tokenstring stores its chars: set/bitmask for each position, or array for the whole tokenstring
+    'wordlist_pruning':
+    True, # prune preimages to the lengths and chars of words in the wordlist before lookups
+    'trie_guided_inversion':
+    True, # invert rules starting with 'N (truncate) or HC xNM by walking the trie, instead of looking up enumerated data
+    'trie_cache':
+    True, # save the trie and the stats of the wordlist in preprocess_path once, and map/load them in later runs
+    'reversed_trie':
+    False, # also build the trie of reversed words, tokenstrings narrower at the end are searched from the end
+    'optimizable_trie_search':
+    False, # search preimages of uninvertible rules in the trie if there are too many, instead of looking up enumerated data
+}
 
+# jtr's default configuration
+jtr_default_config = {
+    'running_style':
+    RunningStyle.JTR,
+    'max_password_length':
+    127,  # input/output greater than this are ignored
+    'min_cut_length':
+    128,  # max_password_length + 1
+    'executable_path':
+    "../JohnTheRipper/run/john"
+    if platform != "win32" else "../JohnTheRipper/run/john.exe",
+    **common_default_config,
 }
 
 # hc's default configuration
@@ -49,23 +81,10 @@ hc_default_config = {
     255,  # input/output greater than this are ignored
     'min_cut_length':
     256,  # max_password_length + 1
-    'm_threshold':
-    2,
     'executable_path':
     "../HashcatRulesEngine/hcre"
     if platform != "win32" else "../HashcatRulesEngine/hcre.exe",
-    'password_policy':
-    PasswordPolicyConf(),
-    'preprocess_path':
-    '../data/preprocess/',
-    'enable_regex':
-    False,
-    'debug':
-    False,
-    'binary_search_file_executable': # pointing to the executable for binary searching a sorted file
-    'look',
-    'lookup_threshold':
-    131073, #2^17 + 1
+    **common_default_config,
     'batch_size_of_words':
     1024 * 1024,
     'batch_size_of_rules':
@@ -76,7 +95,11 @@ hc_default_config = {
 
 
 class Configuration():
-    """ Contains the running config, it constructs a dictioanry """
+    """ Contains the running config, it constructs a dictioanry
+
+    A configuration can be bound to another one in the current thread (see bind),
+    then all reads and writes go to the bound configuration in that thread.
+    """
 
     def __init__(self, running_style=RunningStyle.JTR, **kwargs):
         """ Initialize a configuration dict.
@@ -85,12 +108,45 @@ class Configuration():
             running_style: either JTR/HC
             kwargs: optional args, set specific field in the dictionary.
         """
+        self._local = threading.local()
         self.config = deepcopy(
             hc_default_config
         ) if running_style == RunningStyle.HC else deepcopy(jtr_default_config)
         for k, v in kwargs.items():
             self.config[k] = v
 
+    @property
+    def config(self):
+        """ the dictionary bound in the current thread, or the configuration's own one """
+        bound = getattr(self._local, 'config', None)
+        return bound if bound is not None else self._config
+
+    @config.setter
+    def config(self, config):
+        bound = getattr(self._local, 'config', None)
+        if bound is not None:
+            # update in place, so the bound configuration sees the change
+            bound.clear()
+            bound.update(config)
+        else:
+            self._config = config
+
+    @contextmanager
+    def bind(self, conf):
+        """ Use conf instead of this configuration in the current thread, within the with block.
+
+        Other threads are not affected, so several configurations can run at the same time.
+
+        Args:
+            conf: a Configuration, changes made within the block go to it
+        """
+        previous = getattr(self._local, 'config', None)
+        self._local.config = conf.config
+        try:
+            yield conf
+        finally:
+            self._local.config = previous
+
     def __setitem__(self, key, item):
         self.config[key] = item
 
@@ -125,7 +181,11 @@ class Configuration():
 
     def get_log_addr(self):
         """ get log file addr"""
-        return "../results/demo_file-{}-{}-{}.log".format(
+        return "{}.log".format(self.get_results_prefix())
+
+    def get_results_prefix(self):
+        """ get address of results files, without extension """
+        return "../results/demo_file-{}-{}-{}".format(
             self['wordlist_path']['name'], self['rulelist_path']['name'],
             self['pwlist_path']['name'])
 
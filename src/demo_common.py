@@ -1,30 +1,74 @@
 """ functions used for demo """
-from utility import get_look_cmd
+from utility import get_look_cmd, convert_str_length_to_int
 from config import RUNTIME_CONFIG
+from tokenstr import tokenize, RegexTokenString, Token
+from invert_rule import invert_one_rule, invert_one_rule_batch, is_batch_rule, RuleSuffixTrie
+from invert_rule import invert_one_subrule, InversionResult, CompiledTransformation
+from profiler import InversionProfile, INVERSION_PROFILE
+from rule_signature import RuleSignature, PasswordFeatures
+from time import perf_counter
+from subprocess import Popen, PIPE
+from sys import platform
+from itertools import chain
+from copy import deepcopy
+from multiprocessing.util import Finalize
+import multiprocessing
+import heapq
+import logging
+import gc
 import os
 
 
-def match_inversion_result(result, wordlist, is_regex=False):
-    """ Return All Mathced Results in wordlist """
+def unique_matches(matches):
+    """ matches without repeats, in the order first seen """
+    seen = set()
+    ret_vals = []
+    for one_string in matches:
+        if one_string not in seen:
+            seen.add(one_string)
+            ret_vals.append(one_string)
+    return ret_vals
+
+
+def match_inversion_result(result, wordlist, is_regex=False, trie=None):
+    """ Return All Mathced Results in wordlist
+
+    Preimages are streamed from result and probed one at a time, so only matches are kept.
+    A word matched by more than one tokenstring is returned once.
+    If is_regex, RegexTokenStrings in result are matched with their automata: walked together
+    with the trie of wordlist if given (see CharTrieWrapper.find_automaton), otherwise against each word.
+    """
     if result.is_null():
         return []
 
     if is_regex == False:
-        ret_vals = [
-            one_string for one_string in result.get_all_strings()
-            if (one_string in wordlist)
-        ]
+        matches = (one_string for one_string in result.iter_strings()
+                   if (one_string in wordlist))
 
-        if result.has_memory():
-            ret_vals = [
-                one_string for one_string in ret_vals
-                if result.is_memorized(one_string) == False
-            ]
+    else:
 
-        return ret_vals
+        def iter_matches(token_str):
+            if isinstance(token_str, RegexTokenString):
+                # compiled once, then each word is matched in O(len(word))
+                automaton = token_str.get_automaton()
+                if trie is not None:
+                    return search_automaton(automaton, wordlist, trie)
+                return (word for word in wordlist if automaton.matches(word))
+            return (one_string for one_string in token_str.iter_strings()
+                    if (one_string in wordlist))
 
-    else:
-        raise Exception("No Regex Implementation")
+        matches = chain.from_iterable(
+            iter_matches(token_str) for token_str in result)
+
+    ret_vals = unique_matches(matches)
+
+    if result.has_memory():
+        ret_vals = [
+            one_string for one_string in ret_vals
+            if result.is_memorized(one_string) == False
+        ]
+
+    return ret_vals
 
 
 def search_exist_data(password, enumerated_data_addr, external_bash_process):
@@ -54,28 +98,180 @@ def search_exist_data(password, enumerated_data_addr, external_bash_process):
 
 def search_trie(result, trie):
     """ trie search """
+    return search_trie_with_indices(result, trie)[0]
+
+
+def search_trie_with_indices(result, trie, is_first_only=False):
+    """ Trie search that also returns the index of each word in the wordlist (its value in the trie),
+    so the words found are not looked up in the wordlist again.
+
+    If is_first_only, only the word with the smallest index is returned. For one rule the guess number
+    grows with the index of the word, so it makes the smallest guess (first_crack_only mode).
+    Each tokenstring is then searched best-first, and the search stops at the first word.
+
+    Returns:
+        (ret_vals, indices): the words found and their indices
+    """
     if result.is_null():
-        return []
+        return [], []
 
-    # output
-    ret_vals = []
+    # memorized words are dropped after the search, so the first word may not count
+    is_first_only = is_first_only == True and result.has_memory() == False
 
+    matches = []
     for token_str in result:
-        ret_vals += trie.find(token_str)
+        if isinstance(token_str, RegexTokenString):
+            matches.append(search_trie_automaton(token_str, trie))
+        elif is_first_only == True:
+            first = trie.find_first(token_str)
+            matches.append([first] if first is not None else [])
+        else:
+            matches.append(trie.find(token_str, with_values=True))
 
-    if result.has_memory():
-        ret_vals = [
-            one_string for one_string in ret_vals
-            if result.is_memorized(one_string) == False
+    return get_matches_of_result(result, matches, is_first_only)
+
+
+def search_trie_batch(results, trie):
+    """ search_trie_with_indices for the results of many passwords at once.
+
+    The tokenstrings of all results are searched in one walk of the trie (CharTrieWrapper.find_many),
+    so a prefix shared by tokenstrings of several passwords is walked once.
+
+    Returns:
+        A list of (ret_vals, indices), one for each result
+    """
+    token_strs = [
+        token_str for result in results if result.is_null() == False
+        for token_str in result
+        if isinstance(token_str, RegexTokenString) == False
+    ]
+    found = iter(trie.find_many(token_strs, with_values=True))
+
+    ret_vals = []
+    for result in results:
+        if result.is_null():
+            ret_vals.append(([], []))
+            continue
+
+        matches = [
+            search_trie_automaton(token_str, trie) if isinstance(
+                token_str, RegexTokenString) else next(found)
+            for token_str in result
         ]
+        ret_vals.append(get_matches_of_result(result, matches))
 
     return ret_vals
 
 
-def estimate_guess_number(counts, cumsum, word, rule_idx, wordlist):
-    """ estimate guess number given word and rule and other info """
+def search_automaton(automaton, wordlist, trie):
+    """ Words of wordlist matched by a RegexAutomaton, walked together with the trie of wordlist.
+    The trie has no empty key, so the empty word (kept in HC) is matched on its own. """
+    words = trie.find_automaton(automaton)
+    if "" in wordlist and automaton.matches(""):
+        words.append("")
+    return words
+
+
+def search_trie_automaton(token_str, trie):
+    """ (word, index) of words matched by a RegexTokenString """
+    return [(word, trie.get_value(word))
+            for word in trie.find_automaton(token_str.get_automaton())]
+
+
+def get_matches_of_result(result, matches, is_first_only=False):
+    """ (ret_vals, indices) of a result, given the (word, index) matches of each of its tokenstrings """
+    matches = unique_matches(chain.from_iterable(matches))
+
+    if result.has_memory():
+        matches = [(word, idx) for word, idx in matches
+                   if result.is_memorized(word) == False]
+
+    if is_first_only == True and len(matches) != 0:
+        matches = [min(matches, key=lambda match: match[1])]
+
+    return [word for word, idx in matches], [idx for word, idx in matches]
+
+
+# the chars of a skipped position in a trie walk. keys are utf-8, so only ascii chars are one position
+ANY_ASCII_CHAR = "".join(chr(i) for i in range(1, 128))
 
-    word_idx = wordlist[word]
+
+def get_trie_guided_window(transformation):
+    """ (offset, length) of the chars kept by a compiled 'N or HC xNM, None if not one of them or the args don't parse """
+    try:
+        if transformation.name == "prime_N":
+            return 0, convert_str_length_to_int(transformation.transformation[1])
+
+        elif transformation.name == "x_N_M" and RUNTIME_CONFIG.is_hc():
+            offset = convert_str_length_to_int(transformation.transformation[1])
+            length = convert_str_length_to_int(transformation.transformation[2])
+            if length > 0:  # x_N_0 keeps words no longer than N
+                return offset, length
+
+    except BaseException:
+        return None
+
+    return None
+
+
+def is_trie_guided_rule(one_rule):
+    """ whether every subrule starts with 'N or HC xNM (keep a window of chars), see invert_and_search_trie """
+    if one_rule.feasibility.special_idx is not None or len(one_rule.rules) == 0:
+        return False
+
+    for subrule_plan in one_rule.get_plan(CompiledTransformation):
+        if len(subrule_plan) == 0 or get_trie_guided_window(
+                subrule_plan[0]) is None:
+            return False
+
+    return True
+
+
+def invert_and_search_trie(token_str, one_rule, wordlist, trie,
+                           lookup_threshold):
+    """ Invert a rule whose subrules start with 'N or HC xNM (see is_trie_guided_rule) by walking the trie.
+
+    Both keep length chars starting at offset ('N is offset 0, length N) and leave shorter words as they are.
+    Inverting them gives the tokenstring itself if it is shorter than the window, and the words holding it
+    at offset if its length is the window's, which no tokenstring represents. So the rest of each subrule
+    is inverted, shorter tokenstrings are looked up as usual, and a tokenstring of the window's length is
+    walked down the trie after offset chars, and every word below it is matched (see CharTrieWrapper.find_prefixed).
+
+    Returns:
+        (result, ret_vals): result is the inversion of the rest of the subrules,
+        ret_vals are the matched words if result is normal.
+    """
+    result = InversionResult()
+    shorter = InversionResult()
+    ret_vals = []
+    for subrule, subrule_plan in zip(one_rule.rules,
+                                     one_rule.get_plan(CompiledTransformation)):
+        rest = invert_one_subrule(
+            deepcopy(token_str), subrule[1:], subrule_plan=subrule_plan[1:])
+        if rest.is_normal() == False:
+            return rest, []
+
+        offset, length = get_trie_guided_window(subrule_plan[0])
+        for ts in rest:
+            if len(ts) < offset + length:
+                shorter.add(ts)
+            if len(ts) == length:
+                ret_vals += trie.find_prefixed(
+                    [Token(ANY_ASCII_CHAR) for _ in range(offset)] + ts.tokens)
+        result += rest
+
+    if shorter.get_number_of_strings() <= lookup_threshold:
+        ret_vals += match_inversion_result(shorter, wordlist)
+    else:
+        ret_vals += search_trie(shorter, trie)
+
+    return result, unique_matches(ret_vals)
+
+
+def estimate_guess_number(counts, cumsum, word, rule_idx, wordlist, word_idx=None):
+    """ estimate guess number given word and rule and other info, word_idx is wordlist[word] if known """
+    if word_idx is None:
+        word_idx = wordlist[word]
 
     if RUNTIME_CONFIG.is_jtr():
         # get lower and upper bound and estimate
@@ -111,6 +307,575 @@ def estimate_guess_number(counts, cumsum, word, rule_idx, wordlist):
     return estimated, lower_bound, upper_bound
 
 
+def get_lower_bound_of_rule(cumsum, rule_idx):
+    """ the smallest guess number any word can get with this rule """
+    if RUNTIME_CONFIG.is_jtr():
+        return cumsum[rule_idx - 1]
+
+    else:
+        # the first batch of words comes first
+        rule_batch_number = rule_idx // RUNTIME_CONFIG['batch_size_of_rules']
+        return cumsum[rule_batch_number - 1]
+
+
+class RulelistIndex():
+    """ What invert_rules_for_passwords derives from the rulelist alone.
+
+    It is built once for a preprocessed rulelist and shared by every chunk of passwords
+    and every worker shard, the same way counts and cumsum are.
+    """
+
+    def __init__(self, rulelist):
+        """ Build it for a preprocessed rulelist (see precomputation) """
+        # r_idx -> RuleSignature, None for rules that are enumerated or have special handling
+        self.signatures = [
+            RuleSignature(r) if
+            (r.feasibility.is_invertible() or r.feasibility.is_optimizable())
+            and r.feasibility.special_idx is None else None for r in rulelist
+        ]
+        # shares the inversion of transformations that rules end with, see RuleSuffixTrie
+        self.suffix_trie = RuleSuffixTrie(rulelist)
+
+
+def invert_rules_for_passwords(rulelist,
+                               pwds,
+                               wordlist,
+                               trie,
+                               counts,
+                               cumsum,
+                               external_bash_process,
+                               wordlist_stats=None,
+                               rulelist_index=None):
+    """ Invert every rule on every password, return what was found.
+
+    Rules are processed in order, and for each rule passwords are processed in order.
+    So the events come out sorted by (rule_idx, pos), which is the order they are logged in.
+
+    Rules ending with checks or appended/prepended chars are inverted for all passwords at once
+    (invert_one_rule_batch). Other rules are inverted through a RuleSuffixTrie, so the inversion
+    of trailing transformations shared by several rules is done once per password.
+    A rule skips passwords that don't meet the necessary conditions of its RuleSignature,
+    e.g. $1 skips passwords that don't end with 1.
+    With wordlist_stats, preimages are pruned to what words of the wordlist could match,
+    before they are looked up.
+
+    If first_crack_only is set, only the smallest guess of each password is returned,
+    and a (rule, password) pair is skipped once the lower bound of the rule is
+    not smaller than the best guess found so far for that password.
+
+    Args:
+        rulelist: preprocessed rulelist
+
+        pwds: a list of (pos, pwd). pos is the position of pwd in the list of passwords
+            that meet the password policy.
+
+        wordlist: the wordlist dict
+
+        trie: the trie built from the wordlist
+
+        counts, cumsum: guess counts of the configuration
+
+        external_bash_process: bash process used for binary search on enumerated data
+
+        wordlist_stats: WordlistStats of the wordlist, None to not prune preimages
+
+        rulelist_index: RulelistIndex of rulelist, None to build it for this call
+
+    Returns:
+        A list of events (rule_idx, pos, word, guess, error_msg).
+        For a guess, guess is (estimated, lower_bound, upper_bound) and error_msg is None.
+        For an inversion error, word and guess are None.
+    """
+    events = []
+    best_guesses = {}  # pos -> event with the smallest guess, first_crack_only mode
+
+    is_enable_regex = RUNTIME_CONFIG['enable_regex']
+    is_debug = RUNTIME_CONFIG['debug']
+    lookup_threshold = RUNTIME_CONFIG['lookup_threshold']
+    is_first_crack_only = RUNTIME_CONFIG['first_crack_only']
+    is_profile = RUNTIME_CONFIG['profile']
+    is_trie_guided = RUNTIME_CONFIG['trie_guided_inversion']
+    is_optimizable_trie_search = RUNTIME_CONFIG['optimizable_trie_search']
+    # tokenize pwds once.
+    tokenized_pwds = [tokenize(pwd) for pos, pwd in pwds]
+    tokenized_pwds_for_all_rules = list(zip(tokenized_pwds, pwds))
+    # to skip pwds a rule can't make
+    features = PasswordFeatures([pwd for pos, pwd in pwds])
+    if rulelist_index is None:
+        rulelist_index = RulelistIndex(rulelist)
+    # share inversion of common suffixes, one memo for each pwd
+    suffix_trie = rulelist_index.suffix_trie
+    memos = {pos: {} for pos, pwd in pwds}
+
+    def prune(result):
+        """ drop what no word can match from a normal result """
+        if wordlist_stats is None or result.is_normal() == False:
+            return result
+        return result.prune(wordlist_stats)
+
+    def invert_rule(r_idx, r, tokenized_pwds_for_rule):
+        """ yield (pos, pwd, result, time spent on inversion) for each pwd """
+        if r.feasibility.special_idx is None and is_batch_rule(r):
+            tokenized_pwds_for_rule = list(tokenized_pwds_for_rule)
+            stime = perf_counter()
+            results = invert_one_rule_batch(
+                [pwd for token_pwd, (pos, pwd) in tokenized_pwds_for_rule], r,
+                is_enable_regex)
+            elapsed = (perf_counter() - stime) / max(
+                1, len(tokenized_pwds_for_rule))
+            for (token_pwd, (pos, pwd)), result in zip(
+                    tokenized_pwds_for_rule, results):
+                yield pos, pwd, prune(result), elapsed
+
+        else:
+            for token_pwd, (pos, pwd) in tokenized_pwds_for_rule:
+                stime = perf_counter()
+                if suffix_trie.is_in_trie(r):
+                    result = suffix_trie.invert(token_pwd, r_idx, memos[pos])
+                else:
+                    result = invert_one_rule(token_pwd, r, is_enable_regex,
+                                             r.feasibility.special_idx)
+                result = prune(result)
+                yield pos, pwd, result, perf_counter() - stime
+
+    def add_guesses(r_idx, pos, ret_vals, indices=None):
+        """ indices of ret_vals in the wordlist, if known """
+        for i, v in enumerate(ret_vals):
+            event = (r_idx, pos, v,
+                     estimate_guess_number(
+                         counts, cumsum, v, r_idx, wordlist,
+                         None if indices is None else indices[i]), None)
+            if is_first_crack_only == False:
+                events.append(event)
+            elif pos not in best_guesses or event[3][0] < best_guesses[pos][
+                    3][0]:
+                best_guesses[pos] = event
+
+    # invert rules (with special memory handling and other staff)
+    for r_idx, r in enumerate(rulelist):
+        if is_debug == True:
+            print(r.raw)
+
+        tokenized_pwds_for_rule = tokenized_pwds_for_all_rules
+        signature = rulelist_index.signatures[r_idx]
+        if signature is not None:
+            # only pwds meeting the necessary conditions of the rule
+            candidates = signature.get_candidates(features)
+            if candidates is not None:
+                tokenized_pwds_for_rule = [
+                    tokenized_pwds_for_all_rules[i] for i in candidates
+                ]
+
+        if is_first_crack_only == True and len(best_guesses) != 0:
+            # skip pwds that already have a guess no greater than anything this rule makes
+            lower_bound = get_lower_bound_of_rule(cumsum, r_idx)
+            tokenized_pwds_for_rule = [
+                (token_pwd, (pos, pwd))
+                for token_pwd, (pos, pwd) in tokenized_pwds_for_rule
+                if pos not in best_guesses or
+                lower_bound < best_guesses[pos][3][0]
+            ]
+
+        if r.feasibility.is_invertible():  # invertible, if blow up, use trie
+            inverted = list(invert_rule(r_idx, r, tokenized_pwds_for_rule))
+            numbers_of_strings = [
+                result.get_number_of_strings() if result.is_normal() else 0
+                for pos, pwd, result, elapsed in inverted
+            ]
+            # results with too many preimages are searched in the trie for all pwds at once,
+            # in first_crack_only mode each is searched best-first instead
+            trie_results = [
+                result for (pos, pwd, result, elapsed), number_of_strings in
+                zip(inverted, numbers_of_strings)
+                if number_of_strings > lookup_threshold
+            ]
+            if is_first_crack_only == False and len(trie_results) != 0:
+                stime = perf_counter()
+                searched = iter(search_trie_batch(trie_results, trie))
+                search_elapsed = (perf_counter() - stime) / len(trie_results)
+
+            for (pos, pwd, result, elapsed), number_of_strings in zip(
+                    inverted, numbers_of_strings):
+                if is_profile == True:
+                    stime = perf_counter() - elapsed
+
+                ret_vals, lookup_path = [], None
+                if result.is_normal():
+                    indices = None
+                    if number_of_strings <= lookup_threshold:
+                        ret_vals, lookup_path = match_inversion_result(
+                            result, wordlist, is_enable_regex, trie), "dict"
+                    elif is_first_crack_only == True:
+                        (ret_vals, indices), lookup_path = search_trie_with_indices(
+                            result, trie, True), "trie"
+                    else:
+                        (ret_vals, indices), lookup_path = next(searched), "trie"
+                        if is_profile == True:
+                            stime -= search_elapsed
+                    add_guesses(r_idx, pos, ret_vals, indices)
+
+                elif result.is_out_of_scope():
+                    events.append((r_idx, pos, None, None, "out_of_scope"))
+
+                else:
+                    events.append((r_idx, pos, None, None, result.error_msg))
+
+                if is_profile == True:
+                    INVERSION_PROFILE.add_rule(
+                        r_idx,
+                        perf_counter() - stime, number_of_strings, lookup_path,
+                        len(ret_vals), not result.is_normal())
+
+        elif r.feasibility.is_optimizable(
+        ) and is_trie_guided == True and is_trie_guided_rule(
+                r):  # starts with truncation, walk the trie. if cannot handle, binary
+            enumerated_data_addr = "{}/enumerated/rule{}.txt".format(
+                RUNTIME_CONFIG['preprocess_path'], r_idx)
+            for token_pwd, (pos, pwd) in tokenized_pwds_for_rule:
+                stime = perf_counter()
+                result, ret_vals = invert_and_search_trie(
+                    token_pwd, r, wordlist, trie, lookup_threshold)
+
+                lookup_path, number_of_strings = None, 0
+                if result.is_normal():
+                    number_of_strings = result.get_number_of_strings()
+                    lookup_path = "trie"
+                    add_guesses(r_idx, pos, ret_vals)
+
+                elif result.is_out_of_scope():
+                    ret_vals, lookup_path = search_exist_data(
+                        pwd, enumerated_data_addr,
+                        external_bash_process), "look"
+                    add_guesses(r_idx, pos, ret_vals)
+
+                else:
+                    events.append((r_idx, pos, None, None, result.error_msg))
+
+                if is_profile == True:
+                    INVERSION_PROFILE.add_rule(
+                        r_idx,
+                        perf_counter() - stime, number_of_strings, lookup_path,
+                        len(ret_vals), result.is_error())
+
+        elif r.feasibility.is_optimizable(
+        ):  # uninvertible, if cannot handle, binary
+            # where the binary file is stored
+            enumerated_data_addr = "{}/enumerated/rule{}.txt".format(
+                RUNTIME_CONFIG['preprocess_path'], r_idx)
+            for pos, pwd, result, elapsed in invert_rule(
+                    r_idx, r, tokenized_pwds_for_rule):
+                if is_profile == True:
+                    stime = perf_counter() - elapsed
+
+                ret_vals, lookup_path, number_of_strings = [], None, 0
+
+                if result.is_normal():
+                    indices = None
+                    number_of_strings = result.get_number_of_strings()
+                    if number_of_strings <= lookup_threshold:
+                        ret_vals, lookup_path = match_inversion_result(
+                            result, wordlist, is_enable_regex, trie), "dict"
+                    elif is_optimizable_trie_search == True:
+                        # searched in the trie, from the end if narrower there (CharTrieWrapper.set_reversed)
+                        (ret_vals, indices), lookup_path = search_trie_with_indices(
+                            result, trie, is_first_crack_only), "trie"
+                    else:
+                        ret_vals, lookup_path = search_exist_data(
+                            pwd, enumerated_data_addr,
+                            external_bash_process), "look"
+                    add_guesses(r_idx, pos, ret_vals, indices)
+
+                elif result.is_out_of_scope():
+                    ret_vals, lookup_path = search_exist_data(
+                        pwd, enumerated_data_addr,
+                        external_bash_process), "look"
+                    add_guesses(r_idx, pos, ret_vals)
+
+                else:
+                    events.append((r_idx, pos, None, None, result.error_msg))
+
+                if is_profile == True:
+                    INVERSION_PROFILE.add_rule(
+                        r_idx,
+                        perf_counter() - stime, number_of_strings, lookup_path,
+                        len(ret_vals), result.is_error())
+
+        else:  # binary
+            # where the binary file is stored
+            enumerated_data_addr = "{}/enumerated/rule{}.txt".format(
+                RUNTIME_CONFIG['preprocess_path'], r_idx)
+            for token_pwd, (pos, pwd) in tokenized_pwds_for_rule:
+                if is_profile == True:
+                    stime = perf_counter()
+
+                ret_vals = search_exist_data(pwd, enumerated_data_addr,
+                                             external_bash_process)
+                add_guesses(r_idx, pos, ret_vals)
+
+                if is_profile == True:
+                    INVERSION_PROFILE.add_rule(r_idx,
+                                               perf_counter() - stime, 0,
+                                               "look", len(ret_vals))
+
+        # drop results no later rule needs
+        for node in suffix_trie.get_released_nodes(r_idx):
+            for memo in memos.values():
+                memo.pop(node, None)
+
+    if is_first_crack_only == True:
+        events = sorted(
+            events + list(best_guesses.values()),
+            key=lambda event: (event[0], event[1]))
+
+    return events
+
+
+def deduplicate_passwords(pwds):
+    """ Keep the first occurrence of each password, so that each distinct password is inverted once.
+
+    Args:
+        pwds: a list of (pos, pwd)
+
+    Returns:
+        distinct_pwds: a list of (pos, pwd), in the same order as pwds
+
+        duplicates: a dict, pos of a password in distinct_pwds -> positions of its other occurrences
+    """
+    first_pos = {}
+    distinct_pwds = []
+    duplicates = {}
+
+    for pos, pwd in pwds:
+        if pwd in first_pos:
+            duplicates.setdefault(first_pos[pwd], []).append(pos)
+        else:
+            first_pos[pwd] = pos
+            distinct_pwds.append((pos, pwd))
+
+    return distinct_pwds, duplicates
+
+
+def fan_out_events(events, duplicates):
+    """ Copy the events of each distinct password to its duplicates, returned by deduplicate_passwords.
+
+    The events are sorted by (rule_idx, pos) again, same as inverting every occurrence.
+    """
+    if len(duplicates) == 0:
+        return events
+
+    fanned_out_events = []
+    for event in events:
+        fanned_out_events.append(event)
+        for pos in duplicates.get(event[1], ()):
+            fanned_out_events.append((event[0], pos) + event[2:])
+
+    # stable, keeps the order within the same (rule_idx, pos)
+    fanned_out_events.sort(key=lambda event: (event[0], event[1]))
+
+    return fanned_out_events
+
+
+def log_inversion_events(events,
+                         rulelist,
+                         not_filtered_pwds,
+                         wordlist=None,
+                         results_writer=None,
+                         is_text_log=True):
+    """ Log events returned by invert_rules_for_passwords.
+
+    Args:
+        events: events returned by invert_rules_for_passwords
+
+        rulelist: preprocessed rulelist
+
+        not_filtered_pwds: a list of (pw_idx, pwd), indexed by pos of the events
+
+        wordlist: the wordlist dict, needed if results_writer is set
+
+        results_writer: a ResultsWriter that records each guess, or None
+
+        is_text_log: whether to write each guess to the text log
+
+    Returns:
+        A dict, pos -> the smallest guess of the password, for passwords that are guessed.
+    """
+    min_guesses = {}
+
+    for r_idx, pos, word, guess, error_msg in events:
+        pw_idx, pwd = not_filtered_pwds[pos]
+
+        if error_msg is None:
+            if pos not in min_guesses or guess[0] < min_guesses[pos]:
+                min_guesses[pos] = guess[0]
+
+            if results_writer is not None:
+                results_writer.add_hit(pw_idx, r_idx, wordlist[word], *guess)
+
+            if is_text_log == True:
+                logging.info(
+                    "\nPasswordIdx:{}\nPassword:{}\nRule:{}\nWord:{}\nGuess:{} ( {} - {} )\n".
+                    format(pw_idx, pwd, rulelist[r_idx].raw, word, *guess))
+
+        else:
+            if is_text_log == True:
+                logging.info(
+                    "Inversion error for {}(RL) {}(pw), error msg: {}\n".
+                    format(rulelist[r_idx].raw, pwd, error_msg))
+            print("Inversion error for {}(RL) {}(pw), error msg: {}".format(
+                rulelist[r_idx].raw, pwd, error_msg))
+
+    return min_guesses
+
+
+# Read-only state shared with worker processes. Set right before forking,
+# so workers inherit it (copy-on-write) instead of receiving it through pickling.
+_WORKER_STATE = {}
+
+
+def close_bash_process(external_bash_process):
+    """ close the bash process used for binary search, and wait for it to exit """
+    external_bash_process.stdin.close()
+    external_bash_process.wait()
+
+
+def _init_worker():
+    """ Worker: start its own bash process for binary search, closed when the worker exits """
+    external_bash_process = Popen(['/bin/bash'], stdin=PIPE, stdout=PIPE)
+    _WORKER_STATE['external_bash_process'] = external_bash_process
+    Finalize(None,
+             close_bash_process,
+             args=(external_bash_process,),
+             exitpriority=0)
+
+
+def _invert_shard(shard):
+    """ Worker: invert all rules on a shard of passwords """
+    events = invert_rules_for_passwords(
+        _WORKER_STATE['rulelist'], shard, _WORKER_STATE['wordlist'],
+        _WORKER_STATE['trie'], _WORKER_STATE['counts'],
+        _WORKER_STATE['cumsum'], _WORKER_STATE['external_bash_process'],
+        _WORKER_STATE['wordlist_stats'], _WORKER_STATE['rulelist_index'])
+
+    # hand what this shard recorded to the parent
+    profile = None
+    if RUNTIME_CONFIG['profile'] == True:
+        profile = InversionProfile()
+        profile.merge(INVERSION_PROFILE)
+        INVERSION_PROFILE.clear()
+
+    return events, profile
+
+
+def start_inversion_pool(rulelist,
+                         wordlist,
+                         trie,
+                         counts,
+                         cumsum,
+                         workers,
+                         wordlist_stats=None,
+                         rulelist_index=None):
+    """ Fork a pool of worker processes for invert_rules_for_passwords_in_parallel, to be reused across chunks of pwds.
+
+    Workers are forked once, so they share the wordlist, trie and counts with the parent,
+    and each starts one bash process for binary search.
+
+    Returns:
+        The pool, None if pwds can't be sharded (one worker, or Windows). Close it with close_inversion_pool.
+    """
+    if workers <= 1 or platform == "win32":
+        return None
+
+    if rulelist_index is None:
+        rulelist_index = RulelistIndex(rulelist)
+
+    # kept until the pool is closed, a worker that dies is forked again from it
+    _WORKER_STATE.update(
+        rulelist=rulelist,
+        wordlist=wordlist,
+        trie=trie,
+        counts=counts,
+        cumsum=cumsum,
+        wordlist_stats=wordlist_stats,
+        rulelist_index=rulelist_index)
+    # keep the inherited objects out of gc, so their pages are not copied on write
+    if hasattr(gc, "freeze"):
+        gc.freeze()
+
+    return multiprocessing.get_context("fork").Pool(workers,
+                                                    initializer=_init_worker)
+
+
+def close_inversion_pool(pool):
+    """ Let the workers of a pool from start_inversion_pool exit (closing their bash processes), and wait for them """
+    if pool is None:
+        return
+
+    try:
+        pool.close()
+        pool.join()
+    finally:
+        if hasattr(gc, "unfreeze"):
+            gc.unfreeze()
+        _WORKER_STATE.clear()
+
+
+def invert_rules_for_passwords_in_parallel(rulelist,
+                                           pwds,
+                                           wordlist,
+                                           trie,
+                                           counts,
+                                           cumsum,
+                                           external_bash_process,
+                                           workers,
+                                           wordlist_stats=None,
+                                           rulelist_index=None,
+                                           pool=None):
+    """ Same as invert_rules_for_passwords, but shards pwds across a pool of worker processes.
+
+    The events from all shards are merged back into (rule_idx, pos) order,
+    so the output is identical to the serial run.
+
+    Args:
+        workers: number of worker processes.
+
+        pool: a pool from start_inversion_pool with the same rulelist, wordlist, trie and counts.
+        If None, a pool is started and closed for pwds.
+    """
+    if rulelist_index is None:
+        rulelist_index = RulelistIndex(rulelist)
+
+    if workers <= 1 or len(pwds) <= 1 or platform == "win32":
+        return invert_rules_for_passwords(rulelist, pwds, wordlist, trie,
+                                          counts, cumsum,
+                                          external_bash_process,
+                                          wordlist_stats, rulelist_index)
+
+    # more shards than workers, so that slow shards don't hold up the pool
+    number_of_shards = min(len(pwds), workers * 4)
+    shard_size = -(-len(pwds) // number_of_shards)
+    shards = [
+        pwds[i:i + shard_size] for i in range(0, len(pwds), shard_size)
+    ]
+
+    if pool is not None:
+        shard_results = pool.map(_invert_shard, shards, chunksize=1)
+    else:
+        pool = start_inversion_pool(rulelist, wordlist, trie, counts, cumsum,
+                                    workers, wordlist_stats, rulelist_index)
+        try:
+            shard_results = pool.map(_invert_shard, shards, chunksize=1)
+        finally:
+            close_inversion_pool(pool)
+
+    for events, profile in shard_results:
+        if profile is not None:
+            INVERSION_PROFILE.merge(profile)
+
+    return list(
+        heapq.merge(*(events for events, profile in shard_results),
+                    key=lambda event: (event[0], event[1])))
+
+
 def clean_hashes():
     """ remove saved hash file hashes.txt/count_hashes.txt """
     os.remove("{}/hashes.txt".format(
@@ -0,0 +1,189 @@
+""" Library API for guess number estimation """
+from config import RUNTIME_CONFIG, Configuration
+from config import john_nick_names, hc_nick_names
+from common import RunningStyle, PasswordPolicyConf, FilePath, FatalRuntimeError
+from guess_count import GuessCount
+from utility import read_wordlist, read_rulelist, get_wordlist_trie
+from utility import filter_passwords_with_password_policy
+from preprocess import precomputation
+from wordlist_stats import get_wordlist_stats
+from demo_common import invert_rules_for_passwords, deduplicate_passwords, fan_out_events, RulelistIndex
+from demo_common import close_bash_process
+from subprocess import Popen, PIPE
+from contextlib import contextmanager
+import threading
+import hashlib
+import os
+
+# Preprocessing calls JtR/HC and builds the trie through files in the working directory,
+# so estimators are set up one at a time. Estimation itself runs concurrently.
+_PREPROCESS_LOCK = threading.Lock()
+
+
+class GuessNumberEstimator():
+    """ Estimates guess numbers of passwords for one configuration (wordlist, rulelist, style and policy).
+
+    The estimator owns its configuration and preprocessed data, it doesn't use the configuration
+    in RUNTIME_CONFIG. So estimators of different configurations can be used at the same time,
+    in the same thread or in different threads.
+
+    Example:
+        estimator = GuessNumberEstimator("words.lst", "rules.rule", "j")
+        results = estimator.estimate_many(["password1", "123456"])
+    """
+
+    def __init__(self,
+                 wordlist,
+                 rulelist,
+                 style,
+                 policy=None,
+                 preprocess_path=None,
+                 **kwargs):
+        """ Read the wordlist and rulelist, and do all the preprocessing.
+
+        Args:
+            wordlist: path to the wordlist
+
+            rulelist: path to the rulelist
+
+            style: running style, a RunningStyle or one of john_nick_names/hc_nick_names
+
+            policy: a PasswordPolicyConf, None for no password policy
+
+            preprocess_path: directory to store preprocessed data. Estimators running at the same time
+                can't share one, unless they have the same configuration. If None, a subdirectory
+                of the default preprocess_path is used, one for each configuration.
+
+            kwargs: other configuration fields, e.g., lookup_threshold=1024
+        """
+        if style in john_nick_names:
+            style = RunningStyle.JTR
+        elif style in hc_nick_names:
+            style = RunningStyle.HC
+        elif style not in (RunningStyle.JTR, RunningStyle.HC):
+            raise FatalRuntimeError("Unknown Running Style: {}".format(style))
+
+        self.config = Configuration(style, **kwargs)
+        self.config['password_policy'] = policy if policy is not None else PasswordPolicyConf()
+        self.config['wordlist_path'] = FilePath(wordlist)
+        self.config['rulelist_path'] = FilePath(rulelist)
+
+        if preprocess_path is None:
+            preprocess_path = "{}/{}/".format(self.config['preprocess_path'],
+                                              self.get_config_hash())
+        for subdir in ("count", "enumerated"):
+            os.makedirs("{}/{}".format(preprocess_path, subdir), exist_ok=True)
+        self.config['preprocess_path'] = preprocess_path
+
+        with _PREPROCESS_LOCK, RUNTIME_CONFIG.bind(self.config):
+            rulelist = read_rulelist(self.config['rulelist_path']['name'],
+                                     self.config['rulelist_path']['prefix'])
+            self.rulelist = precomputation(rulelist)
+            self.rulelist_index = RulelistIndex(self.rulelist)
+            self.wordlist = read_wordlist(self.config['wordlist_path']['name'],
+                                          self.config['wordlist_path']['prefix'])
+            self.counts, self.cumsum = GuessCount.get_counts(
+                self.wordlist, self.rulelist, preprocess_path)
+            self.trie = get_wordlist_trie(self.wordlist)
+            self.wordlist_stats = get_wordlist_stats(
+                self.wordlist) if self.config['wordlist_pruning'] == True else None
+
+        # bash processes for binary search, one for each running estimation, reused by later ones
+        self._bash_processes = []
+        self._idle_bash_processes = []
+        self._bash_processes_lock = threading.Lock()
+
+    def get_config_hash(self):
+        """ Return a short hash that identifies the configuration """
+        h = hashlib.md5()
+        for value in (self.config['wordlist_path']['addr'],
+                      self.config['rulelist_path']['addr'],
+                      str(self.config['running_style']),
+                      self.config['password_policy'].to_debug_string()):
+            h.update(value.encode('utf-8') + b"\n")
+        return h.hexdigest()[:16]
+
+    @contextmanager
+    def bash_process(self):
+        """ Take an idle bash process for binary search (or start one), and give it back after the
+        with block. So the processes are as many as the estimations running at the same time, not
+        as the threads that ever called the estimator (e.g., one per request in a server). """
+        with self._bash_processes_lock:
+            external_bash_process = self._idle_bash_processes.pop(
+            ) if self._idle_bash_processes else None
+        if external_bash_process is None:
+            external_bash_process = Popen(['/bin/bash'],
+                                          stdin=PIPE,
+                                          stdout=PIPE)
+            with self._bash_processes_lock:
+                self._bash_processes.append(external_bash_process)
+        try:
+            yield external_bash_process
+        finally:
+            with self._bash_processes_lock:
+                self._idle_bash_processes.append(external_bash_process)
+
+    def estimate_many(self, passwords):
+        """ Estimate guess numbers of a batch of passwords.
+
+        Args:
+            passwords: a list of passwords
+
+        Returns:
+            A list of dicts, one for each password, in the same order as passwords. Each dict has
+            password, meets_policy, guessable, min_guess, and guesses (a list of dicts with rule, word,
+            guess, lower and upper).
+        """
+        with RUNTIME_CONFIG.bind(self.config), self.bash_process() as external_bash_process:
+            not_filtered_pwds, filtered_pwds = filter_passwords_with_password_policy(
+                passwords)
+            pwds = [(pos, pwd)
+                    for pos, (pw_idx, pwd) in enumerate(not_filtered_pwds)]
+            distinct_pwds, duplicates = deduplicate_passwords(pwds)
+            events = invert_rules_for_passwords(
+                self.rulelist, distinct_pwds, self.wordlist, self.trie,
+                self.counts, self.cumsum, external_bash_process,
+                self.wordlist_stats, self.rulelist_index)
+            events = fan_out_events(events, duplicates)
+
+        results = [{
+            'password': pwd,
+            'meets_policy': False,
+            'guessable': False,
+            'min_guess': None,
+            'guesses': [],
+        } for pwd in passwords]
+
+        for pw_idx, pwd in not_filtered_pwds:
+            results[pw_idx]['meets_policy'] = True
+
+        for r_idx, pos, word, guess, error_msg in events:
+            if error_msg is not None:
+                continue
+
+            result = results[not_filtered_pwds[pos][0]]
+            estimated, lower_bound, upper_bound = (int(v) for v in guess)
+            result['guesses'].append({
+                'rule': self.rulelist[r_idx].raw,
+                'word': word,
+                'guess': estimated,
+                'lower': lower_bound,
+                'upper': upper_bound,
+            })
+            result['guessable'] = True
+            if result['min_guess'] is None or estimated < result['min_guess']:
+                result['min_guess'] = estimated
+
+        return results
+
+    def estimate(self, password):
+        """ Estimate guess numbers of one password, see estimate_many """
+        return self.estimate_many([password])[0]
+
+    def close(self):
+        """ Stop the bash processes started by the estimator """
+        with self._bash_processes_lock:
+            for p in self._bash_processes:
+                close_bash_process(p)
+            self._bash_processes = []
+            self._idle_bash_processes = []
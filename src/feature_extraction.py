@@ -18069,12 +18069,14 @@ def get_dependency_for_single_rule(one_rule):
         # Create a global RuleDependency. Doing this because of parallelism
         rule_dependency = RuleDependency()
 
-        for subrule in one_rule.rules:  # in reversed order
+        for subrule, subrule_plan in zip(
+                one_rule.rules,
+                one_rule.get_plan(get_extraction_function)):  # in reversed order
             #For each unparalleled subrule, get its dependency
             subrule_dependency = initialize_subrule_dependency()
 
-            for transformation in subrule[::-1]:
-                extract_function = get_extraction_function(transformation)
+            for transformation, extract_function in zip(
+                    subrule[::-1], subrule_plan[::-1]):
                 subrule_dependency = extract_function(subrule_dependency,
                                                       transformation)
 
@@ -18146,6 +18148,7 @@ def get_special_countability(rulelist):
                 # remove Q
                 subrule[1], subrule[0] = subrule[0], subrule[1]
                 subrule.pop(0)
+            tmp_new_rule.plans = {}  # subrules changed
             tmp_new_rule.rule_dependency = get_dependency_for_single_rule(
                 tmp_new_rule)
             for subrule_dependency in tmp_new_rule.rule_dependency.list_of_sub_rule_dep:
@@ -28,10 +28,22 @@ CONV_RIGHT = "1234567890-=\\\\wertyuiop[]]sdfghjkl;''xcvbnm,./\\!@#$%^&*()_+||WE
 CONV_LEFT = "``1234567890-=qqwertyuiop[aasdfghjkl;zzxcvbnm,.~~!@#$%^&*()_+QQWERTYUIOP{AASDFGHJKL:ZZXCVBNM<>"
 
 CHAR_CLASSES = '?vcwpsludaxzVCWPSLUDAXZ'  # All the possible character classes
+# ?z in JtR/HC
+CHARS_ALL_JTR = set(chr(x) for x in range(32, 127))
+CHARS_ALL_HC = set(chr(x) for x in range(256))
 # all printables allowed
 PRINTABLES = '0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ!"#$%&\'()*+,-./:;<=>?@[\\]^_`{|}~ '
 
 
+class CharacterClasses(dict):
+    """ class_dict whose ?z follows the running style of the current configuration """
+
+    def __getitem__(self, key):
+        if key == 'z':
+            return CHARS_ALL_HC if RUNTIME_CONFIG.is_hc() else CHARS_ALL_JTR
+        return dict.__getitem__(self, key)
+
+
 class Setup():
     """ setting up dictionaries for inversion use """
 
@@ -85,16 +97,14 @@ class Setup():
             CHARS_LETTERS,
             'x':
             CHARS_LETTERS + CHARS_DIGITS,
-            'z':
-            set(chr(x) for x in range(256)) if RUNTIME_CONFIG.is_hc() else set(
-                chr(x) for x in range(32, 127))
+            'z': CHARS_ALL_JTR,
         }
 
         for key in "VCWPSLUDAXZ":
             lower_key = key.lower()
             d[key] = "".join(i for i in PRINTABLES if i not in d[lower_key])
 
-        return {k: set(v) for k, v in d.items()}
+        return CharacterClasses({k: set(v) for k, v in d.items()})
 
     @staticmethod
     def create_shift_by_shift():
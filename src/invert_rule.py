@@ -7,9 +7,12 @@ from enum import Enum
 from invert_helper import Dicts
 from itertools import chain, combinations, product, permutations
 import traceback
-from tokenstr import TokenStringBase, Token, TokenType, TokenString
+from tokenstr import TokenStringBase, Token, TokenType, TokenString, tokenize
 from utility import convert_str_length_to_int, get_name_of_a_rule
 from feasibility import Invertibility
+from profiler import INVERSION_PROFILE
+from time import perf_counter
+import numpy as np
 
 
 class InversionStatus(Enum):
@@ -111,30 +114,16 @@ class InversionResult():
         if (self.is_null == True or self.results == []):
             return 0
 
-        count = 0
+        return sum(
+            ts.get_number_of_strings(remove_non_ascii) for ts in self.results)
 
-        for ts in self.results:
-            if len(ts) == 0:  # Length = 0 means 1 empty string
-                count += 1
-
-            else:
-                tmp_count = 1  # get count for one tokenstring
-                for i in range(len(ts)):
-
-                    if remove_non_ascii == False:
-                        tmp_count *= len(ts.tokens[i])
-
-                    else:
-                        tmp_count *= len(
-                            set(c for c in ts.tokens[i].get_value()
-                                if char_is_printable(c)))
-
-                    if tmp_count == 0:
-                        break
+    def iter_strings(self):
+        """ Yields strings of each tokenstring in turn, without building them all at once.
 
-                count += tmp_count
-
-        return count
+        A string represented by more than one tokenstring is yielded more than once.
+        """
+        for ts in self.results:
+            yield from ts.iter_strings()
 
     def get_all_strings(self, unique=False):
         """ convert tokenstring repr to strings.
@@ -142,11 +131,24 @@ class InversionResult():
         Args:
             unique: whether to return only unique strings.
         """
-        strings = []
-        for ts in self.results:
-            strings = strings + ts.to_strings()
+        strings = list(self.iter_strings())
         return strings if unique == False else set(strings)
 
+    def prune(self, wordlist_stats):
+        """ A copy without preimages no word in the wordlist can match, see WordlistStats.prune.
+
+        Tokenstrings are copied, so results shared with others (e.g., in a RuleSuffixTrie memo) are not changed.
+        """
+        ret_val = InversionResult()
+        ret_val.status = self.status
+        ret_val.error_msg = self.error_msg
+        ret_val.memorized_words = self.memorized_words
+        for ts in self.results:
+            pruned = wordlist_stats.prune(ts)
+            if pruned is not None:
+                ret_val.add(pruned)
+        return ret_val
+
     def contains(self, word):
         """ if a word is contained in the results. """
         for val in self.results:
@@ -227,22 +229,9 @@ class Inversion():
 
         if enable_regex == False:
 
-            token_str_length = len(token_str)
-
-            for idx, token in enumerate(token_str):
-                new_set_other = set(
-                    x for x in token.get_value().difference(Dicts.classes['a'])
-                )  # All non-alphabetical characters
-                new_set_lower = set(
-                    chain.from_iterable(
-                        (x, x.upper()) for x in token.get_value().intersection(
-                            Dicts.classes['l'])))  # Get all lower case in dict
-                new_set = new_set_other | new_set_lower
-
-                if new_set == set():  # rejected
-                    return inversion_result
-                else:
-                    token_str[idx].set_value(new_set)
+            # lowercase letters and corresponding upper, and all others
+            if token_str.expand_case(['l'] * len(token_str)) == False:
+                return inversion_result  # rejected
 
             inversion_result.add(token_str)
 
@@ -323,23 +312,9 @@ class Inversion():
 
         if enable_regex == False:
 
-            token_str_length = len(token_str)
-
-            for idx, token in enumerate(token_str):
-
-                new_set_other = set(
-                    x for x in token.get_value().difference(Dicts.classes['a'])
-                )  # Get all other
-                new_set_upper = set(
-                    chain.from_iterable((x, x.lower())
-                                        for x in token.get_value().intersection(
-                                            Dicts.classes['u']))
-                )  # Get uppercase and convert to lowercase
-                new_set = new_set_other | new_set_upper
-                if new_set == set():  # rejected
-                    return inversion_result
-                else:
-                    token_str[idx].set_value(new_set)
+            # uppercase letters and corresponding lower, and all others
+            if token_str.expand_case(['u'] * len(token_str)) == False:
+                return inversion_result  # rejected
 
             inversion_result.add(token_str)
             return inversion_result
@@ -416,38 +391,10 @@ class Inversion():
 
         if enable_regex == False:
 
-            token_str_length = len(token_str)
-
-            for idx, token in enumerate(token_str):
-                if idx == 0:
-                    new_set_other = set(x for x in token.get_value().difference(
-                        Dicts.classes['a']))  # Get all other
-                    new_set_lower = set(
-                        chain.from_iterable((x, x.lower())
-                                            for x in token.get_value().
-                                            intersection(Dicts.classes['u']))
-                    )  # all uppercase and corresponding lower
-                    new_set = new_set_other | new_set_lower
-                    if new_set == set():  # rejected
-                        return inversion_result
-                    else:
-                        token_str[idx].set_value(new_set)
-
-                else:
-                    # Other Character, should be lower
-                    new_set_other = set(x for x in token.get_value().difference(
-                        Dicts.classes['a']))  # Get all other
-                    new_set_upper = set(
-                        chain.from_iterable((x, x.upper())
-                                            for x in token.get_value().
-                                            intersection(Dicts.classes['l']))
-                    )  # all lowercase and corresponding upper
-                    new_set = new_set_other | new_set_upper
-
-                    if new_set == set():  # rejected
-                        return inversion_result
-                    else:
-                        token_str[idx].set_value(new_set)
+            # first letter upper, others lower
+            if token_str.expand_case(['u'] + ['l'] *
+                                     (len(token_str) - 1)) == False:
+                return inversion_result  # rejected
 
             inversion_result.add(token_str)
             return inversion_result
@@ -561,37 +508,10 @@ class Inversion():
 
         if enable_regex == False:
 
-            token_str_length = len(token_str)
-
-            for idx, token in enumerate(token_str):
-                if idx == 0:
-                    new_set_other = set(x for x in token.get_value().difference(
-                        Dicts.classes['a']))  # All non-alphabetical characters
-                    new_set_lower = set(
-                        chain.from_iterable((x, x.upper())
-                                            for x in token.get_value().
-                                            intersection(Dicts.classes['l']))
-                    )  # all lowercase and corresponding upper
-                    new_set = new_set_other | new_set_lower
-
-                    if new_set == set():  # rejected
-                        return inversion_result
-                    else:
-                        token_str[idx].set_value(new_set)
-
-                else:
-                    new_set_other = set(x for x in token.get_value().difference(
-                        Dicts.classes['a']))  # All non-alphabetical characters
-                    new_set_upper = set(
-                        chain.from_iterable((x, x.lower())
-                                            for x in token.get_value().
-                                            intersection(Dicts.classes['u']))
-                    )  # all uppercase and corresponding lower
-                    new_set = new_set_other | new_set_upper
-                    if new_set == set():  # rejected
-                        return inversion_result
-                    else:
-                        token_str[idx].set_value(new_set)
+            # first letter lower, others upper
+            if token_str.expand_case(['l'] + ['u'] *
+                                     (len(token_str) - 1)) == False:
+                return inversion_result  # rejected
 
             inversion_result.add(token_str)
             return inversion_result
@@ -701,10 +621,7 @@ class Inversion():
 
             token_str_length = len(token_str)
 
-            for idx, token in enumerate(token_str):
-                token_str[idx].set_value({
-                    Dicts.toggle.setdefault(x, x) for x in token.get_value()
-                })  # toggle the char
+            token_str.toggle_case()  # toggle the chars
 
             inversion_result.add(token_str)
             return inversion_result
@@ -2219,12 +2136,8 @@ class Inversion():
             token = token_str[ending_position - i - 1]  # For current insertion
 
             if token.is_range():
-                intersect_set = token.get_value() & set(
-                    params[insertion_range - i - 1])
-                if intersect_set == set():
+                if token.has_any(params[insertion_range - i - 1]) == False:
                     return None
-                else:
-                    pass
 
         # Remove the inserted part
         ret_token_str.append_tokens(
@@ -2470,9 +2383,7 @@ class Inversion():
                 inversion_result.add(token_str)
                 return inversion_result
 
-            token_str[N].set_value({
-                Dicts.toggle.setdefault(x, x) for x in token_str[N].get_value()
-            })
+            token_str.toggle_case([N])
 
             inversion_result.add(token_str)
             return inversion_result
@@ -4602,9 +4513,10 @@ class Inversion():
 
         if enable_regex == False:
             if len(token_str) > 0:
-
-                token_str[0].set_value(X)
-                inversion_result.add(token_str)
+                # check the first char
+                if X in token_str[0].get_value():
+                    token_str[0].set_value(X)
+                    inversion_result.add(token_str)
 
             return inversion_result
 
@@ -5011,19 +4923,16 @@ class Inversion():
         Y = rule[2]
 
         if enable_regex == False:
-            for idx, token in enumerate(token_str):
+            for token in token_str:
                 # X in set and Y not in set, remove X, if empty, reject
-                if X in token.get_value() and Y not in token.get_value():
-                    minus_X = set(x for x in token.get_value() if (x != X))
-                    if len(minus_X) == 0:
+                if X in token and Y not in token:
+                    token.discard(X)
+                    if len(token) == 0:
                         return inversion_result
-                    else:
-                        token_str[idx].set_value(minus_X)
 
                 # X not in set and Y in set, add X.
-                elif X not in token.get_value() and Y in token.get_value():
-                    token_str[idx].set_value(token_str[idx].get_value() |
-                                             set(X))
+                elif X not in token and Y in token:
+                    token.add(X)
 
                 else:
                     pass
@@ -5117,7 +5026,6 @@ class Inversion():
                 return Invertibility.INVERTIBLE
 
         X = rule[1]
-        set_X = set(X)
 
         if enable_regex == False:
 
@@ -5133,18 +5041,14 @@ class Inversion():
             # Case3: "_" "_" "Upper"
             # Case4: "Any-_" "Any-_" "Any"
 
-            # First, find all consecutive Xs.
+            # First, find all consecutive Xs. (position, whether X is the only char)
             groups = []
             group = []
-            is_consecutive = False
-            for idx, token in enumerate(token_str):
-                if X in token.get_value():
-                    group.append((token.get_value(), idx))
-
-                else:
-                    if len(group) != 0:
-                        groups.append(group)
-                        group = []
+            for idx, is_only_X in token_str.find_char(X):
+                if len(group) != 0 and group[-1][0] + 1 != idx:
+                    groups.append(group)
+                    group = []
+                group.append((idx, is_only_X))
 
             # If the end contains 'X'
             if len(group) != 0:
@@ -5152,24 +5056,19 @@ class Inversion():
                 group = []
 
             # For each consecutive group, get Combination (AB, AB', A'B, AB)
+            # as (positions of X, positions without X)
             expanded_sets_for_groups = []
 
             for group in groups:
                 expanded_sets = []
                 masks = product((True, False), repeat=len(group))
                 for mask in masks:
-                    one_expansion = []
-                    for set_v, mask_v in zip(group, mask):
-                        if mask_v == True:
-                            one_expansion.append((set_X, set_v[1]))
-                        else:
-                            if set_v[0] - set_X:
-                                one_expansion.append((set_v[0] - set_X,
-                                                      set_v[1]))
-                            else:
-                                break
-                    else:
-                        expanded_sets.append(one_expansion)
+                    # a position with only X can't be without X
+                    if all(mask_v == True or is_only_X == False
+                           for (idx, is_only_X), mask_v in zip(group, mask)):
+                        expanded_sets.append(
+                            ([idx for (idx, _), mask_v in zip(group, mask) if mask_v == True],
+                             [idx for (idx, _), mask_v in zip(group, mask) if mask_v == False]))
 
                 if len(expanded_sets) != 0:
                     expanded_sets_for_groups.append(expanded_sets)
@@ -5177,49 +5076,24 @@ class Inversion():
             # For all group, get Product of all its combinations
             for p in product(*expanded_sets_for_groups):
                 tmp_token_str = deepcopy(token_str)
-                for l in p:
-                    for v in l:
-                        tmp_token_str[v[1]].set_value(v[0])
+                positions_of_X = [idx for l in p for idx in l[0]]
+                tmp_token_str.split_on_char(
+                    X, positions_of_X, [idx for l in p for idx in l[1]])
 
                 prev_X = True  # For the first one
-                # If first is set_X, continued, otherwise upper case
-                for idx, token in enumerate(tmp_token_str):
-
-                    if token.get_value() == set_X:
+                # If first is X, continued, otherwise upper case
+                is_X = set(positions_of_X)
+                cases = []
+                for idx in range(len(tmp_token_str)):
+                    if idx in is_X:
                         prev_X = True
-                        continue
-
+                        cases.append(None)
                     else:
-                        # Upper
-                        if prev_X == True:
-                            prev_X = False
-                            other_sets = set(x for x in token.get_value().
-                                             difference(Dicts.classes['a']))
-                            upper_sets = set(
-                                chain.from_iterable(
-                                    (x, x.lower())
-                                    for x in token.get_value().intersection(
-                                        Dicts.classes['u'])))
-                            if other_sets | upper_sets:
-                                token.set_value(other_sets | upper_sets)
-                            else:
-                                break
-
-                        # Lower
-                        else:
-                            other_sets = set(x for x in token.get_value().
-                                             difference(Dicts.classes['a']))
-                            upper_sets = set(
-                                chain.from_iterable(
-                                    (x, x.upper())
-                                    for x in token.get_value().intersection(
-                                        Dicts.classes['l'])))
-                            if other_sets | upper_sets:
-                                token.set_value(other_sets | upper_sets)
-                            else:
-                                break
+                        # Upper after X, lower otherwise
+                        cases.append('u' if prev_X == True else 'l')
+                        prev_X = False
 
-                else:
+                if tmp_token_str.expand_case(cases) == True:
                     inversion_result.add(tmp_token_str)
 
             return inversion_result
@@ -5270,8 +5144,34 @@ def get_inversion_function(transformation):
     return corresponding_function
 
 
-def invert_single_transformation(token_strs, transformation,
-                                 enable_regex=False):
+class CompiledTransformation():
+    """ A transformation with its name and inversion function looked up once.
+
+    Kept in the plan of a rule, see RuleWrapper.get_plan. If the transformation is
+    not supported, name and inversion_function are None, and inverting it raises
+    the same error as get_inversion_function.
+    """
+
+    def __init__(self, transformation):
+        self.transformation = transformation
+        try:
+            self.name = get_name_of_a_rule(transformation)
+            self.inversion_function = getattr(
+                Inversion, "invert_{}_command".format(self.name))
+            self.is_batch = is_batch_transformation(transformation)
+        except Exception:
+            self.name = None
+            self.inversion_function = None
+            self.is_batch = False
+
+    def __repr__(self):
+        return repr(self.transformation)
+
+
+def invert_single_transformation(token_strs,
+                                 transformation,
+                                 enable_regex=False,
+                                 inversion_function=None):
     """ Invert a single transformation
 
     Args:
@@ -5281,17 +5181,29 @@ def invert_single_transformation(token_strs, transformation,
 
         enable_regex: Whether to enable regex operation.
 
+        inversion_function: the inversion function of transformation, see CompiledTransformation.
+            None to look it up.
+
     Returns:
         An instance of InversionResult containing all possible preimages (represented in tokenstrings)
     """
     ret_val = InversionResult()
+    is_profile = RUNTIME_CONFIG['profile']
     try:
-        inversion_function = get_inversion_function(transformation)
+        if inversion_function is None:
+            inversion_function = get_inversion_function(transformation)
         for token_str in token_strs:
+            if is_profile == True:
+                stime = perf_counter()
+
             # invert one transfomration
             single_result = inversion_function(
                 token_str, transformation, enable_regex=enable_regex)
 
+            if is_profile == True:
+                INVERSION_PROFILE.add_command(inversion_function.__name__,
+                                              perf_counter() - stime)
+
             # if out_of_scope, call JtR/HC to handle.
             if single_result.get_status() == InversionStatus.OUTSCOPE:
                 ret_val.set_status(InversionStatus.OUTSCOPE)
@@ -5310,7 +5222,237 @@ def invert_single_transformation(token_strs, transformation,
         return ret_val
 
 
-def invert_one_subrule(token_str, subrule, enable_regex=False, skip_index=None):
+# memory commands, a subrule with them is inverted by invert_one_memory_subrule
+MEMORY_TRANSFORMATIONS = {"M", "4", "6", "X_N_M_I"}
+
+
+def is_memory_subrule(subrule_plan):
+    """ whether a compiled subrule has memory commands, and invert_one_memory_subrule handles all of them.
+
+    Q and vVNM are not handled. XNMI is only handled in HC, where it rejects a substring
+    that doesn't fit in the memorized word or the word.
+    """
+    names = [compiled.name for compiled in subrule_plan]
+    if all(name not in MEMORY_TRANSFORMATIONS for name in names):
+        return False
+
+    if "Q" in names or "v_V_N_M" in names:
+        return False
+
+    for compiled in subrule_plan:
+        if compiled.name == "X_N_M_I":
+            if RUNTIME_CONFIG.is_jtr():
+                return False
+            try:
+                if any(
+                        type(convert_str_length_to_int(c)) != int
+                        for c in compiled.transformation[1:4]):
+                    return False
+            except BaseException:
+                return False
+
+    return True
+
+
+def has_memory_subrule(one_rule):
+    """ whether some subrule of a rule is inverted by invert_one_memory_subrule """
+    return any(
+        is_memory_subrule(subrule_plan)
+        for subrule_plan in one_rule.get_plan(CompiledTransformation))
+
+
+def _tokenstring_of(tokens):
+    """ a new tokenstring of copies of tokens """
+    ret_val = TokenString()
+    ret_val.append_tokens([token.copy() for token in tokens])
+    return ret_val
+
+
+def _intersect_tokens(token, other):
+    """ a copy of token with only the chars also in other, None if nothing is left """
+    token = token.copy()
+    if token.intersect(other.get_value()) == False:
+        return None
+    return token
+
+
+class MemorizedWord():
+    """ What the memory commands after a point in a subrule require of the memorized word.
+
+    The memorized word starts with chars in tokens (None for any char). If is_open, it can have
+    any chars after them, otherwise it has exactly len(tokens) chars. At first nothing is required.
+    """
+
+    def __init__(self, tokens=None, is_open=True):
+        self.tokens = [] if tokens is None else tokens
+        self.is_open = is_open
+
+    def constrain(self, start, tokens, is_exact=False):
+        """ Also require chars start to start + len(tokens) of the memorized word to be in tokens.
+
+        Args:
+            start: position of the first token.
+
+            tokens: a list of Token, None for any char.
+
+            is_exact: whether the memorized word ends right after tokens
+
+        Returns:
+            A new MemorizedWord, None if no word meets both
+        """
+        end = start + len(tokens)
+        if self.is_open == False and end > len(self.tokens):
+            return None
+        if is_exact == True and end < len(self.tokens):
+            return None
+
+        merged = self.tokens + [None] * (end - len(self.tokens))
+        for i, token in enumerate(tokens, start):
+            if token is None:
+                continue
+            merged[i] = token.copy() if merged[i] is None else _intersect_tokens(
+                merged[i], token)
+            if merged[i] is None:
+                return None
+
+        return MemorizedWord(merged, self.is_open and is_exact == False)
+
+    def resolve(self, token_str):
+        """ The strings of token_str that can be the memorized word, None if there are none """
+        if len(self.tokens) == 0 and self.is_open == True:
+            return token_str
+
+        if len(token_str) < len(self.tokens) or (
+                self.is_open == False and len(token_str) != len(self.tokens)):
+            return None
+
+        tokens = list(token_str.tokens)
+        for i, token in enumerate(self.tokens):
+            if token is not None:
+                tokens[i] = _intersect_tokens(tokens[i], token)
+                if tokens[i] is None:
+                    return None
+
+        return _tokenstring_of(tokens)
+
+
+def invert_memory_command(token_str, memorized, transformation, name):
+    """ Invert a memory command, see invert_one_memory_subrule.
+
+    Args:
+        token_str: the tokenstring for rule inversion.
+
+        memorized: MemorizedWord, what the rest of the subrule requires of the memorized word.
+
+        transformation: the tokenized transformation, name is in MEMORY_TRANSFORMATIONS
+
+    Returns:
+        A list of (preimage, MemorizedWord)
+    """
+    ret_vals = []
+    tokens = token_str.tokens
+    length = len(token_str)
+    max_password_length = RUNTIME_CONFIG['max_password_length']
+
+    if name == "M":
+        preimage = memorized.resolve(token_str)
+        if preimage is not None:
+            ret_vals.append((preimage, MemorizedWord()))
+
+    elif name in ("4", "6"):
+        # the memorized word is the last (4) or first (6) k chars
+        if memorized.is_open:
+            lengths = range(len(memorized.tokens), length + 1)
+        else:
+            lengths = range(len(memorized.tokens),
+                            min(len(memorized.tokens), length) + 1)
+        for k in lengths:
+            if name == "4":
+                memorized_part, rest = tokens[length - k:], tokens[:length - k]
+            else:
+                memorized_part, rest = tokens[:k], tokens[k:]
+            new_memorized = memorized.constrain(0, memorized_part, True)
+            if new_memorized is not None:
+                ret_vals.append((_tokenstring_of(rest), new_memorized))
+
+        # HC doesn't add the memorized word if the result is too long, it could be itself
+        # JtR truncates the result instead
+        if RUNTIME_CONFIG.is_hc():
+            new_memorized = memorized.constrain(
+                0, [None] * max(1, max_password_length - length + 1))
+            if new_memorized is not None:
+                ret_vals.append((_tokenstring_of(tokens), new_memorized))
+
+    elif name == "X_N_M_I":
+        # M chars from N of the memorized word were inserted at I
+        N, M, I = (convert_str_length_to_int(c) for c in transformation[1:4])
+        if M < 1 or I > length - M:
+            return ret_vals
+        new_memorized = memorized.constrain(N, tokens[I:I + M])
+        if new_memorized is not None:
+            ret_vals.append((_tokenstring_of(tokens[:I] + tokens[I + M:]),
+                             new_memorized))
+
+    else:
+        raise FatalRuntimeError("Unknown Memory Command: {}".format(name))
+
+    return ret_vals
+
+
+def invert_one_memory_subrule(token_str, subrule_plan):
+    """ Invert a subrule with memory commands, see is_memory_subrule.
+
+    Each preimage is paired with a MemorizedWord, what the memory commands after it require of
+    the memorized word. Going backward:
+        4/6: the last/first chars of the word are the memorized word, for each length it could have
+        XNMI: the M chars at I are the chars from N of the memorized word
+        M: the word is the memorized word, nothing is required of it before M
+    Other transformations don't change the memorized word. Before the first M, the memorized word
+    is the input word, so each preimage at the start of the subrule is resolved as for M.
+
+    Args:
+        token_str: the tokenstring for rule inversion.
+
+        subrule_plan: compiled subrule, see RuleWrapper.get_plan.
+
+    Returns:
+        An instance of InversionResult containing all possible preimages (represented in tokenstrings)
+    """
+    states = [(token_str, MemorizedWord())]
+    for compiled in subrule_plan[::-1]:
+        new_states = []
+        for state_token_str, memorized in states:
+            if compiled.name in MEMORY_TRANSFORMATIONS:
+                new_states += invert_memory_command(state_token_str, memorized,
+                                                    compiled.transformation,
+                                                    compiled.name)
+                continue
+
+            result = invert_single_transformation(
+                [state_token_str],
+                compiled.transformation,
+                inversion_function=compiled.inversion_function)
+            if result.is_normal() != True:
+                return result
+            new_states += [(preimage, memorized) for preimage in result]
+
+        states = new_states
+        if len(states) == 0:
+            break
+
+    ret_val = InversionResult()
+    for state_token_str, memorized in states:
+        preimage = memorized.resolve(state_token_str)
+        if preimage is not None:
+            ret_val.add(preimage)
+    return ret_val
+
+
+def invert_one_subrule(token_str,
+                       subrule,
+                       enable_regex=False,
+                       skip_index=None,
+                       subrule_plan=None):
     """ Invert a subrule, which doesn't have any parallelism
 
     Args:
@@ -5322,14 +5464,22 @@ def invert_one_subrule(token_str, subrule, enable_regex=False, skip_index=None):
 
         skip_index: additional information for special cases in JtR.
 
+        subrule_plan: compiled subrule, see RuleWrapper.get_plan. None to compile it here.
+
     Returns:
         An instance of InversionResult containing all possible preimages (represented in tokenstrings)
     """
     memorized_words = set()
+    if subrule_plan is None:
+        subrule_plan = [CompiledTransformation(t) for t in subrule]
+
+    if skip_index is None and is_memory_subrule(subrule_plan):
+        return invert_one_memory_subrule(token_str, subrule_plan)
 
     result = InversionResult(token_str)
     # For each transformation
-    for i, transformation in enumerate(subrule[::-1]):
+    for i, compiled in enumerate(subrule_plan[::-1]):
+        transformation = compiled.transformation
 
         # If that place is Q, then memorize the word.
         if skip_index != None and (i + skip_index) == len(subrule) - 1:
@@ -5345,7 +5495,8 @@ def invert_one_subrule(token_str, subrule, enable_regex=False, skip_index=None):
             continue
 
         result = invert_single_transformation(result.get_value(),
-                                              transformation)
+                                              transformation,
+                                              inversion_function=compiled.inversion_function)
 
         if result.is_normal() != True or result.is_null() == True:
             return result
@@ -5372,10 +5523,11 @@ def invert_one_rule(token_str, one_rule, enable_regex=False, skip_index=None):
 
     ret_val = InversionResult()
 
-    for subrule in one_rule.rules:
+    for subrule, subrule_plan in zip(one_rule.rules,
+                                     one_rule.get_plan(CompiledTransformation)):
 
         result = invert_one_subrule(
-            deepcopy(token_str), subrule, skip_index, skip_index)
+            deepcopy(token_str), subrule, enable_regex, skip_index, subrule_plan)
         result_status = result.get_status()
 
         # If the inverison goes well
@@ -5392,8 +5544,343 @@ def invert_one_rule(token_str, one_rule, enable_regex=False, skip_index=None):
     return ret_val
 
 
-def check_one_transformation(transformation, enable_regex=False):
-    inversion_function = get_inversion_function(transformation)
+# transformations inverted by invert_one_rule_batch on encoded passwords,
+# they only check, or remove an appended/prepended char
+BATCH_TRANSFORMATIONS = {
+    "colon", "less_than_N", "greater_than_N", "underscore_N", "dollar_X",
+    "caret_X", "slash_X", "bang_X", "left_paren_X", "right_paren_X",
+    "equal_N_X"
+}
+
+
+def is_batch_transformation(transformation):
+    """ whether invert_one_rule_batch inverts transformation on encoded passwords """
+    name = get_name_of_a_rule(transformation)
+    if name not in BATCH_TRANSFORMATIONS:
+        return False
+
+    # a set of chars is only supported when appending/prepending
+    if name not in ("dollar_X", "caret_X") and type(transformation[-1]) != str:
+        return False
+
+    return True
+
+
+def is_batch_rule(one_rule):
+    """ whether every subrule of a rule ends with a transformation that invert_one_rule_batch handles """
+    plan = one_rule.get_plan(CompiledTransformation)
+    return len(plan) != 0 and all(
+        len(subrule_plan) != 0 and subrule_plan[-1].is_batch
+        for subrule_plan in plan) and has_memory_subrule(one_rule) == False
+
+
+def _invert_batch_transformation(compiled, chars, start, end, alive):
+    """ Invert one transformation on encoded passwords.
+
+    Args:
+        compiled: a CompiledTransformation, compiled.is_batch is True
+
+        chars: (number of passwords x max length) uint8 array of encoded passwords
+
+        start, end: int arrays, each password is chars[i][start[i]:end[i]]
+
+        alive: bool array, passwords not rejected so far
+
+    Returns:
+        (start, end, alive, fallback), fallback is a bool array of passwords that
+        have to be inverted through invert_single_transformation
+    """
+    transformation = compiled.transformation
+    name = compiled.name
+    length = end - start
+    rows = np.arange(len(start))
+    fallback = np.zeros(len(start), dtype=bool)
+
+    def char_at(pos, is_valid):
+        """ chars[i][pos[i]] where is_valid[i], -1 elsewhere """
+        ret = np.full(len(start), -1, dtype=np.int64)
+        ret[is_valid] = chars[rows[is_valid], pos[is_valid]]
+        return ret
+
+    def window_has(X):
+        """ whether X is in each password """
+        cols = np.arange(chars.shape[1])
+        window = (cols >= start[:, None]) & (cols < end[:, None])
+        return ((chars == ord(X)) & window).any(axis=1)
+
+    if name == "colon":
+        pass
+
+    elif name == "less_than_N":
+        N = convert_str_length_to_int(transformation[1])
+        alive &= length < N if RUNTIME_CONFIG.is_jtr() else length <= N
+
+    elif name == "greater_than_N":
+        N = convert_str_length_to_int(transformation[1])
+        alive &= length > N if RUNTIME_CONFIG.is_jtr() else length >= N
+
+    elif name == "underscore_N":
+        N = convert_str_length_to_int(transformation[1])
+        alive &= length == N
+
+    elif name in ("dollar_X", "caret_X"):
+        # see invert_i_N_X_command, if too long the password could be itself
+        fallback = alive & (length + 1 > RUNTIME_CONFIG['max_password_length'])
+        alive &= ~fallback
+
+        X = transformation[1]
+        is_X = np.zeros(256, dtype=bool)
+        is_X[[ord(c) for c in X if ord(c) < 256]] = True
+
+        is_valid = alive & (length >= 1)
+        pos = end - 1 if name == "dollar_X" else start
+        alive &= is_valid & is_X[np.maximum(char_at(pos, is_valid), 0)]
+        if name == "dollar_X":
+            end = np.where(alive, end - 1, end)
+        else:
+            start = np.where(alive, start + 1, start)
+
+    elif name == "slash_X":
+        alive &= window_has(transformation[1])
+
+    elif name == "bang_X":
+        alive &= ~window_has(transformation[1])
+
+    elif name in ("left_paren_X", "right_paren_X"):
+        is_valid = alive & (length >= 1)
+        pos = start if name == "left_paren_X" else end - 1
+        alive &= char_at(pos, is_valid) == ord(transformation[1])
+
+    elif name == "equal_N_X":
+        N = convert_str_length_to_int(transformation[1])
+        is_valid = alive & (length > N)
+        pos = start + np.where(is_valid, N, 0).astype(np.int64)
+        alive &= char_at(pos, is_valid) == ord(transformation[2])
+
+    return start, end, alive, fallback
+
+
+def invert_one_rule_batch(passwords, one_rule, enable_regex=False):
+    """ Invert one rule for many passwords, same as invert_one_rule for each password.
+
+    Each subrule is inverted from its last transformation for all passwords at once. While
+    transformations only check or remove an appended/prepended char (see BATCH_TRANSFORMATIONS),
+    passwords are rows of an encoded array and each transformation is a vectorized filter.
+    From the first other transformation, passwords left are tokenized and inverted one by one.
+
+    Args:
+        passwords: a list of passwords
+
+        one_rule: tokenized rule. Rules with special memory handling are not supported, use invert_one_rule.
+
+        enable_regex: Whether to enable regex operation, see invert_one_rule.
+
+    Returns:
+        A list of InversionResult, one for each password
+    """
+    ret_vals = [InversionResult() for _ in passwords]
+    is_profile = RUNTIME_CONFIG['profile']
+
+    # passwords with chars >= chr(256) are inverted one by one from the start
+    is_encoded = np.array([all(ord(c) < 256 for c in pwd) for pwd in passwords],
+                          dtype=bool)
+    lengths = np.array([len(pwd) for pwd in passwords], dtype=np.int64)
+    chars = np.zeros((len(passwords), max(lengths, default=0)), dtype=np.uint8)
+    for idx, pwd in enumerate(passwords):
+        if is_encoded[idx]:
+            chars[idx, :len(pwd)] = np.frombuffer(pwd.encode('latin-1'),
+                                                  dtype=np.uint8)
+
+    is_done = np.zeros(len(passwords), dtype=bool)  # inversion is not normal
+    for subrule_plan in one_rule.get_plan(CompiledTransformation):
+        reversed_subrule = subrule_plan[::-1]
+        start = np.zeros(len(passwords), dtype=np.int64)
+        end = lengths.copy()
+        alive = is_encoded & ~is_done
+        # index in reversed_subrule, from where each password is inverted one by one
+        scalar_from = np.full(len(passwords), len(subrule_plan), dtype=np.int64)
+        scalar_from[~is_encoded] = 0
+
+        for i, compiled in enumerate(reversed_subrule):
+            if alive.any() == False:
+                break
+
+            if compiled.is_batch == False:
+                scalar_from[alive] = i
+                break
+
+            if is_profile == True:
+                stime = perf_counter()
+
+            start, end, alive, fallback = _invert_batch_transformation(
+                compiled, chars, start, end, alive)
+            scalar_from[fallback] = i
+
+            if is_profile == True:
+                INVERSION_PROFILE.add_command(
+                    "batch_{}".format(compiled.name),
+                    perf_counter() - stime)
+
+        for idx, pwd in enumerate(passwords):
+            if is_done[idx]:
+                continue
+
+            if scalar_from[idx] == len(subrule_plan):
+                if alive[idx]:
+                    ret_vals[idx].add(tokenize(pwd[start[idx]:end[idx]]))
+                continue
+
+            # the rest of the subrule, see invert_one_subrule
+            result = InversionResult(tokenize(pwd[start[idx]:end[idx]]))
+            for compiled in reversed_subrule[scalar_from[idx]:]:
+                result = invert_single_transformation(
+                    result.get_value(),
+                    compiled.transformation,
+                    inversion_function=compiled.inversion_function)
+                if result.is_normal() != True or result.is_null() == True:
+                    break
+
+            if result.is_normal():
+                ret_vals[idx] += result
+            else:
+                ret_vals[idx].set_status(result.get_status())
+                if result.error_msg != "":
+                    ret_vals[idx].set_error_msg(result.error_msg)
+                is_done[idx] = True
+
+    return ret_vals
+
+
+class RuleSuffixTrie():
+    """ Rules compiled into a trie of reversed transformations.
+
+    Subrules are inverted from the last transformation backwards, so subrules ending with
+    the same transformations share a path from the root. With a memo of the results of each
+    node (for one password), the shared suffix is inverted once for all rules under that node.
+
+    Rules with special memory handling (special_idx) or memory commands are not in the trie, use invert_one_rule.
+    """
+
+    def __init__(self, rulelist):
+        """ Build the trie from the rules in rulelist that are inverted.
+
+        Args:
+            rulelist: preprocessed rulelist
+        """
+        self.parents = [None]  # node -> parent node, 0 is the root
+        self.transformations = [None]  # node -> CompiledTransformation of the edge from parent
+        self.children = [{}]  # node -> {repr(transformation): child node}
+        self.is_final = [False]  # node -> whether some subrule ends here
+        self.rule_nodes = {}  # r_idx -> final node of each subrule
+        last_use = {}  # node -> last r_idx using it
+
+        for r_idx, r in enumerate(rulelist):
+            if self.is_in_trie(r) == False:
+                continue
+
+            self.rule_nodes[r_idx] = []
+            for subrule_plan in r.get_plan(CompiledTransformation):
+                node = 0
+                for compiled in subrule_plan[::-1]:
+                    key = repr(compiled.transformation)
+                    if key not in self.children[node]:
+                        self.parents.append(node)
+                        self.transformations.append(compiled)
+                        self.children.append({})
+                        self.is_final.append(False)
+                        self.children[node][key] = len(self.parents) - 1
+                    node = self.children[node][key]
+                    last_use[node] = r_idx
+
+                self.is_final[node] = True
+                self.rule_nodes[r_idx].append(node)
+
+        # nodes whose memo can be dropped once a rule is done
+        self.released_nodes = {}
+        for node, r_idx in last_use.items():
+            self.released_nodes.setdefault(r_idx, []).append(node)
+
+    @staticmethod
+    def is_in_trie(r):
+        """ whether a rule is inverted through the trie, rules inverted in batch are not """
+        if has_memory_subrule(r):
+            return False
+        if r.feasibility.is_invertible():
+            return r.feasibility.special_idx is None and is_batch_rule(r) == False
+        return r.feasibility.is_optimizable() and is_batch_rule(r) == False
+
+    def get_released_nodes(self, r_idx):
+        """ nodes that no rule after r_idx uses """
+        return self.released_nodes.get(r_idx, [])
+
+    def _get_node_result(self, token_str, node, memo):
+        """ The result of inverting token_str through the transformations from the root to node """
+        if node in memo:
+            return memo[node]
+
+        if node == 0:
+            result = InversionResult(token_str)
+
+        else:
+            parent = self.parents[node]
+            parent_result = self._get_node_result(token_str, parent, memo)
+
+            if parent_result.is_normal() != True or parent_result.is_null(
+            ) == True:
+                result = parent_result
+
+            else:
+                token_strs = parent_result.get_value()
+                # inversion changes the tokenstrings, copy if someone else reads them
+                if parent == 0 or len(self.children[parent]) > 1 or self.is_final[parent]:
+                    token_strs = deepcopy(token_strs)
+                compiled = self.transformations[node]
+                result = invert_single_transformation(
+                    token_strs,
+                    compiled.transformation,
+                    inversion_function=compiled.inversion_function)
+
+        memo[node] = result
+        return result
+
+    def invert(self, token_str, r_idx, memo):
+        """ Invert one rule, same as invert_one_rule.
+
+        Args:
+            token_str: the initial tokenized password.
+
+            r_idx: index of the rule, it has to be in the trie.
+
+            memo: a dict of results of each node for token_str, shared by all rules. Should only be used for one token_str.
+
+        Returns:
+            An instance of InversionResult containing all possible preimages (represented in tokenstrings)
+        """
+        ret_val = InversionResult()
+
+        for node in self.rule_nodes[r_idx]:
+            result = self._get_node_result(token_str, node, memo)
+            result_status = result.get_status()
+
+            # If the inverison goes well
+            if result_status == InversionStatus.NORMAL:
+                ret_val += result
+
+            # If the rule cannot be inverted or something goes wrong
+            else:
+                ret_val.set_status(result_status)
+                if result.error_msg != "":
+                    ret_val.set_error_msg(result.error_msg)
+                return ret_val
+
+        return ret_val
+
+
+def check_one_transformation(transformation,
+                             enable_regex=False,
+                             inversion_function=None):
+    if inversion_function is None:
+        inversion_function = get_inversion_function(transformation)
     single_invertibility = inversion_function(
         None, transformation, just_check=True, enable_regex=enable_regex)
     return single_invertibility
@@ -5410,10 +5897,16 @@ def check_is_invertible(one_rule, enable_regex=False):
     """
     rule_invertibility = Invertibility.INVERTIBLE
 
-    for subrule in one_rule.rules:  # each subrule
-        for transformation in subrule:  # each transformation
+    for subrule_plan in one_rule.get_plan(
+            CompiledTransformation):  # each subrule
+        # memory commands are inverted with the whole subrule, see invert_one_memory_subrule
+        is_memory = is_memory_subrule(subrule_plan)
+        for compiled in subrule_plan:  # each transformation
+            if is_memory and compiled.name in MEMORY_TRANSFORMATIONS:
+                continue
             single_invertibility = check_one_transformation(
-                transformation, enable_regex)
+                compiled.transformation, enable_regex,
+                compiled.inversion_function)
             if single_invertibility < rule_invertibility:  # set to lowest possibility
                 rule_invertibility = single_invertibility
                 if rule_invertibility == Invertibility.UNINVERTIBLE:
@@ -38,6 +38,8 @@ class RuleWrapper():
         tokenized: tokenized rule, will be further processed.
 
         rules: fully parsed, unparalleled and tokenized subrules.
+
+        plans: compiled subrules, see get_plan.
     """
 
     @staticmethod
@@ -190,12 +192,34 @@ class RuleWrapper():
         """
         self.raw = raw
         self.tokenized = tokenized
+        self.plans = {}
         self._process_rule()
 
     def __repr__(self):
         return "Raw: {}\nSubrules:{}\nNumber of Subrules:{}\n".format(
             self.raw, self.rules, len(self.rules))
 
+    def get_plan(self, compile_transformation):
+        """ Compile each transformation of each subrule once, and keep the result.
+
+        How a transformation is handled depends on the running style (e.g., "p" is pN in HC),
+        so a plan is kept for each (compile_transformation, running style).
+        If subrules are changed, plans should be cleared.
+
+        Args:
+            compile_transformation: takes a transformation, returns its compiled form.
+
+        Returns:
+            A list for each subrule, compiled transformations in the same order as the subrule.
+        """
+        key = (compile_transformation, RUNTIME_CONFIG['running_style'])
+        if key not in self.plans:
+            self.plans[key] = [[
+                compile_transformation(transformation)
+                for transformation in subrule
+            ] for subrule in self.rules]
+        return self.plans[key]
+
     def _process_rule(self):
         """ Given a tokenized rule, further process it.
 
@@ -0,0 +1,144 @@
+"""This file contains the cost profile of the inversion phase."""
+from collections import defaultdict
+import json
+import csv
+
+# how a (rule, password) is looked up after inversion
+LOOKUP_PATHS = ['dict', 'trie', 'look']
+
+
+class InversionProfile():
+    """ Wall time, call counts, preimages, lookup paths and hits, per rule and per inversion command.
+
+    Only filled when RUNTIME_CONFIG['profile'] is True, see INVERSION_PROFILE.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """ drop everything recorded """
+        # r_idx -> {time, calls, preimages, max_preimages, dict, trie, look, hits, errors}
+        self.rules = defaultdict(lambda: defaultdict(int))
+        # invert_*_command -> {time, calls}
+        self.commands = defaultdict(lambda: defaultdict(int))
+
+    def add_rule(self,
+                 r_idx,
+                 elapsed,
+                 number_of_strings=0,
+                 lookup_path=None,
+                 hits=0,
+                 is_error=False):
+        """ record one (rule, password) """
+        stats = self.rules[r_idx]
+        stats['time'] += elapsed
+        stats['calls'] += 1
+        stats['preimages'] += number_of_strings
+        stats['max_preimages'] = max(stats['max_preimages'],
+                                     number_of_strings)
+        if lookup_path is not None:
+            stats[lookup_path] += 1
+        stats['hits'] += hits
+        stats['errors'] += 1 if is_error else 0
+
+    def add_command(self, name, elapsed):
+        """ record one call of an inversion command """
+        stats = self.commands[name]
+        stats['time'] += elapsed
+        stats['calls'] += 1
+
+    def merge(self, other):
+        """ add what other recorded, e.g. in a worker process """
+        for r_idx, stats in other.rules.items():
+            for k, v in stats.items():
+                if k == 'max_preimages':
+                    self.rules[r_idx][k] = max(self.rules[r_idx][k], v)
+                else:
+                    self.rules[r_idx][k] += v
+
+        for name, stats in other.commands.items():
+            for k, v in stats.items():
+                self.commands[name][k] += v
+
+    def __getstate__(self):
+        return {
+            'rules': {k: dict(v)
+                      for k, v in self.rules.items()},
+            'commands': {k: dict(v)
+                         for k, v in self.commands.items()}
+        }
+
+    def __setstate__(self, state):
+        self.clear()
+        for k, v in state['rules'].items():
+            self.rules[k].update(v)
+        for k, v in state['commands'].items():
+            self.commands[k].update(v)
+
+    def get_rule_report(self, rulelist):
+        """ a list of dicts, one for each rule, most expensive first """
+        report = []
+        for r_idx, stats in self.rules.items():
+            r = rulelist[r_idx]
+            if r.feasibility.is_invertible():
+                feasibility = "invertible"
+            elif r.feasibility.is_optimizable():
+                feasibility = "optimizable"
+            else:
+                feasibility = "uninvertible"
+
+            row = {
+                'rule_idx': r_idx,
+                'rule': r.raw,
+                'feasibility': feasibility,
+                'time': stats['time'],
+                'calls': stats['calls'],
+                'preimages': stats['preimages'],
+                'max_preimages': stats['max_preimages'],
+            }
+            for path in LOOKUP_PATHS:
+                row[path] = stats[path]
+            row['hits'] = stats['hits']
+            row['errors'] = stats['errors']
+            report.append(row)
+
+        return sorted(report, key=lambda row: row['time'], reverse=True)
+
+    def get_command_report(self):
+        """ a list of dicts, one for each inversion command, most expensive first """
+        report = [{
+            'command': name,
+            'time': stats['time'],
+            'calls': stats['calls']
+        } for name, stats in self.commands.items()]
+
+        return sorted(report, key=lambda row: row['time'], reverse=True)
+
+    def write(self, addr_prefix, rulelist):
+        """ Write {addr_prefix}.profile.json, and the same reports in {addr_prefix}.profile_rules.csv/profile_commands.csv """
+        rule_report = self.get_rule_report(rulelist)
+        command_report = self.get_command_report()
+
+        with open(addr_prefix + ".profile.json", 'w') as f:
+            json.dump({
+                'rules': rule_report,
+                'commands': command_report
+            },
+                      f,
+                      indent=1)
+
+        for name, report in (("rules", rule_report), ("commands",
+                                                      command_report)):
+            with open("{}.profile_{}.csv".format(addr_prefix, name),
+                      'w',
+                      newline='') as f:
+                if len(report) == 0:
+                    continue
+                writer = csv.DictWriter(f, fieldnames=list(report[0].keys()))
+                writer.writeheader()
+                writer.writerows(report)
+
+
+# profile of the current process
+INVERSION_PROFILE = InversionProfile()
@@ -0,0 +1,182 @@
+"""This file contains writers for structured (binary/columnar) results."""
+from common import FatalRuntimeError
+import numpy as np
+import gzip
+import os
+
+# one record for each guess made
+HIT_DTYPE = np.dtype([('pw_idx', '<i8'), ('rule_idx', '<i4'),
+                      ('word_idx', '<i8'), ('guess', '<i8'), ('lower', '<i8'),
+                      ('upper', '<i8')])
+# one record for each password, min_guess is -1 if not guessable
+SUMMARY_DTYPE = np.dtype([('pw_idx', '<i8'), ('min_guess', '<i8')])
+
+RESULTS_FORMATS = ['npy', 'csv']
+
+
+class RecordFile():
+    """ Append-only file of records of a fixed dtype.
+
+    Records are kept in a typed array, and written to disk every flush_size records.
+    For npy, records are written raw to a temporary file, and turned into a .npy file on close,
+    so the file can be loaded by np.load (also with mmap_mode). For csv, the file is gzipped.
+    """
+
+    def __init__(self,
+                 addr_prefix,
+                 dtype,
+                 results_format,
+                 flush_size=65536,
+                 state=None):
+        """ Initialize a record file.
+
+        Args:
+            addr_prefix: address of the file, without extension
+
+            dtype: a numpy structured dtype
+
+            results_format: either npy or csv
+
+            flush_size: number of records kept in memory before writing to disk
+
+            state: returned by checkpoint, continue writing from there. None to start a new file.
+        """
+        if results_format not in RESULTS_FORMATS:
+            raise FatalRuntimeError(
+                "Unknown Results Format: {}".format(results_format))
+
+        self.dtype = dtype
+        self.results_format = results_format
+        self.buffer = np.zeros(flush_size, dtype=dtype)
+        self.buffer_size = 0
+        self.number_of_records = 0
+
+        if results_format == 'npy':
+            self.addr = addr_prefix + ".npy"
+            self.tmp_addr = addr_prefix + ".npy.tmp"
+        else:
+            self.addr = addr_prefix + ".csv.gz"
+
+        if state is None:
+            if results_format == 'npy':
+                self.f = open(self.tmp_addr, 'wb')
+            else:
+                self.f = gzip.open(self.addr, 'wt')
+                self.f.write(",".join(dtype.names) + "\n")
+
+        else:
+            # drop whatever was written after the checkpoint
+            self.number_of_records = state['number_of_records']
+            if results_format == 'npy':
+                self.f = open(self.tmp_addr, 'r+b')
+                self.f.truncate(self.number_of_records * dtype.itemsize)
+                self.f.seek(0, os.SEEK_END)
+            else:
+                with open(self.addr, 'r+b') as f:
+                    f.truncate(state['size'])
+                self.f = gzip.open(self.addr, 'at')
+
+    def append(self, *record):
+        """ Append one record, fields in the order of dtype """
+        self.buffer[self.buffer_size] = record
+        self.buffer_size += 1
+
+        if self.buffer_size == len(self.buffer):
+            self.flush()
+
+    def flush(self):
+        """ Write records in memory to disk """
+        records = self.buffer[:self.buffer_size]
+
+        if self.results_format == 'npy':
+            self.f.write(records.tobytes())
+        else:
+            columns = [records[name] for name in self.dtype.names]
+            self.f.write("".join(
+                ",".join(str(v) for v in row) + "\n"
+                for row in zip(*(c.tolist() for c in columns))))
+
+        self.number_of_records += self.buffer_size
+        self.buffer_size = 0
+
+    def checkpoint(self):
+        """ Write everything to disk, return a state to continue writing from """
+        self.flush()
+
+        if self.results_format == 'npy':
+            self.f.flush()
+            return {'number_of_records': self.number_of_records}
+
+        else:
+            # end the gzip member, so the file can be cut here
+            self.f.close()
+            state = {
+                'number_of_records': self.number_of_records,
+                'size': os.path.getsize(self.addr)
+            }
+            self.f = gzip.open(self.addr, 'at')
+            return state
+
+    def close(self):
+        """ Flush and close the file """
+        self.flush()
+        self.f.close()
+
+        if self.results_format == 'npy':
+            with open(self.addr, 'wb') as out, open(self.tmp_addr,
+                                                    'rb') as raw:
+                np.lib.format.write_array_header_1_0(
+                    out, {
+                        'descr': np.lib.format.dtype_to_descr(self.dtype),
+                        'fortran_order': False,
+                        'shape': (self.number_of_records, )
+                    })
+                while True:
+                    block = raw.read(1 << 24)
+                    if not block:
+                        break
+                    out.write(block)
+
+            os.remove(self.tmp_addr)
+
+
+class ResultsWriter():
+    """ Writes guesses and the min guess of each password into two record files.
+
+    Files written:
+        {addr_prefix}.hits.{npy/csv.gz}: (pw_idx, rule_idx, word_idx, guess, lower, upper) for each guess
+        {addr_prefix}.summary.{npy/csv.gz}: (pw_idx, min_guess) for each password
+    """
+
+    def __init__(self,
+                 addr_prefix,
+                 results_format,
+                 flush_size=65536,
+                 state=None):
+        state = state if state is not None else {}
+        self.hits = RecordFile(addr_prefix + ".hits", HIT_DTYPE,
+                               results_format, flush_size,
+                               state.get('hits'))
+        self.summary = RecordFile(addr_prefix + ".summary", SUMMARY_DTYPE,
+                                  results_format, flush_size,
+                                  state.get('summary'))
+
+    def add_hit(self, pw_idx, rule_idx, word_idx, guess, lower, upper):
+        """ Record a guess """
+        self.hits.append(pw_idx, rule_idx, word_idx, guess, lower, upper)
+
+    def add_summary(self, pw_idx, min_guess):
+        """ Record the min guess of a password, None if not guessable """
+        self.summary.append(pw_idx, -1 if min_guess is None else min_guess)
+
+    def checkpoint(self):
+        """ Write everything to disk, return a state to continue writing from """
+        return {
+            'hits': self.hits.checkpoint(),
+            'summary': self.summary.checkpoint()
+        }
+
+    def close(self):
+        """ Flush and close all files """
+        self.hits.close()
+        self.summary.close()
@@ -0,0 +1,225 @@
+"""This file contains signatures of rules, necessary conditions on the passwords a rule can make."""
+from config import RUNTIME_CONFIG
+from invert_helper import Dicts
+from invert_rule import CompiledTransformation
+from utility import convert_str_length_to_int
+import numpy as np
+
+# columns of chars in password features: chr(0) - chr(255), one column for all other chars,
+# and one for "no char" (first/last char of an empty password)
+OTHER_CHARS_COLUMN = 256
+NO_CHAR_COLUMN = 257
+NUMBER_OF_COLUMNS = 258
+
+
+def get_columns(chars):
+    """ columns of a set of chars, chars >= chr(256) share OTHER_CHARS_COLUMN """
+    return sorted(set(min(ord(c), OTHER_CHARS_COLUMN) for c in chars))
+
+
+class PasswordFeatures():
+    """ Length, first char, last char and the chars contained, for a list of passwords. """
+
+    def __init__(self, passwords):
+        """ Collect features of passwords, a list of str """
+        self.lengths = np.array([len(pwd) for pwd in passwords],
+                                dtype=np.int64)
+        max_length = max(self.lengths, default=0)
+        # chars of each password, padded with NO_CHAR_COLUMN
+        self.columns = np.full((len(passwords), max(1, max_length)),
+                               NO_CHAR_COLUMN,
+                               dtype=np.uint16)
+        for idx, pwd in enumerate(passwords):
+            self.columns[idx, :len(pwd)] = [
+                min(ord(c), OTHER_CHARS_COLUMN) for c in pwd
+            ]
+        self.first = self.columns[:, 0]
+        self.last = self.columns[np.arange(len(passwords)),
+                                 np.maximum(self.lengths - 1, 0)]
+        self.contains_cache = {}  # tuple of columns -> whether each password contains one of them
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def contains_any(self, columns):
+        """ whether each password contains a char in columns """
+        key = tuple(columns)
+        if key not in self.contains_cache:
+            self.contains_cache[key] = np.isin(self.columns,
+                                               columns).any(axis=1)
+        return self.contains_cache[key]
+
+
+class SubruleSignature():
+    """ Necessary conditions on the passwords a subrule makes.
+
+    They are derived from the last transformations of the subrule, which are inverted first:
+    appends/prepends ($X ^X) fix the last/first char and the length, rejections (<N >N _N (X )X /X !X)
+    bound the length or require chars, and a final case command (l u c C) forbids some chars.
+    The first transformation that is none of these ends the signature. A password that doesn't
+    meet the conditions is rejected by inverting these transformations, so inverting it can be skipped.
+    """
+
+    def __init__(self, subrule_plan):
+        """ Derive the signature from a compiled subrule, see RuleWrapper.get_plan """
+        self.min_length = 0
+        self.max_length = float("inf")
+        self.first = None  # bool table over columns, allowed first chars. None for any.
+        self.last = None  # bool table over columns, allowed last chars. None for any.
+        self.required = []  # lists of columns, a password contains a char of each
+        self.forbidden = set()  # columns, a password contains none of them
+
+        appended, prepended = 0, 0  # chars added after/before what's left of the subrule
+        for compiled in subrule_plan[::-1]:
+            name, transformation = compiled.name, compiled.transformation
+            # what's left of the subrule makes a string of length L - added
+            added = appended + prepended
+            try:
+                if name == "colon" or name == "equal_N_X":
+                    continue
+
+                elif name in ("dollar_X", "caret_X"):
+                    if name == "dollar_X" and appended == 0:
+                        self.last = self._restrict(self.last, transformation[1])
+                    elif name == "caret_X" and prepended == 0:
+                        self.first = self._restrict(self.first, transformation[1])
+                    self.min_length = max(self.min_length, added + 1)
+                    if name == "dollar_X":
+                        appended += 1
+                    else:
+                        prepended += 1
+
+                elif type(transformation[-1]) != str:
+                    break
+
+                elif name == "less_than_N":
+                    N = convert_str_length_to_int(transformation[1])
+                    N = N - 1 if RUNTIME_CONFIG.is_jtr() else N
+                    self.max_length = min(self.max_length, N + added)
+
+                elif name == "greater_than_N":
+                    N = convert_str_length_to_int(transformation[1])
+                    N = N + 1 if RUNTIME_CONFIG.is_jtr() else N
+                    self.min_length = max(self.min_length, N + added)
+
+                elif name == "underscore_N":
+                    N = convert_str_length_to_int(transformation[1])
+                    self.min_length = max(self.min_length, N + added)
+                    self.max_length = min(self.max_length, N + added)
+
+                elif name in ("left_paren_X", "left_paren_question_C"):
+                    if prepended == 0:
+                        self.first = self._restrict(
+                            self.first, self._get_chars(transformation))
+                    self.min_length = max(self.min_length, added + 1)
+
+                elif name in ("right_paren_X", "right_paren_question_C"):
+                    if appended == 0:
+                        self.last = self._restrict(
+                            self.last, self._get_chars(transformation))
+                    self.min_length = max(self.min_length, added + 1)
+
+                elif name in ("slash_X", "slash_question_C"):
+                    self.required.append(
+                        get_columns(self._get_chars(transformation)))
+
+                elif name in ("bang_X", "bang_question_C"):
+                    if added == 0:
+                        self._forbid(self._get_chars(transformation))
+
+                elif name in ("l", "u", "c", "C"):
+                    if added == 0:
+                        if name == "l":
+                            self._forbid(Dicts.classes['u'])
+                        elif name == "u":
+                            self._forbid(Dicts.classes['l'])
+                        elif name == "c":
+                            self.first = self._exclude(self.first,
+                                                       Dicts.classes['l'])
+                        else:
+                            self.first = self._exclude(self.first,
+                                                       Dicts.classes['u'])
+                    break
+
+                else:
+                    break
+
+            except Exception:
+                break
+
+    @staticmethod
+    def _get_chars(transformation):
+        """ the char X, or the chars of class C, of a rejection """
+        if transformation[1] == "?":
+            return Dicts.classes[transformation[2]]
+        return transformation[1]
+
+    @staticmethod
+    def _restrict(table, chars):
+        """ a table of allowed chars, only chars are allowed on top of table """
+        new_table = np.zeros(NUMBER_OF_COLUMNS, dtype=bool)
+        new_table[get_columns(chars)] = True
+        new_table[NO_CHAR_COLUMN] = True  # empty passwords are left to min_length
+        return new_table if table is None else table & new_table
+
+    @staticmethod
+    def _exclude(table, chars):
+        """ a table of allowed chars, chars are not allowed on top of table """
+        new_table = np.ones(NUMBER_OF_COLUMNS, dtype=bool)
+        new_table[[c for c in get_columns(chars) if c != OTHER_CHARS_COLUMN]] = False
+        return new_table if table is None else table & new_table
+
+    def _forbid(self, chars):
+        """ forbid chars, chars >= chr(256) are not forbidden since they share a column """
+        self.forbidden |= set(
+            c for c in get_columns(chars) if c != OTHER_CHARS_COLUMN)
+
+    def is_trivial(self):
+        """ whether every password meets the conditions """
+        return self.min_length == 0 and self.max_length == float(
+            "inf") and self.first is None and self.last is None and len(
+                self.required) == 0 and len(self.forbidden) == 0
+
+    def matches(self, features):
+        """ whether each password in features meets the conditions, a bool array """
+        lengths = features.lengths
+        ret_val = (lengths >= self.min_length) & (lengths <= self.max_length)
+        if self.first is not None:
+            ret_val &= self.first[features.first]
+        if self.last is not None:
+            ret_val &= self.last[features.last]
+        for columns in self.required:
+            ret_val &= features.contains_any(columns)
+        if len(self.forbidden) != 0:
+            ret_val &= ~features.contains_any(sorted(self.forbidden))
+        return ret_val
+
+
+class RuleSignature():
+    """ Necessary conditions on the passwords a rule makes, a password meets those of one of its subrules. """
+
+    def __init__(self, one_rule):
+        """ Derive the signature of a tokenized rule """
+        self.subrule_signatures = [
+            SubruleSignature(subrule_plan)
+            for subrule_plan in one_rule.get_plan(CompiledTransformation)
+        ]
+        self.is_trivial = len(self.subrule_signatures) == 0 or any(
+            s.is_trivial() for s in self.subrule_signatures)
+
+    def get_candidates(self, features):
+        """ Positions of passwords in features that the rule could make.
+
+        Passwords of length max_password_length or more are always kept: for them, inverting
+        an append/prepend could also give the password itself (see invert_i_N_X_command).
+
+        Returns:
+            A sorted array of positions, or None if every password could be made.
+        """
+        if self.is_trivial:
+            return None
+
+        is_candidate = features.lengths >= RUNTIME_CONFIG['max_password_length']
+        for signature in self.subrule_signatures:
+            is_candidate |= signature.matches(features)
+        return np.flatnonzero(is_candidate)
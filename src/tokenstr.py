@@ -5,7 +5,11 @@ from enum import Enum
 from copy import deepcopy
 from utility import char_is_printable
 from itertools import chain, combinations, product, permutations
-from invert_helper import Dicts
+from invert_helper import Dicts, CHARS_LOWER, CHARS_UPPER
+from config import RUNTIME_CONFIG
+from functools import reduce
+import operator
+import numpy as np
 
 
 class TokenType(Enum):
@@ -20,6 +24,36 @@ class TokenType(Enum):
     Regex = 2
 
 
+def chars_to_mask(chars):
+    """ Convert a set (or str) of chars to a bitmask, bit ord(c) is set for each char c """
+    mask = 0
+    for c in set(chars):
+        mask |= 1 << ord(c)
+    return mask
+
+
+def mask_to_chars(mask):
+    """ Convert a bitmask to the set of chars it represents """
+    chars = set()
+    while mask:
+        lowest = mask & -mask
+        chars.add(chr(lowest.bit_length() - 1))
+        mask ^= lowest
+    return chars
+
+
+if hasattr(int, "bit_count"):
+    popcount = int.bit_count
+else:
+    popcount = lambda mask: bin(mask).count("1")
+
+# lowercase letters are 32 positions after uppercase ones
+MASK_LOWER = chars_to_mask(CHARS_LOWER)
+MASK_UPPER = chars_to_mask(CHARS_UPPER)
+MASK_LETTERS = MASK_LOWER | MASK_UPPER
+CASE_OFFSET = ord('a') - ord('A')
+
+
 class TokenBase(metaclass=ABCMeta):
     """ Abstract Class Definition For Token
 
@@ -133,6 +167,150 @@ class Token(TokenBase):
         """ only set value """
         self.set_value(val)
 
+    def __contains__(self, c):
+        """ check if char c is in the set """
+        return c in self.token_value
+
+    def copy(self):
+        """ a token of the same type and set of chars """
+        return Token(self.token_value)
+
+    def has_any(self, chars):
+        """ check if any char in chars is in the set """
+        return not self.token_value.isdisjoint(chars)
+
+    def add(self, c):
+        """ add char c to the set, the set may be shared so it is not changed in place """
+        self.token_value = self.token_value | {c}
+
+    def intersect(self, chars, mask=None):
+        """ keep only the chars in chars, mask is the same set as a bitmask (if known)
+
+        Returns:
+            False if nothing is left
+        """
+        self.token_value = self.token_value & chars
+        return len(self.token_value) != 0
+
+    def discard(self, c):
+        """ remove char c from the set if present """
+        self.token_value = self.token_value - {c}
+
+    def expand_case(self, case):
+        """ Set the preimage of lowercasing (case = 'l') or uppercasing (case = 'u') all letters.
+
+        Letters of the other case are removed, letters of this case get their counterpart, others are kept.
+
+        Returns:
+            False if nothing is left (rejected)
+        """
+        convert = str.upper if case == 'l' else str.lower
+        value = self.token_value
+        new_set = set(value.difference(Dicts.classes['a'])) | set(
+            chain.from_iterable(
+                (x, convert(x)) for x in value.intersection(Dicts.classes[case])))
+        self.token_value = new_set
+        return len(new_set) != 0
+
+    def toggle_case(self):
+        """ toggle the case of all letters """
+        self.token_value = {
+            Dicts.toggle.setdefault(x, x) for x in self.token_value
+        }
+
+
+class BitmaskToken(Token):
+    """ A Token that stores its set of chars as a bitmask. bit ord(c) is set if c is in the set.
+
+    Case operations are bitwise, cardinality is a popcount. get_value() still returns a set
+    (decoded once per value), so inversion commands without bitwise operations work unchanged.
+    """
+
+    def __init__(self, val):
+        """ Initialize token with a set val, a str, or a bitmask (int) """
+        self.set_value(val)
+
+    def __len__(self):
+        """ returns cardinality of set """
+        return popcount(self.mask)
+
+    def __repr__(self):
+        """ print this token """
+        return 'set({})'.format(self.get_set_name(self.get_value()))
+
+    def set_value(self, val):
+        """ Specify the set of chars, val is a set, a str or a bitmask """
+        if type(val) is int:
+            self.mask = val
+
+        elif type(val) is str or type(val) is set:
+            self.mask = chars_to_mask(val)
+
+        else:
+            raise FatalRuntimeError("Unknown Set Up Type In Token")
+
+        self.chars = None
+
+    def get_value(self):
+        """ return the set of chars"""
+        if self.chars is None:
+            self.chars = mask_to_chars(self.mask)
+        return self.chars
+
+    @property
+    def token_value(self):
+        return self.get_value()
+
+    def get_mask(self):
+        """ return the bitmask """
+        return self.mask
+
+    def __contains__(self, c):
+        """ check if char c is in the set """
+        return (self.mask >> ord(c)) & 1 == 1
+
+    def copy(self):
+        """ a token of the same type and set of chars """
+        token = BitmaskToken(self.mask)
+        token.chars = self.chars
+        return token
+
+    def has_any(self, chars):
+        """ check if any char in chars is in the set """
+        return self.mask & chars_to_mask(chars) != 0
+
+    def add(self, c):
+        """ add char c to the set """
+        self.set_value(self.mask | (1 << ord(c)))
+
+    def intersect(self, chars, mask=None):
+        """ See Token.intersect """
+        self.set_value(self.mask & (chars_to_mask(chars) if mask is None else mask))
+        return self.mask != 0
+
+    def discard(self, c):
+        """ remove char c from the set if present """
+        self.set_value(self.mask & ~(1 << ord(c)))
+
+    def expand_case(self, case):
+        """ See Token.expand_case """
+        mask = self.mask
+        if case == 'l':
+            letters = mask & MASK_LOWER
+            converted = letters >> CASE_OFFSET
+        else:
+            letters = mask & MASK_UPPER
+            converted = letters << CASE_OFFSET
+        self.set_value((mask & ~MASK_LETTERS) | letters | converted)
+        return self.mask != 0
+
+    def toggle_case(self):
+        """ toggle the case of all letters """
+        mask = self.mask
+        self.set_value((mask & ~MASK_LETTERS) | (
+            (mask & MASK_LOWER) >> CASE_OFFSET) | (
+                (mask & MASK_UPPER) << CASE_OFFSET))
+
 
 class RegexToken(TokenBase):
     """ A Regex Token
@@ -154,8 +332,12 @@ class RegexToken(TokenBase):
         if (start != None and end == None) or (start == None and end != None):
             raise FatalRuntimeError("Set Both Start and End for regex")
 
-        self.start = self.set_start(start)
-        self.end = self.set_end(end)
+        # no range, match exactly one char
+        if start == None:
+            start, end = 1, 2
+
+        self.set_start(start)
+        self.set_end(end)
 
     def only_set_value(self, val):
         """ Only set the value in RegexToken. Keep the range"""
@@ -168,12 +350,16 @@ class RegexToken(TokenBase):
         else:
             raise FatalRuntimeError("Unknown Set Up Type In Token")
 
+    def get_value(self):
+        """ return the set of chars"""
+        return self.token_value
+
     def get_type(self):
         """ return the tokentype"""
         return TokenType.Regex
 
     def __init__(self, val, start=None, end=None):
-        """ Initialize a RegexToken as set(val) + [start, end). start and end cannot both be None
+        """ Initialize a RegexToken as set(val) + [start, end). If start and end are both None, it matches one char
 
         Params:
         val: a set of chars, or a string. If val is a string, call set(val)
@@ -182,6 +368,14 @@ class RegexToken(TokenBase):
         """
         self.set_value(val, start, end)
 
+    def __contains__(self, c):
+        """ check if char c is in the set """
+        return c in self.token_value
+
+    def copy(self):
+        """ a token of the same set of chars and range """
+        return RegexToken(self.token_value, self.start, self.end)
+
     def __repr__(self):
         """ print this token """
         return 'set({}) [{} - {})'.format(
@@ -201,7 +395,7 @@ class RegexToken(TokenBase):
 
     def set_end(self, val):
         """ set the end value. end has to be at least 0."""
-        self.start = max(0, val)
+        self.end = max(0, val)
 
     def decrease_window(self, val):
         """ decrease the range by val """
@@ -241,12 +435,133 @@ class TokenStringBase(metaclass=ABCMeta):
     def insert(self, idx, x):
         pass
 
-    def to_strings(self, remove_non_ascii=True):
+    def iter_strings(self, remove_non_ascii=True):
         pass
 
+    def to_strings(self, remove_non_ascii=True):
+        """ All strings represented, see iter_strings """
+        return list(self.iter_strings(remove_non_ascii))
+
     def contains(self, word):
         pass
 
+    def get_number_of_strings(self, remove_non_ascii=False):
+        """ count the number of possible strings represented.
+
+        Args:
+            remove_non_ascii: whether to remove strings with non-ascii printable chars.
+        """
+        if len(self) == 0:  # Length = 0 means 1 empty string
+            return 1
+
+        count = 1
+        for i in range(len(self)):
+
+            if remove_non_ascii == False:
+                count *= len(self.tokens[i])
+
+            else:
+                count *= len(
+                    set(c for c in self.tokens[i].get_value()
+                        if char_is_printable(c)))
+
+            if count == 0:
+                break
+
+        return count
+
+
+class RegexAutomaton():
+    """ A RegexTokenString compiled to an automaton, see RegexTokenString.get_automaton.
+
+    Each token is a step (chars, start, end): it matches start to end - 1 chars in chars, a Token is (chars, 1, 2).
+    A state of the NFA is (step, count), count chars matched by the step so far. count is capped at start
+    when end is inf, so there are finitely many states. Sets of NFA states are determinized when first reached,
+    and the transitions are cached, so matching a word takes one dict lookup per char.
+    """
+
+    # DFA state of the empty set of NFA states, nothing can match from there
+    DEAD = -1
+
+    def __init__(self, tokens, min_len=0, max_len=float("inf")):
+        """ Compile a list of Token/RegexToken, matched words have min_len <= length < max_len """
+        self.steps = [(set(token.get_value()), 1, 2) if token.is_range() else
+                      (set(token.get_value()), token.start, token.end)
+                      for token in tokens]
+        self.min_len = min_len
+        self.max_len = max_len
+
+        self.states = []  # DFA state -> frozenset of NFA states
+        self.state_ids = {}  # frozenset of NFA states -> DFA state
+        self.transitions = []  # DFA state -> {char: DFA state}
+        self.accepting = []  # DFA state -> whether it accepts
+        self.next_chars = []  # DFA state -> chars that don't lead to DEAD
+        self.initial = self.get_state_id({(0, 0)})
+
+    def closure(self, nfa_states):
+        """ nfa_states and the states reached by finishing steps without reading a char """
+        ret_val = set(nfa_states)
+        stack = list(nfa_states)
+        while len(stack) != 0:
+            step, count = stack.pop()
+            if step < len(self.steps) and count >= self.steps[step][1]:
+                next_state = (step + 1, 0)
+                if next_state not in ret_val:
+                    ret_val.add(next_state)
+                    stack.append(next_state)
+        return frozenset(ret_val)
+
+    def get_state_id(self, nfa_states):
+        """ the DFA state of a set of NFA states, DEAD if empty """
+        nfa_states = self.closure(nfa_states)
+        if len(nfa_states) == 0:
+            return RegexAutomaton.DEAD
+
+        if nfa_states not in self.state_ids:
+            self.state_ids[nfa_states] = len(self.states)
+            self.states.append(nfa_states)
+            self.transitions.append({})
+            self.accepting.append((len(self.steps), 0) in nfa_states)
+            self.next_chars.append(
+                set().union(*(self.steps[step][0]
+                              for step, count in nfa_states
+                              if step < len(self.steps))))
+        return self.state_ids[nfa_states]
+
+    def step(self, state, c):
+        """ the DFA state after reading char c in state """
+        if state == RegexAutomaton.DEAD:
+            return RegexAutomaton.DEAD
+
+        transitions = self.transitions[state]
+        if c not in transitions:
+            next_states = set()
+            for step, count in self.states[state]:
+                if step == len(self.steps):
+                    continue
+                chars, start, end = self.steps[step]
+                if c in chars and count + 1 < end:
+                    next_states.add((step, min(count + 1, start) if end ==
+                                     float("inf") else count + 1))
+            transitions[c] = self.get_state_id(next_states)
+        return transitions[c]
+
+    def is_accepting(self, state):
+        """ whether a word leading to state is matched, regardless of its length """
+        return state != RegexAutomaton.DEAD and self.accepting[state]
+
+    def matches(self, word):
+        """ whether word is matched, in time linear in its length """
+        if len(word) >= self.max_len or len(word) < self.min_len:
+            return False
+
+        state = self.initial
+        for c in word:
+            state = self.step(state, c)
+            if state == RegexAutomaton.DEAD:
+                return False
+        return self.accepting[state]
+
 
 class RegexTokenString(TokenStringBase):
     """ A RegexTokenString Tries To Mimic Regex. It is a List<RegexToken/Token>
@@ -257,15 +572,46 @@ class RegexTokenString(TokenStringBase):
 
     def __init__(self, word):
         """ Initialize a regex tokenstring """
-        self.tokens = [] if word is None else [RegexToken(g) for g in word]
+        self.tokens = [] if word is None else [Token(g) for g in word]
 
         # Additional length requirement. Denoting the length for input string before mangling
         # min_len <= Length < max_len
         self.min_len = 0
-        self.max_len = RUNTIME_CONFIG['max_cut_length']
+        self.max_len = RUNTIME_CONFIG['min_cut_length']
+
+        # compiled automaton, dropped when the tokens or the window are set, see get_automaton
+        self.automaton = None
+
+    @property
+    def tokens(self):
+        return self._tokens
+
+    @tokens.setter
+    def tokens(self, tokens):
+        self._tokens = tokens
+        self.automaton = None
+
+    @property
+    def min_len(self):
+        return self._min_len
+
+    @min_len.setter
+    def min_len(self, l):
+        self._min_len = l
+        self.automaton = None
+
+    @property
+    def max_len(self):
+        return self._max_len
+
+    @max_len.setter
+    def max_len(self, l):
+        self._max_len = l
+        self.automaton = None
 
     def __setitem__(self, key, value):
         self.tokens[key] = value
+        self.automaton = None
 
     def __getitem__(self, key):
         return self.tokens[key]
@@ -278,6 +624,10 @@ class RegexTokenString(TokenStringBase):
     def __iter__(self):
         yield from self.tokens
 
+    def __len__(self):
+        """ the number of tokens """
+        return len(self.tokens)
+
     def decrease_window(self, val):
         """ decrease the match window"""
         self.max_len -= val
@@ -291,12 +641,12 @@ class RegexTokenString(TokenStringBase):
     def increase_window(self, val):
         """ increase the match length"""
         self.max_len += val
-        if self.max_len > RUNTIME_CONFIG['max_cut_length']:
-            self.max_len = RUNTIME_CONFIG['max_cut_length']
+        if self.max_len > RUNTIME_CONFIG['min_cut_length']:
+            self.max_len = RUNTIME_CONFIG['min_cut_length']
 
         self.min_len += val
-        if self.min_len > RUNTIME_CONFIG['max_cut_length']:
-            self.min_len = RUNTIME_CONFIG['max_cut_length']
+        if self.min_len > RUNTIME_CONFIG['min_cut_length']:
+            self.min_len = RUNTIME_CONFIG['min_cut_length']
 
     def count_non_regex_tokens(self):
         """ Count Non RegexToken Tokens"""
@@ -312,8 +662,8 @@ class RegexTokenString(TokenStringBase):
 
     def set_max_len(self, l):
         """ set min_len, only update when narrowing the max length """
-        if l > RUNTIME_CONFIG['max_cut_length']:
-            l = RUNTIME_CONFIG['max_cut_length']
+        if l > RUNTIME_CONFIG['min_cut_length']:
+            l = RUNTIME_CONFIG['min_cut_length']
 
         if l < self.max_len:
             self.max_len = l
@@ -330,7 +680,7 @@ class RegexTokenString(TokenStringBase):
 
     def reset_max_len(self):
         """ reset max_len """
-        self.max_len = RUNTIME_CONFIG['max_cut_length']
+        self.max_len = RUNTIME_CONFIG['min_cut_length']
 
     def reset_min_len(self):
         """ reset min_len """
@@ -362,56 +712,30 @@ class RegexTokenString(TokenStringBase):
 
         return self.max_len > self.min_len
 
-    # Use dp to optimize potentially
-    def regexmatch(self, word, regex):
-        """ Recursively check if a regex matches the word """
-        if word == "":
-            if len(regex) == 0:
-                return True
-
-            else:
-                for reg in regex:
-                    if reg.is_regex() and reg.start == 0:
-                        continue
-                    return False
-                return True
-
-        if len(regex) == 0 and word != "":
-            return False
-
-        c = word[0]
+    def get_automaton(self):
+        """ The compiled automaton of this regex tokenstring, see RegexAutomaton.
 
-        if regex[0].is_range():
-            if c in regex[0].get_value():
-                return regexmatch(word[1:], regex[1:])
-            else:
-                return False
-
-        else:
-            if c in regex[0].get_value(
-            ) and regex[0].end >= 2:  # < end, so end >= 2
-                # must match 1.
-                if regex[0].start > 0:
-                    regex[0].decrease_window(1)
-                    return regexmatch(word[1:], regex)
-                else:
-                    regex[0].decrease_window(1)
-                    return regexmatch(word[1:], regex) or regexmatch(
-                        word[1:], regex[1:]) or regexmatch(word, regex[1:])
-            else:
-                if regex[0].start != 0:
-                    return False
-                else:  # match next one
-                    return regexmatch(word, regex[1:])
+        It is compiled once, and again only after the tokens, a token or the window is set.
+        A token changed in place is not seen, set it again (token_str[i] = token).
+        """
+        if self.automaton is None:
+            self.automaton = RegexAutomaton(self.tokens, self.min_len,
+                                            self.max_len)
+        return self.automaton
 
     def contains(self, word):
         """ Check if this regex tokenstring matches the word. """
+        return self.get_automaton().matches(word)
 
-        # First check meet additional length requirement
-        if len(word) >= self.max_len or len(word) < self.min_len:
-            return False
+    def get_number_of_strings(self, remove_non_ascii=False):
+        """ count the number of possible strings represented, inf if there is a RegexToken. """
+        if any(token.is_regex() for token in self.tokens):
+            return float("inf")
+
+        if len(self) >= self.max_len or len(self) < self.min_len:
+            return 0
 
-        return self.regexmatch(word, deepcopy(self.tokens))
+        return super().get_number_of_strings(remove_non_ascii)
 
     @staticmethod
     def fix_first_N_position(token_str, N):
@@ -787,7 +1111,12 @@ class TokenString(TokenStringBase):
     """ A TokenString is a List<Token> along with methods for manipulating this List. """
 
     def __init__(self, word=None):
-        self.tokens = [] if word is None else [Token(g) for g in word]
+        if word is None:
+            self.tokens = []
+        else:
+            token_class = BitmaskToken if RUNTIME_CONFIG[
+                'token_type'] == "bitmask" else Token
+            self.tokens = [token_class(g) for g in word]
         self.length = len(self.tokens)
 
     def __len__(self):
@@ -809,12 +1138,12 @@ class TokenString(TokenStringBase):
     def __deepcopy__(self, memo):
         """ customize deepcopy for performance issues """
         obj = TokenString()
-        obj.tokens = [Token(t.token_value) for t in self.tokens]
+        obj.tokens = [t.copy() for t in self.tokens]
         obj.length = len(obj.tokens)
         return obj
 
-    def to_strings(self, remove_non_ascii=True):
-        """ Forms all possible permutations of strings for a given token string."""
+    def iter_strings(self, remove_non_ascii=True):
+        """ Yields all possible permutations of strings for a given token string, one at a time."""
 
         def extract_value(x):
             """ Safe way of extractin value and ensuring that no regex present """
@@ -824,16 +1153,16 @@ class TokenString(TokenStringBase):
                 return x.get_value()
 
         if self.length == 0:
-            return [""]
+            yield ""
+            return
 
         if self.length < 0:
             raise FatalRuntimeError("Length < 0 in tokenstring")
 
-        tokens_as_list = (extract_value(x) for x in self.tokens[:self.length])
-
-        list_ex = list("".join(string) for string in product(*tokens_as_list))
+        tokens_as_list = [extract_value(x) for x in self.tokens[:self.length]]
 
-        return list_ex
+        for string in product(*tokens_as_list):
+            yield "".join(string)
 
     def contains(self, word):
         """ Check if this regex tokenstring matches the word. """
@@ -842,14 +1171,46 @@ class TokenString(TokenStringBase):
 
         for i in range(self.length):
             if type(word[i]) == int:  # word is byte array
-                if chr(word[i]) not in self.tokens[i].get_value():
+                if chr(word[i]) not in self.tokens[i]:
                     break
             else:  # word is string
-                if word[i] not in self.tokens[i].get_value():
+                if word[i] not in self.tokens[i]:
                     break
         else:
             return True
 
+    def expand_case(self, cases):
+        """ Set each position to the preimage of lowercasing/uppercasing it, see Token.expand_case
+
+        Args:
+            cases: for each position, 'l', 'u', or None to keep the position unchanged
+
+        Returns:
+            False if some position is left with nothing (rejected)
+        """
+        for token, case in zip(self.tokens, cases):
+            if case is not None and token.expand_case(case) == False:
+                return False
+        return True
+
+    def toggle_case(self, positions=None):
+        """ toggle the case of all letters in positions, None for all positions """
+        positions = range(self.length) if positions is None else positions
+        for pos in positions:
+            self.tokens[pos].toggle_case()
+
+    def find_char(self, c):
+        """ (position, whether c is the only char there) for each position that allows char c, in order """
+        return [(idx, len(token) == 1) for idx, token in enumerate(self.tokens)
+                if c in token.get_value()]
+
+    def split_on_char(self, c, only_c, without_c):
+        """ keep only char c at positions only_c, and remove it at positions without_c (see find_char) """
+        for pos in only_c:
+            self.tokens[pos].set_value(set(c))
+        for pos in without_c:
+            self.tokens[pos].set_value(self.tokens[pos].get_value() - set(c))
+
     def pop_token(self, pos):
         """ pop a token from self.tokens, also reduce length by 1 """
         if len(self.tokens) == 0:
@@ -861,7 +1222,7 @@ class TokenString(TokenStringBase):
 
     def append_token(self, token):
         """ append a token to self.tokens, also increase length by 1 """
-        if type(token) != Token:
+        if not isinstance(token, Token):
             raise FatalRuntimeError("Tokens type error")
         self.tokens.append(token)
         self.length += 1
@@ -872,3 +1233,185 @@ class TokenString(TokenStringBase):
             raise FatalRuntimeError("Tokens type error")
         self.tokens += tokens
         self.length += len(tokens)
+
+
+# columns of ArrayTokenString, one for each char in chr(0) - chr(255)
+ARRAY_ALPHABET_SIZE = 256
+COLUMN_LOWER = np.array([chr(i) in CHARS_LOWER for i in range(ARRAY_ALPHABET_SIZE)])
+COLUMN_UPPER = np.array([chr(i) in CHARS_UPPER for i in range(ARRAY_ALPHABET_SIZE)])
+COLUMN_OTHER = ~(COLUMN_LOWER | COLUMN_UPPER)
+COLUMN_PRINTABLE = np.array([char_is_printable(chr(i)) for i in range(ARRAY_ALPHABET_SIZE)])
+# letters are contiguous columns, toggling swaps the two slices
+SLICE_LOWER = slice(ord('a'), ord('z') + 1)
+SLICE_UPPER = slice(ord('A'), ord('Z') + 1)
+
+
+class ArrayTokenString(TokenString):
+    """ A TokenString backed by a (length x 256) boolean array, array[i][c] is True if chr(c) is allowed at position i.
+
+    Case commands run on the whole array at once (see expand_case/toggle_case, and find_char/split_on_char for E and eX),
+    and counting is a product of row sums.
+    Anything that reads or writes tokens turns the array into a list of Tokens (materialize),
+    after that it is a regular TokenString. Only chars < chr(256) can be stored, see tokenize.
+    """
+
+    def __init__(self, word=None):
+        self.array = None
+        self._tokens = []
+        if word is None:
+            self.length = 0
+        else:
+            self.array = np.zeros((len(word), ARRAY_ALPHABET_SIZE), dtype=bool)
+            self.array[np.arange(len(word)), [ord(c) for c in word]] = True
+            self.length = len(word)
+
+    @staticmethod
+    def supports(word):
+        """ check if all chars of word can be stored """
+        return all(ord(c) < ARRAY_ALPHABET_SIZE for c in word)
+
+    def has_array(self):
+        """ check if the tokenstring is still backed by the array """
+        return self.array is not None
+
+    def materialize(self):
+        """ turn the array into a list of Tokens """
+        if self.array is not None:
+            self._tokens = [
+                Token(set(chr(c) for c in np.flatnonzero(row)))
+                for row in self.array
+            ]
+            self.array = None
+
+    @property
+    def tokens(self):
+        self.materialize()
+        return self._tokens
+
+    @tokens.setter
+    def tokens(self, tokens):
+        self.array = None
+        self._tokens = tokens
+
+    def __deepcopy__(self, memo):
+        """ customize deepcopy for performance issues """
+        obj = ArrayTokenString()
+        if self.array is not None:
+            obj.array = self.array.copy()
+        else:
+            obj._tokens = [t.copy() for t in self._tokens]
+        obj.length = self.length
+        return obj
+
+    def expand_case(self, cases):
+        """ See TokenString.expand_case """
+        if self.array is None:
+            return TokenString.expand_case(self, cases)
+
+        if self.length == 0:
+            return True
+
+        array = self.array
+        upper_rows = [idx for idx, case in enumerate(cases) if case == 'u']
+        kept_rows = [idx for idx, case in enumerate(cases) if case is None]
+
+        # letters of the case of each position, and their counterparts
+        if len(upper_rows) == self.length:
+            letters = array & COLUMN_UPPER
+        else:
+            letters = array & COLUMN_LOWER
+            letters[upper_rows] = array[upper_rows] & COLUMN_UPPER
+
+        new_array = array & COLUMN_OTHER
+        new_array |= letters
+        new_array[:, SLICE_LOWER] |= letters[:, SLICE_UPPER]
+        new_array[:, SLICE_UPPER] |= letters[:, SLICE_LOWER]
+
+        is_expanded = np.ones(self.length, dtype=bool)
+        if len(kept_rows) != 0:
+            new_array[kept_rows] = array[kept_rows]
+            is_expanded[kept_rows] = False
+
+        self.array = new_array
+        return bool(new_array[is_expanded].any(axis=1).all())
+
+    def toggle_case(self, positions=None):
+        """ See TokenString.toggle_case """
+        if self.array is None:
+            return TokenString.toggle_case(self, positions)
+
+        rows = slice(None) if positions is None else list(positions)
+        lower = self.array[rows, SLICE_LOWER].copy()
+        self.array[rows, SLICE_LOWER] = self.array[rows, SLICE_UPPER]
+        self.array[rows, SLICE_UPPER] = lower
+
+    def find_char(self, c):
+        """ See TokenString.find_char """
+        if self.array is None:
+            return TokenString.find_char(self, c)
+
+        if ord(c) >= ARRAY_ALPHABET_SIZE:
+            return []
+
+        column = self.array[:, ord(c)]
+        is_only = column & (self.array.sum(axis=1) == 1)
+        return [(idx, bool(is_only[idx])) for idx in np.flatnonzero(column)]
+
+    def split_on_char(self, c, only_c, without_c):
+        """ See TokenString.split_on_char """
+        if self.array is None:
+            return TokenString.split_on_char(self, c, only_c, without_c)
+
+        self.array[only_c] = False
+        self.array[only_c, ord(c)] = True
+        self.array[without_c, ord(c)] = False
+
+    def get_number_of_strings(self, remove_non_ascii=False):
+        """ See TokenStringBase.get_number_of_strings """
+        if self.array is None:
+            return TokenString.get_number_of_strings(self, remove_non_ascii)
+
+        if self.length == 0:
+            return 1
+
+        array = self.array & COLUMN_PRINTABLE if remove_non_ascii else self.array
+        # python ints, the product easily overflows int64
+        return reduce(operator.mul, array.sum(axis=1).tolist(), 1)
+
+    def iter_strings(self, remove_non_ascii=True):
+        """ See TokenString.iter_strings """
+        if self.array is None:
+            yield from TokenString.iter_strings(self, remove_non_ascii)
+            return
+
+        if self.length == 0:
+            yield ""
+            return
+
+        array = self.array & COLUMN_PRINTABLE if remove_non_ascii else self.array
+        chars = [set(chr(c) for c in np.flatnonzero(row)) for row in array]
+        for string in product(*chars):
+            yield "".join(string)
+
+    def contains(self, word):
+        """ Check if this tokenstring matches the word. """
+        if self.array is None:
+            return TokenString.contains(self, word)
+
+        if self.length != len(word):
+            return False
+
+        cols = [c if type(c) == int else ord(c) for c in word]
+        if any(c >= ARRAY_ALPHABET_SIZE for c in cols):
+            return False
+
+        if self.array[np.arange(self.length), cols].all():
+            return True
+
+
+def tokenize(word):
+    """ Tokenize a password, the tokenstring type follows RUNTIME_CONFIG['token_type'] """
+    if RUNTIME_CONFIG['token_type'] == "array" and ArrayTokenString.supports(
+            word):
+        return ArrayTokenString(word)
+    return TokenString(word)
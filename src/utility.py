@@ -9,6 +9,7 @@ import numpy as np
 import sys
 from collections import OrderedDict
 import hashlib
+import json
 
 sys.path.append('../trie')
 
@@ -535,8 +536,39 @@ def read_passwords(addr):
     return pwlist
 
 
-def filter_passwords_with_password_policy(pwlist):
-    """ filter passwords that don't meet password policy """
+def read_passwords_in_chunks(addr, chunk_size=None):
+    """ read passwords from a file, yield them in lists of at most chunk_size passwords.
+
+    Passwords are cleaned the same way as read_passwords. If chunk_size is None, yield the whole file at once.
+    """
+    if chunk_size is None:
+        yield read_passwords(addr)
+        return
+
+    chunk = []
+    with open(addr) as f:
+        for line in f:
+            pw = clean_word(line)
+            if pw == "":
+                continue
+
+            chunk.append(pw)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+
+    if len(chunk) != 0:
+        yield chunk
+
+
+def filter_passwords_with_password_policy(pwlist, start_idx=0):
+    """ filter passwords that don't meet password policy
+
+    Args:
+        pwlist: a list of passwords
+
+        start_idx: index of the first password in pwlist, used when reading passwords in chunks
+    """
     pw_policy = RUNTIME_CONFIG['password_policy']
 
     def check_all_ascii(line):
@@ -547,7 +579,7 @@ def filter_passwords_with_password_policy(pwlist):
 
     filtered_pwds = []  # not meet pw policy
     not_filtered_pwds = []  # pwds meet pw policy
-    for idx, pw in enumerate(pwlist):
+    for idx, pw in enumerate(pwlist, start_idx):
         filtered = False
 
         if (len(pw) >= pw_policy.length) == False:
@@ -606,13 +638,67 @@ def get_look_cmd(string, password_addr):
         first_part, second_part)  # adding echo to avoid empty output
 
 
-def build_trie_from_wordlist(wordlist):
-    """ build a char trie from wordlist """
-    t = CharTrieWrapper(wordlist)
-    os.remove("dump.trie") if os.path.exists("dump.trie") else None
+def build_trie_from_wordlist(wordlist, trie_addr=None, is_reversed=False):
+    """ Build a char trie from wordlist.
+
+    Args:
+        wordlist: the wordlist dict
+
+        trie_addr: where the trie of wordlist is saved (see get_trie_addr). If a trie is
+        saved there it is mapped instead of built, otherwise the trie built is saved there.
+        None to always build.
+
+        is_reversed: build the trie of reversed words, see CharTrieWrapper.set_reversed
+    """
+    if trie_addr is not None and os.path.exists(trie_addr):
+        try:
+            return CharTrieWrapper.load(trie_addr)
+        except ValueError:  # saved by another version, built again
+            pass
+
+    t = CharTrieWrapper(wordlist, is_reversed)
+    if trie_addr is not None:
+        # written aside and renamed, so a process never maps a partial file
+        tmp_addr = "{}.{}.tmp".format(trie_addr, os.getpid())
+        t.save(tmp_addr)
+        os.replace(tmp_addr, trie_addr)
     return t
 
 
+def get_wordlist_cache_key():
+    """ get the key of the data saved for the wordlist: the md5 hash of the wordlist and the
+    running style, since read_wordlist indexes the words differently in JtR and HC """
+    return "{}-{}".format(get_file_md5(RUNTIME_CONFIG['wordlist_path']['addr']),
+                          RUNTIME_CONFIG['running_style'].name.lower())
+
+
+def get_trie_addr(is_reversed=False):
+    """ get the addr of the saved trie of the wordlist, keyed by get_wordlist_cache_key """
+    return "{}/trie-{}{}.trie".format(RUNTIME_CONFIG['preprocess_path'],
+                                     get_wordlist_cache_key(),
+                                     "-reversed" if is_reversed else "")
+
+
+def get_wordlist_stats_addr():
+    """ get the addr of the saved WordlistStats of the wordlist, keyed like get_trie_addr """
+    return "{}/wordlist_stats-{}.json".format(RUNTIME_CONFIG['preprocess_path'],
+                                             get_wordlist_cache_key())
+
+
+def get_wordlist_trie(wordlist):
+    """ Build (or map) the trie of wordlist as configured: saved in preprocess_path if trie_cache,
+    and with the trie of reversed words if reversed_trie (see CharTrieWrapper.set_reversed) """
+    is_cache = RUNTIME_CONFIG['trie_cache'] == True
+    trie = build_trie_from_wordlist(wordlist,
+                                    get_trie_addr() if is_cache else None)
+    if RUNTIME_CONFIG['reversed_trie'] == True:
+        trie.set_reversed(
+            build_trie_from_wordlist(wordlist,
+                                     get_trie_addr(True) if is_cache else None,
+                                     True))
+    return trie
+
+
 def has_generated_data():
     """ Check if one configuration has generated data """
     # Compute Hashes
@@ -724,3 +810,80 @@ def restore_counts_from_file():
     counts = np.load("{}/saved_counts.npy".format(preprocess))
     cumsum = np.load("{}/saved_cumsum.npy".format(preprocess))
     return counts, cumsum
+
+
+# (addr, mtime, size) -> md5 hash, so a file is hashed once while it doesn't change
+_FILE_MD5_CACHE = {}
+
+
+def get_file_md5(addr):
+    """ md5 hash of a file, read in blocks so a large file is never in memory at once """
+    stat = os.stat(addr)
+    key = (os.path.abspath(addr), stat.st_mtime_ns, stat.st_size)
+    if key not in _FILE_MD5_CACHE:
+        h = hashlib.md5()
+        with open(addr, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        _FILE_MD5_CACHE[key] = h.hexdigest()
+    return _FILE_MD5_CACHE[key]
+
+
+def get_checkpoint_key():
+    """ Hashes of everything that changes the output of a run, computed once per run and
+    passed to store_checkpoint/restore_checkpoint/remove_checkpoint """
+    hashes = [
+        get_file_md5(RUNTIME_CONFIG[path]['addr'])
+        for path in ('wordlist_path', 'rulelist_path', 'pwlist_path')
+    ]
+    password_policy_string = RUNTIME_CONFIG['password_policy'].to_debug_string()
+    type_j = "1" if RUNTIME_CONFIG.is_jtr() else "0"
+
+    # options that change which guesses are found, or the order they are written in
+    options = [
+        RUNTIME_CONFIG[option]
+        for option in ('chunk_size', 'first_crack_only', 'results_format',
+                       'text_log', 'max_password_length', 'm_threshold',
+                       'lookup_threshold', 'enable_regex',
+                       'trie_guided_inversion', 'reversed_trie',
+                       'optimizable_trie_search')
+    ]
+
+    return hashes + [password_policy_string, type_j] + options
+
+
+def get_checkpoint_addr(key):
+    """ get checkpoint file addr of a run """
+    return "{}/checkpoint-{}.json".format(
+        RUNTIME_CONFIG['preprocess_path'],
+        hashlib.md5(json.dumps(key).encode('utf-8')).hexdigest())
+
+
+def store_checkpoint(key, state):
+    """ Store the progress of the run of key (see get_checkpoint_key), state is a json serializable dict """
+    addr = get_checkpoint_addr(key)
+
+    # write to a tmp file first, so the old checkpoint survives a crash while writing
+    with open(addr + ".tmp", 'w') as f:
+        json.dump({'key': key, 'state': state}, f)
+    os.replace(addr + ".tmp", addr)
+
+
+def restore_checkpoint(key):
+    """ Return the state stored by the last store_checkpoint of the run of key, None if there isn't one """
+    addr = get_checkpoint_addr(key)
+
+    if os.path.exists(addr):
+        with open(addr) as f:
+            content = json.load(f)
+
+        if content['key'] == key:
+            return content['state']
+
+    return None
+
+
+def remove_checkpoint(key):
+    """ Remove the checkpoint of the run of key """
+    addr = get_checkpoint_addr(key)
+    os.remove(addr) if os.path.exists(addr) else None
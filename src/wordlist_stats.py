@@ -0,0 +1,155 @@
+"""This file contains statistics of the wordlist, used to prune preimages that no word can match."""
+from collections import Counter
+from copy import deepcopy
+from config import RUNTIME_CONFIG
+from tokenstr import ArrayTokenString, RegexTokenString, ARRAY_ALPHABET_SIZE, chars_to_mask
+from utility import get_wordlist_stats_addr
+import numpy as np
+import json
+import os
+
+
+class WordlistStats():
+    """ Lengths of words, and the chars at each position of words of each length.
+
+    A preimage tokenstring can only match words of its length, and each of its tokens can only
+    match the chars those words have at its position. So a preimage is pruned by intersecting
+    its tokens with these chars, and dropped if a token becomes empty or no word has its length.
+    Pruned preimages match the same words, there are just fewer strings to enumerate or search.
+    """
+
+    def __init__(self, wordlist=None):
+        """ Collect the statistics, in one pass over the words.
+
+        Args:
+            wordlist: the wordlist dict (or any iterable of words), None for no words (see load)
+        """
+        # length -> number of words
+        self.length_counts = Counter()
+        # length -> the set of chars at each position
+        self.alphabets = {}
+        for word in wordlist if wordlist is not None else ():
+            length = len(word)
+            self.length_counts[length] += 1
+            if length not in self.alphabets:
+                self.alphabets[length] = [set() for _ in range(length)]
+            for chars, c in zip(self.alphabets[length], word):
+                chars.add(c)
+
+        self._set_masks()
+
+    def _set_masks(self):
+        """ derive the other forms of alphabets """
+        # the same sets, as bitmasks (for BitmaskToken)
+        self.masks = {
+            length: [chars_to_mask(chars) for chars in alphabet]
+            for length, alphabet in self.alphabets.items()
+        }
+        # the same sets, as (length x 256) arrays (for ArrayTokenString), built when needed
+        self.arrays = {}
+
+    def save(self, addr):
+        """ Save the statistics to addr (json), see load """
+        with open(addr, 'w') as f:
+            json.dump(
+                {
+                    'length_counts': {
+                        str(length): count
+                        for length, count in self.length_counts.items()
+                    },
+                    'alphabets': {
+                        str(length): ["".join(sorted(chars)) for chars in alphabet]
+                        for length, alphabet in self.alphabets.items()
+                    }
+                }, f)
+
+    @classmethod
+    def load(cls, addr):
+        """ Load statistics saved with save. Raises ValueError if addr is not saved statistics. """
+        with open(addr) as f:
+            try:
+                content = json.load(f)
+                ret = cls()
+                ret.length_counts = Counter({
+                    int(length): count
+                    for length, count in content['length_counts'].items()
+                })
+                ret.alphabets = {
+                    int(length): [set(chars) for chars in alphabet]
+                    for length, alphabet in content['alphabets'].items()
+                }
+            except (KeyError, TypeError, AttributeError) as e:
+                raise ValueError("Not saved wordlist statistics: {}".format(addr)) from e
+
+        ret._set_masks()
+        return ret
+
+    def get_array(self, length):
+        """ alphabets of words of length as a boolean array, see ArrayTokenString """
+        if length not in self.arrays:
+            array = np.zeros((length, ARRAY_ALPHABET_SIZE), dtype=bool)
+            for idx, chars in enumerate(self.alphabets[length]):
+                array[idx, [
+                    ord(c) for c in chars if ord(c) < ARRAY_ALPHABET_SIZE
+                ]] = True
+            self.arrays[length] = array
+        return self.arrays[length]
+
+    def prune(self, token_str):
+        """ Intersect each token with the chars of words at its position.
+
+        Args:
+            token_str: a preimage tokenstring, it is not changed.
+
+        Returns:
+            A pruned copy of token_str, or None if no word can match it.
+        """
+        if isinstance(token_str, RegexTokenString):
+            # only the window is checked, the automaton does the rest
+            if any(token_str.min_len <= length < token_str.max_len
+                   for length in self.length_counts):
+                return token_str
+            return None
+
+        length = len(token_str)
+        if self.length_counts[length] == 0:
+            return None
+
+        token_str = deepcopy(token_str)
+        if length == 0:
+            return token_str
+
+        if isinstance(token_str,
+                      ArrayTokenString) and token_str.has_array():
+            token_str.array &= self.get_array(length)
+            if token_str.array.any(axis=1).all() == False:
+                return None
+            return token_str
+
+        for token, chars, mask in zip(token_str, self.alphabets[length],
+                                      self.masks[length]):
+            if token.intersect(chars, mask) == False:
+                return None
+
+        return token_str
+
+
+def get_wordlist_stats(wordlist):
+    """ WordlistStats of wordlist. If trie_cache, they are saved in preprocess_path once, next to
+    the trie (see get_wordlist_stats_addr), and loaded in later runs instead of collected. """
+    if RUNTIME_CONFIG['trie_cache'] != True:
+        return WordlistStats(wordlist)
+
+    addr = get_wordlist_stats_addr()
+    if os.path.exists(addr):
+        try:
+            return WordlistStats.load(addr)
+        except ValueError:  # saved by another version, collected again
+            pass
+
+    stats = WordlistStats(wordlist)
+    # written aside and renamed, so a process never loads a partial file
+    tmp_addr = "{}.{}.tmp".format(addr, os.getpid())
+    stats.save(tmp_addr)
+    os.replace(tmp_addr, addr)
+    return stats
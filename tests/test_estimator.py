@@ -0,0 +1,99 @@
+from sys import path as sys_path
+from os import path as os_path
+import unittest
+import threading
+import shutil
+import tempfile
+
+sys_path.append(os_path.abspath('../src'))
+
+from config import RUNTIME_CONFIG, Configuration
+from common import RunningStyle
+from invert_helper import Dicts
+from utility import read_passwords
+from estimator import GuessNumberEstimator
+
+
+class EstimatorTest(unittest.TestCase):
+
+    def test_bind_config_in_threads(self):
+        """ each thread sees the configuration bound in it """
+        RUNTIME_CONFIG.reset_to_jtr()
+        barrier = threading.Barrier(2)
+        errors = []
+
+        def check(conf, is_hc, length_of_z):
+            with RUNTIME_CONFIG.bind(conf):
+                barrier.wait()
+                for _ in range(1000):
+                    if RUNTIME_CONFIG.is_hc() != is_hc or len(Dicts.classes['z']) != length_of_z:
+                        errors.append(conf)
+                        break
+                RUNTIME_CONFIG['batch_size_of_rules'] = 1
+
+        threads = [
+            threading.Thread(target=check, args=(Configuration(RunningStyle.HC), True, 256)),
+            threading.Thread(target=check, args=(Configuration(RunningStyle.JTR), False, 95)),
+        ]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+
+        self.assertEqual(errors, [])
+        self.assertTrue(RUNTIME_CONFIG.is_jtr())
+        with self.assertRaises(KeyError):
+            RUNTIME_CONFIG['batch_size_of_rules']
+
+    def test_estimators_in_threads(self):
+        """ estimators give the same results when used concurrently """
+        if shutil.which(RUNTIME_CONFIG['executable_path']) == None:
+            self.skipTest("JtR not available")
+
+        passwords = read_passwords('../data/testsets/test_demo_file_JtR1.txt')
+
+        with tempfile.TemporaryDirectory() as first_path, tempfile.TemporaryDirectory() as second_path:
+            estimators = [
+                GuessNumberEstimator('../data/wordlists/test_demo_file_JtR.lst', '../data/rulelists/test_demo_file_JtR.rule', 'j', preprocess_path=first_path + "/"),
+                GuessNumberEstimator('../data/wordlists/test_demo_file_JtR.lst', '../data/rulelists/test_demo_file_JtR.rule', 'j', preprocess_path=second_path + "/", first_crack_only=True),
+            ]
+
+            expected = [e.estimate_many(passwords) for e in estimators]
+            results = [None] * len(estimators)
+
+            def run(idx):
+                results[idx] = estimators[idx].estimate_many(passwords)
+
+            threads = [threading.Thread(target=run, args=(i,)) for i in range(len(estimators))]
+            [t.start() for t in threads]
+            [t.join() for t in threads]
+
+            for e in estimators:
+                e.close()
+
+        self.assertEqual(results, expected)
+        for a, b in zip(expected[0], expected[1]):
+            self.assertEqual(a['min_guess'], b['min_guess'])
+            self.assertLessEqual(len(b['guesses']), 1)
+
+    def test_bash_processes_reused_by_threads(self):
+        """ a thread per estimation (as in the server) reuses the idle bash process """
+        if shutil.which(RUNTIME_CONFIG['executable_path']) == None:
+            self.skipTest("JtR not available")
+
+        passwords = read_passwords('../data/testsets/test_demo_file_JtR1.txt')
+
+        with tempfile.TemporaryDirectory() as preprocess_path:
+            estimator = GuessNumberEstimator('../data/wordlists/test_demo_file_JtR.lst', '../data/rulelists/test_demo_file_JtR.rule', 'j', preprocess_path=preprocess_path + "/")
+            for _ in range(4):
+                thread = threading.Thread(target=estimator.estimate_many, args=(passwords,))
+                thread.start()
+                thread.join()
+            self.assertEqual(len(estimator._bash_processes), 1)
+            estimator.close()
+
+
+if __name__ == "__main__":
+
+    #Run Unit Test
+    suite = unittest.TestLoader().loadTestsFromTestCase(EstimatorTest)
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
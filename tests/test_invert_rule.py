@@ -5,17 +5,27 @@ from sys import path as sys_path
 sys_path.append(os_path.abspath('../src'))
 
 from utility import forward_a_rule_to_an_address
-from tokenstr import TokenString, Token
-from invert_rule import invert_single_transformation, InversionStatus
+from tokenstr import TokenString, Token, tokenize, RegexToken, RegexTokenString
+from invert_rule import invert_single_transformation, InversionStatus, InversionResult
 from invert_rule import invert_one_rule, check_is_invertible, Invertibility
+from invert_rule import RuleSuffixTrie, get_special_invertibility
+from invert_rule import invert_one_rule_batch, is_batch_rule, CompiledTransformation
+from demo_common import match_inversion_result, search_trie, is_trie_guided_rule, invert_and_search_trie
+from demo_common import search_trie_with_indices, search_trie_batch
+from utility import build_trie_from_wordlist, get_trie_addr, get_wordlist_stats_addr
+from feature_extraction import get_dependencies_for_rules, get_special_countability
+from preprocess import get_is_feasible
 from invert_helper import Dicts
+from wordlist_stats import WordlistStats
 from config import RUNTIME_CONFIG
-from common import RunningStyle
-from parse import RulelistReader
+from common import RunningStyle, FilePath
+from parse import RulelistReader, Elements, RuleWrapper
 import logging
 import shutil
+import re
 import unittest
 import os
+from contextlib import contextmanager
 
 class InversionTest(unittest.TestCase):
     def setUp(self):
@@ -31,6 +41,15 @@ class InversionTest(unittest.TestCase):
         RUNTIME_CONFIG.reset_to_jtr(max_password_length=max_password_length)
         Dicts.classes['z'] = set(chr(x) for x in range(32, 127))
 
+    @contextmanager
+    def use_token_type(self, token_type):
+        # token type switch, back to set tokens even if an assert fails
+        RUNTIME_CONFIG['token_type'] = token_type
+        try:
+            yield
+        finally:
+            RUNTIME_CONFIG['token_type'] = "set"
+
     def test_unary_transformation(self):
         ### Reset Configuration ###
         # This is done multiple times in this test function
@@ -4051,6 +4070,322 @@ class InversionTest(unittest.TestCase):
         if reversed_result.contains ( b"flag") == False:
             raise Exception("Unittest Not Passed")
 
+    def test_rule_suffix_trie(self):
+        """ inverting through the suffix trie is the same as inverting each rule """
+        self.switch_to_jtr()
+
+        parser = Elements.parser()
+        raw_rules = [":", "$1", "c $1", "l $1", "c $1 $2", "$1 $2", "r", "u r", "^a $1", "D2 $1", "c $[1-3]", "$1 Q", "'5"]
+        rulelist = [RuleWrapper(raw, parser.parseString(raw).asList()) for raw in raw_rules]
+        rulelist = get_special_invertibility(get_is_feasible(get_special_countability(get_dependencies_for_rules(rulelist))))
+
+        suffix_trie = RuleSuffixTrie(rulelist)
+        self.assertFalse(suffix_trie.is_in_trie(rulelist[raw_rules.index("$1 Q")]))
+
+        for pwd in ["Pass12", "abc1", "a12", "12", "Abc3"]:
+            token_str = TokenString(pwd)
+            memo = {}
+            for r_idx, r in enumerate(rulelist):
+                if suffix_trie.is_in_trie(r) == False:
+                    continue
+                result = suffix_trie.invert(token_str, r_idx, memo)
+                expected = invert_one_rule(token_str, r)
+                self.assertEqual(result.get_status(), expected.get_status())
+                self.assertEqual(sorted(result.get_all_strings()), sorted(expected.get_all_strings()))
+
+    def test_token_types(self):
+        """ inverting with bitmask tokens or array tokenstrings is the same as with set tokens """
+        transformations = [["l"], ["u"], ["c"], ["C"], ["t"], ["T", "2"], ["E"], ["e", "@"], ["$", "1"], ["^", "a"], ["s", "a", "@"], ["s", "@", "a"], ["d"], ["r"], ["'", "5"], ["D", "2"], ["i", "3", "!"], ["o", "0", "X"]]
+        for switch in (self.switch_to_jtr, self.switch_to_hc):
+            switch()
+            # a position with the full class, as after inverting other commands
+            first_chars = Dicts.classes['z'] - set("x")
+            for pwd in ["Pass@1", "p@ssw0rd", "ABCa", "1", "aa!1", "a@B@c", "@@Ab@", "Pa W0 X"]:
+                for transformation in transformations:
+                    results = []
+                    for token_type in ("set", "bitmask", "array"):
+                        with self.use_token_type(token_type):
+                            token_str = tokenize(pwd)
+                            if token_type == "array":
+                                token_str.array[0] = [chr(c) in first_chars for c in range(256)]
+                            else:
+                                token_str.tokens[0].set_value(first_chars)
+                            result = invert_single_transformation([token_str], transformation)
+                            if token_type == "array" and transformation[0] in "lucCtTEe":
+                                # case commands run on the array, without materializing it
+                                self.assertTrue(all(ts.has_array() for ts in result.get_value()), transformation)
+                            results.append((result.get_status(), result.get_number_of_strings(), result.get_number_of_strings(True), sorted(result.get_all_strings(), key=repr)))
+                    self.assertEqual(results[0], results[1])
+                    self.assertEqual(results[0], results[2])
+
+    def test_iter_strings(self):
+        """ strings are streamed in the same order as get_all_strings """
+        self.switch_to_jtr()
+        for token_type in ("set", "array"):
+            with self.use_token_type(token_type):
+                result = invert_single_transformation([tokenize("Pass1"), tokenize("Pass1")], ["c"])
+                strings = result.iter_strings()
+                self.assertEqual(next(strings), result.get_all_strings()[0])
+                self.assertEqual([result.get_all_strings()[0]] + list(strings), result.get_all_strings())
+                self.assertEqual(len(result.get_all_strings()), 32)
+                self.assertEqual(len(result.get_all_strings(unique=True)), 16)
+
+    def test_regex_automaton(self):
+        """ regex tokenstrings match the same words as the regex they mimic, through the dict and the trie """
+        self.switch_to_jtr()
+        wordlist = {w: i for i, w in enumerate(["", "a", "ab", "abc", "aab", "b1", "ab12", "xab", "abab", "a" * 40])}
+        for tokens, window, regex in (([Token("a"), RegexToken("ab", 0, float("inf"))], (0, 32), "a[ab]*"),
+                                      ([RegexToken("a", 1, 3), Token("b")], (0, 32), "a{1,2}b"),
+                                      ([RegexToken("ab", 0, float("inf")), RegexToken("12", 1, 3)], (0, 32), "[ab]*[12]{1,2}"),
+                                      ([RegexToken("abc", 0, float("inf"))], (2, 4), "[abc]{2,3}"),
+                                      ([RegexToken("ab", 0, float("inf"))], (0, 32), "[ab]*"),
+                                      ([Token("x"), Token("a"), Token("b")], (0, 32), "xab")):
+            token_str = RegexTokenString(None)
+            token_str.tokens = tokens
+            token_str.min_len, token_str.max_len = window
+            words = [w for w in wordlist if re.fullmatch(regex, w) is not None and window[0] <= len(w) < window[1]]
+            self.assertEqual([w for w in wordlist if token_str.contains(w)], words, regex)
+            result = InversionResult(token_str)
+            self.assertEqual(sorted(match_inversion_result(result, wordlist, True)), sorted(words), regex)
+            self.assertEqual(sorted(match_inversion_result(result, wordlist, True, build_trie_from_wordlist(wordlist))), sorted(words), regex)
+            self.assertEqual(sorted(search_trie(result, build_trie_from_wordlist(wordlist))), sorted(w for w in words if w != ""), regex)
+
+        # compiled once, again only after a change
+        automaton = token_str.get_automaton()
+        self.assertIs(token_str.get_automaton(), automaton)
+        token_str[0] = Token("y")
+        self.assertFalse(token_str.contains("xab"))
+        self.assertTrue(token_str.contains("yab"))
+        token_str.max_len = 3
+        self.assertFalse(token_str.contains("yab"))
+
+    def test_trie_find(self):
+        """ the native trie search finds the keys of a tokenstring, with a cap and a count-only mode """
+        self.switch_to_jtr()
+        wordlist = {w: i for i, w in enumerate(["ab", "Ab", "ac", "abc", "b", "a1"])}
+        trie = build_trie_from_wordlist(wordlist)
+        token_str = TokenString("ab")
+        token_str[0] = Token({"a", "A", "b"})
+        token_str[1] = Token({"b", "c", "1", "ā"})
+        self.assertEqual(sorted(trie.find(token_str)), ["Ab", "a1", "ab", "ac"])
+        self.assertEqual(trie.count(token_str), 4)
+        self.assertEqual(len(trie.find(token_str, max_results=2)), 2)
+        self.assertEqual(trie.find(TokenString("")), [])
+        self.assertEqual(trie.count(TokenString("abd")), 0)
+
+    def test_trie_save(self):
+        """ the trie is saved once, then mapped, with the same keys """
+        self.switch_to_jtr()
+        wordlist = {w: i for i, w in enumerate(["ab", "Ab", "ac", "abc", "b", "a1"])}
+        trie = build_trie_from_wordlist(wordlist)
+        token_str = TokenString("ab")
+        token_str[0] = Token({"a", "A", "b"})
+        token_str[1] = Token({"b", "c", "1"})
+        trie_addr = "../results/test_trie_save.trie"
+        os.remove(trie_addr) if os.path.exists(trie_addr) else None
+        build_trie_from_wordlist(wordlist, trie_addr)
+        mapped = build_trie_from_wordlist({}, trie_addr)
+        os.remove(trie_addr)
+        self.assertEqual(mapped.find(token_str), trie.find(token_str))
+        self.assertEqual(mapped.find(token_str, with_values=True), trie.find(token_str, with_values=True))
+        self.assertEqual(mapped.find_prefixed(TokenString("a")), trie.find_prefixed(TokenString("a")))
+
+    def test_trie_values(self):
+        """ values are the indices of words, the earliest word is found best-first """
+        self.switch_to_jtr()
+        wordlist = {w: i for i, w in enumerate(["ab", "Ab", "ac", "abc", "b", "a1"])}
+        trie = build_trie_from_wordlist(wordlist)
+        token_str = TokenString("ab")
+        token_str[0] = Token({"a", "A", "b"})
+        token_str[1] = Token({"b", "c", "1", "ā"})
+        self.assertEqual(sorted(trie.find(token_str, with_values=True)), [("Ab", 1), ("a1", 5), ("ab", 0), ("ac", 2)])
+        self.assertEqual(trie.find_first(token_str), ("ab", 0))
+        token_str[0] = Token({"a"})
+        token_str[1] = Token({"1", "c"})
+        self.assertEqual(trie.find_first(token_str), ("ac", 2))
+        self.assertEqual(trie.find_first(TokenString("abd")), None)
+        self.assertEqual(trie.get_value("abc"), 3)
+
+    def test_trie_find_many(self):
+        """ the tokenstrings of many passwords are searched in one walk, with the same keys """
+        self.switch_to_jtr()
+        wordlist = {w: i for i, w in enumerate(["ab", "Ab", "ac", "abc", "b", "a1"])}
+        trie = build_trie_from_wordlist(wordlist)
+        token_str = TokenString("ab")
+        token_str[0] = Token({"a"})
+        token_str[1] = Token({"1", "c"})
+        self.assertEqual(trie.find_many([token_str, TokenString("ab"), TokenString(""), TokenString("abc"), token_str]),
+                         [trie.find(token_str), ["ab"], [], ["abc"], trie.find(token_str)])
+        results = [InversionResult(token_str), InversionResult(TokenString("abc")), InversionResult()]
+        self.assertEqual(search_trie_batch(results, trie), [search_trie_with_indices(result, trie) for result in results])
+    def test_reversed_trie(self):
+        """ preimages wide at the start are searched from the end in the trie of reversed words, with the same keys """
+        self.switch_to_hc()
+        wordlist = {w: i for i, w in enumerate(["pass", "xpass", "1pass", "pass1", "ypas", "pas", "xpas", "1x", "abx", "bax", "aax", "bbx"])}
+        trie = build_trie_from_wordlist(wordlist)
+        bidirectional = build_trie_from_wordlist(wordlist)
+        bidirectional.set_reversed(build_trie_from_wordlist(wordlist, is_reversed=True))
+        parser = Elements.parser()
+
+        def as_pairs(found):
+            """ (word, index) pairs of a search, keys found from the end are in another order """
+            return sorted(zip(*found))
+
+        results = []
+        for raw, pwd in (("[", "pass"), ("[", "pas"), ("D0", "pass"), ("^1", "1pass"), ("$1", "pass1"), ("[ [", "x")):
+            result = invert_one_rule(tokenize(pwd), RuleWrapper(raw, parser.parseString(raw).asList()))
+            self.assertEqual(bidirectional._is_backward(trie._to_bytes(result.get_value()[0])), raw in ("[", "D0", "[ ["), raw)
+            self.assertEqual(as_pairs(search_trie_with_indices(result, bidirectional)), as_pairs(search_trie_with_indices(result, trie)), raw)
+            self.assertEqual(search_trie_with_indices(result, bidirectional, True), search_trie_with_indices(result, trie, True), raw)
+            self.assertEqual(bidirectional.count(result.get_value()[0]), trie.count(result.get_value()[0]), raw)
+            # a cap keeps the same keys as the forward trie
+            for max_results in (0, 1, 2, 3):
+                self.assertEqual(bidirectional.find(result.get_value()[0], max_results), trie.find(result.get_value()[0], max_results), raw)
+            results.append(result)
+        self.assertEqual([as_pairs(found) for found in search_trie_batch(results, bidirectional)],
+                         [as_pairs(found) for found in search_trie_batch(results, trie)])
+        self.assertEqual(sorted(search_trie(results[0], bidirectional)), ["1pass", "xpass"])
+
+    def test_trie_guided_inversion(self):
+        """ rules starting with 'N match the words that make the password """
+        self.switch_to_jtr()
+        wordlist = {w: i for i, w in enumerate(["pass", "passw", "password", "Pass", "pas", "pa", "passes", "x"])}
+        trie = build_trie_from_wordlist(wordlist)
+        parser = Elements.parser()
+        raw_rules = ["'4", "'4 $1", "'3 c", "'2 $1 $2", "c"]
+        forward = [lambda w: w[:4], lambda w: w[:4] + "1", lambda w: w[:3].capitalize(), lambda w: w[:2] + "12", None]
+        rulelist = [RuleWrapper(raw, parser.parseString(raw).asList()) for raw in raw_rules]
+        rulelist = get_special_invertibility(get_is_feasible(get_special_countability(get_dependencies_for_rules(rulelist))))
+        self.assertEqual([is_trie_guided_rule(r) for r in rulelist], [True, True, True, True, False])
+        for r, f in zip(rulelist[:-1], forward):
+            for pwd in ("pass", "pass1", "Pas", "pa12", "pa", "x", ""):
+                for lookup_threshold in (0, 1024):
+                    result, ret_vals = invert_and_search_trie(tokenize(pwd), r, wordlist, trie, lookup_threshold)
+                    self.assertTrue(result.is_normal())
+                    self.assertEqual(sorted(ret_vals), sorted(w for w in wordlist if f(w) == pwd), (r.raw, pwd))
+
+        # HC xNM keeps M chars at N, words shorter than N + M are left as they are
+        self.switch_to_hc()
+        raw_rules = ["x04", "x13", "x22 $1", "x10", "'3"]
+        forward = [lambda w: w if len(w) < 4 else w[:4], lambda w: w if len(w) < 4 else w[1:4],
+                   lambda w: (w if len(w) < 4 else w[2:4]) + "1", None, lambda w: w[:3]]
+        rulelist = [RuleWrapper(raw, parser.parseString(raw).asList()) for raw in raw_rules]
+        rulelist = get_special_invertibility(get_is_feasible(get_special_countability(get_dependencies_for_rules(rulelist))))
+        self.assertEqual([is_trie_guided_rule(r) for r in rulelist], [True, True, True, False, True])
+        for r, f in zip(rulelist, forward):
+            if f is None:
+                continue
+            for pwd in ("pass", "ass", "as", "ss1", "pa1", "pas", "x", "x1", ""):
+                for lookup_threshold in (0, 1024):
+                    result, ret_vals = invert_and_search_trie(tokenize(pwd), r, wordlist, trie, lookup_threshold)
+                    self.assertTrue(result.is_normal())
+                    self.assertEqual(sorted(ret_vals), sorted(w for w in wordlist if f(w) == pwd), (r.raw, pwd))
+
+    def test_memory_subrule(self):
+        """ subrules with M 4 6 XNMI are inverted by tracking the memorized word """
+        self.switch_to_hc()
+        words = ["", "a", "ab", "abc", "Ab", "aba", "abab", "ba", "b1"]
+        forward = {
+            "4": lambda w: w + w,
+            "6": lambda w: w + w,
+            "M $1 4": lambda w: w + "1" + w,
+            "c M 6": lambda w: w.capitalize() * 2,
+            "u 6": lambda w: w + w.upper(),
+            "X021": lambda w: w[:1] + w[:2] + w[1:] if len(w) >= 2 else None,
+        }
+        parser = Elements.parser()
+        for raw, f in forward.items():
+            r = RuleWrapper(raw, parser.parseString(raw).asList())
+            self.assertEqual(check_is_invertible(r), Invertibility.INVERTIBLE, raw)
+            for pwd in set(f(w) for w in words if f(w) is not None) | {"ab", "x"}:
+                result = invert_one_rule(TokenString(pwd), r)
+                self.assertTrue(result.is_normal(), (raw, pwd))
+                self.assertEqual(sorted(w for w in words if result.contains(w)), sorted(w for w in words if f(w) == pwd), (raw, pwd))
+
+        for raw in ("Q", "M $1 Q"):
+            r = RuleWrapper(raw, parser.parseString(raw).asList())
+            self.assertNotEqual(check_is_invertible(r), Invertibility.INVERTIBLE, raw)
+
+        # a result too long is left as it is in HC, JtR truncates it
+        for switch, is_itself in ((self.switch_to_hc, True), (self.switch_to_jtr, False)):
+            switch(max_password_length=4)
+            for raw, pwd in (("4", "abc"), ("6", "abc"), ("M $1 4", "abc1")):
+                r = RuleWrapper(raw, parser.parseString(raw).asList())
+                result = invert_one_rule(TokenString(pwd), r)
+                self.assertTrue(result.is_normal(), raw)
+                self.assertEqual(bool(result.contains("abc")), is_itself, raw)
+            # not too long, appended in both
+            self.assertTrue(invert_one_rule(TokenString("abab"), RuleWrapper("4", parser.parseString("4").asList())).contains("ab"))
+
+    def test_wordlist_pruning(self):
+        """ pruned preimages match the same words of the wordlist """
+        self.switch_to_jtr()
+        wordlist = {"abc": 0, "abd": 1, "xy": 2, "Abe": 3}
+        stats = WordlistStats(wordlist)
+        self.assertEqual(stats.length_counts[3], 3)
+        # saved once, then loaded
+        stats_addr = "../results/test_wordlist_pruning.json"
+        stats.save(stats_addr)
+        loaded = WordlistStats.load(stats_addr)
+        os.remove(stats_addr)
+        self.assertEqual((loaded.length_counts, loaded.alphabets, loaded.masks), (stats.length_counts, stats.alphabets, stats.masks))
+        for token_type in ("set", "bitmask", "array"):
+            with self.use_token_type(token_type):
+                for pwd, transformations, words in (("ab", [["]"]], ["abc", "abd"]), ("Ab", [["c"], ["]"]], ["Abe", "abc", "abd"]), ("x", [["]"]], ["xy"]), ("xyz", [["]"]], [])):
+                    result = InversionResult(tokenize(pwd))
+                    for transformation in transformations[::-1]:
+                        result = invert_single_transformation(result.get_value(), transformation)
+                    pruned = result.prune(stats)
+                    self.assertTrue(set(pruned.get_all_strings()) <= set(result.get_all_strings()))
+                    self.assertLessEqual(pruned.get_number_of_strings(), 2 * len(words))
+                    self.assertEqual(sorted(w for w in pruned.get_all_strings() if w in wordlist), words)
+                    self.assertEqual(sorted(w for w in result.get_all_strings() if w in wordlist), words)
+
+    def test_wordlist_cache_key(self):
+        """ the trie and stats of a wordlist are saved apart for each running style, whose word indices differ """
+        addrs = []
+        for switch in (self.switch_to_jtr, self.switch_to_hc):
+            switch()
+            RUNTIME_CONFIG['wordlist_path'] = FilePath("../data/wordlists/demo.lst")
+            addrs.append((get_trie_addr(), get_trie_addr(True), get_wordlist_stats_addr()))
+        jtr_addrs, hc_addrs = addrs
+        self.assertEqual(len(set(jtr_addrs + hc_addrs)), 6)
+        self.assertTrue(hc_addrs[0].endswith("-hc.trie"))
+
+    def test_rule_plan(self):
+        """ rules are compiled once for each running style """
+        self.switch_to_jtr()
+        r = RuleWrapper("c $1", Elements.parser().parseString("c $1").asList())
+        plan = r.get_plan(CompiledTransformation)
+        self.assertIs(plan, r.get_plan(CompiledTransformation))
+        self.assertEqual([compiled.name for compiled in plan[0]], ["c", "dollar_X"])
+        self.assertEqual(plan[0][-1].is_batch, True)
+        self.assertEqual(check_is_invertible(r), Invertibility.INVERTIBLE)
+
+        self.switch_to_hc()
+        self.assertIsNot(plan, r.get_plan(CompiledTransformation))
+        result = invert_one_rule(TokenString("Pass1"), r)
+        self.assertEqual(result.get_number_of_strings(), 16)
+        self.assertTrue(result.contains("pASs"))
+
+    def test_invert_one_rule_batch(self):
+        """ inverting a rule for a batch of passwords is the same as inverting it for each password """
+        raw_rules = [":", "$1", "$1 $2", "^a $1", "<8 c", "/a c $1", "(a", ")1", "=1a", "!x", ">5 $1", "$[0-9]", "_4", "l $1 <6"]
+        pwds = ["", "a", "abc1", "abc12", "Abc1", "aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa1", "p\u0101ss1", "xa12", "a1b2", "1111"]
+        for switch in (self.switch_to_jtr, self.switch_to_hc):
+            switch()
+            parser = Elements.parser()
+            for raw in raw_rules:
+                if raw == "$[0-9]" and RUNTIME_CONFIG.is_jtr() == False:
+                    continue
+                r = RuleWrapper(raw, parser.parseString(raw).asList())
+                self.assertEqual(is_batch_rule(r), raw != "<8 c")
+                results = invert_one_rule_batch(pwds, r)
+                for pwd, result in zip(pwds, results):
+                    expected = invert_one_rule(TokenString(pwd), r)
+                    self.assertEqual(result.get_status(), expected.get_status())
+                    self.assertEqual(sorted(result.get_all_strings()), sorted(expected.get_all_strings()))
+
     @unittest.skip
     def test_inversion_on_JTR_rulelist(self):
         """ test on rule files. time-intensive. by default skipped """
@@ -0,0 +1,53 @@
+from sys import path as sys_path
+from os import path as os_path
+import unittest
+import tempfile
+import gzip
+import csv
+import numpy as np
+
+sys_path.append(os_path.abspath('../src'))
+
+from results_writer import ResultsWriter
+
+
+class ResultsWriterTest(unittest.TestCase):
+
+    def write_results(self, addr_prefix, results_format):
+        """ write a few records, with flushes in between """
+        writer = ResultsWriter(addr_prefix, results_format, flush_size=2)
+        for i in range(5):
+            writer.add_hit(i, i + 1, i + 2, i + 3, i + 4, i + 5)
+            writer.add_summary(i, i + 3 if i % 2 == 0 else None)
+        writer.close()
+
+    def test_npy(self):
+        with tempfile.TemporaryDirectory() as d:
+            self.write_results(d + "/results", "npy")
+            hits = np.load(d + "/results.hits.npy", mmap_mode='r')
+            summary = np.load(d + "/results.summary.npy")
+
+        self.assertEqual(hits.shape, (5, ))
+        self.assertEqual(list(hits['pw_idx']), [0, 1, 2, 3, 4])
+        self.assertEqual(list(hits['upper']), [5, 6, 7, 8, 9])
+        self.assertEqual(list(summary['min_guess']), [3, -1, 5, -1, 7])
+
+    def test_csv(self):
+        with tempfile.TemporaryDirectory() as d:
+            self.write_results(d + "/results", "csv")
+            with gzip.open(d + "/results.hits.csv.gz", 'rt') as f:
+                hits = list(csv.reader(f))
+            with gzip.open(d + "/results.summary.csv.gz", 'rt') as f:
+                summary = list(csv.reader(f))
+
+        self.assertEqual(hits[0], ['pw_idx', 'rule_idx', 'word_idx', 'guess', 'lower', 'upper'])
+        self.assertEqual(hits[5], ['4', '5', '6', '7', '8', '9'])
+        self.assertEqual([row[1] for row in summary[1:]], ['3', '-1', '5', '-1', '7'])
+
+
+if __name__ == "__main__":
+
+    #Run Unit Test
+    suite = unittest.TestLoader().loadTestsFromTestCase(ResultsWriterTest)
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
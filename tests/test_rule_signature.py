@@ -0,0 +1,54 @@
+from sys import path as sys_path
+from os import path as os_path
+import unittest
+
+sys_path.append(os_path.abspath('../src'))
+
+from config import RUNTIME_CONFIG
+from parse import Elements, RuleWrapper
+from tokenstr import TokenString
+from invert_rule import invert_one_rule
+from rule_signature import RuleSignature, PasswordFeatures
+
+
+class RuleSignatureTest(unittest.TestCase):
+
+    def setUp(self):
+        RUNTIME_CONFIG.reset_to_jtr(max_password_length=31)
+
+    def get_candidates(self, raw, pwds):
+        r = RuleWrapper(raw, Elements.parser().parseString(raw).asList())
+        candidates = RuleSignature(r).get_candidates(PasswordFeatures(pwds))
+        return None if candidates is None else [pwds[i] for i in candidates]
+
+    def test_candidates(self):
+        pwds = ["abc1", "Abc1", "abc", "1abc", "ABC", "", "x" * 40]
+        self.assertEqual(self.get_candidates("$1", pwds), ["abc1", "Abc1", "x" * 40])
+        self.assertEqual(self.get_candidates("^1", pwds), ["1abc", "x" * 40])
+        self.assertEqual(self.get_candidates("c", pwds), ["Abc1", "1abc", "ABC", "", "x" * 40])
+        self.assertEqual(self.get_candidates("l $1", pwds), ["abc1", "Abc1", "x" * 40])
+        self.assertEqual(self.get_candidates("<4", pwds), ["abc", "ABC", "", "x" * 40])
+        self.assertEqual(self.get_candidates("/?d", pwds), ["abc1", "Abc1", "1abc", "x" * 40])
+        self.assertEqual(self.get_candidates("/?d u", pwds), ["ABC", "", "x" * 40])
+        self.assertEqual(self.get_candidates("r $1", pwds), ["abc1", "Abc1", "x" * 40])
+        self.assertIsNone(self.get_candidates("$1 r", pwds))
+
+    def test_skipped_pairs_are_rejected(self):
+        """ inverting a rule on a password it skips gives no preimage """
+        pwds = ["abc1", "Abc1", "abc", "1abc", "ABC", "", "a", "A!", "pass word", "x" * 40, "pāss1"]
+        raw_rules = ["$1", "^1", "c", "C", "l", "u", "l $1", "c $[0-9]", "<4 $1", ">2 ^a", "_3 c", "(a", ")1", "/a", "!a", "/?d l", "!?d", "(?u $1", "l ^1 $2", "r $1"]
+        features = PasswordFeatures(pwds)
+        for raw in raw_rules:
+            r = RuleWrapper(raw, Elements.parser().parseString(raw).asList())
+            candidates = RuleSignature(r).get_candidates(features)
+            candidates = range(len(pwds)) if candidates is None else candidates
+            for idx, pwd in enumerate(pwds):
+                if idx in candidates:
+                    continue
+                result = invert_one_rule(TokenString(pwd), r)
+                self.assertTrue(result.is_normal(), (raw, pwd))
+                self.assertTrue(result.is_null(), (raw, pwd))
+
+
+if __name__ == '__main__':
+    unittest.main()
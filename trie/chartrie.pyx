@@ -1,5 +1,17 @@
+# cython: language_level=3str
+from libc.stdint cimport intptr_t
+from cpython.buffer cimport PyObject_GetBuffer, PyBuffer_Release, PyBUF_SIMPLE
+import mmap
+import struct
+
 cdef extern from "stdlib.h":
     void free(void* ptr)
+    void* malloc(size_t size)
+    void* realloc(void* ptr, size_t size)
+
+cdef extern from "string.h":
+    char* strchr(const char* s, int c)
+    size_t strlen(const char* s)
 
 cdef extern from "trie.h":
     cdef struct Trie:
@@ -7,6 +19,9 @@ cdef extern from "trie.h":
 
     cdef struct Node:
         int value
+        int min_value
+        intptr_t choices
+        intptr_t children
 
     cdef struct SerialTrie:
         Node* root
@@ -21,6 +36,9 @@ cdef extern from "trie.h":
         unsigned int node_count
         unsigned int char_count
 
+    char* NODE_CHOICES(Node* node)
+    Node* NODE_CHILDREN(Node* node)
+
     Trie* trie_create()
     int trie_find_word(Node *trie, char* word)
     Node* trie_add_word(Node *trie, char* word)
@@ -81,16 +99,39 @@ cdef class CharTrie:
         node = trie_find_word(self.trie.root, key)
         return node
 
+cdef struct SearchEntry:
+    Node* node
+    int depth
+    size_t parent  # the entry this one was reached from
+    unsigned char c  # the char from the parent
+    int priority  # the value of a key, the min_value of a node above a key
+
+cdef inline bint _is_before(SearchEntry* entries, size_t a, size_t b):
+    """ whether entry a is explored before entry b, by priority then in the order they were reached """
+    return entries[a].priority < entries[b].priority or (
+        entries[a].priority == entries[b].priority and a < b)
+
+# an image of a frozen trie: a header, then its block of nodes and chars as they are in memory
+IMAGE_MAGIC = b"CHARTRIE"
+IMAGE_VERSION = 2
+IMAGE_HEADER = struct.Struct("<8sIIII8x")  # magic, version, sizeof(Node), node count, char count
+IMAGE_CHUNK_SIZE = 1 << 26  # bytes written at once
+
 cdef class FrozenCharTrie:
     cdef FrozenTrie *trie
-    
+    cdef object mapping  # the image mapped by load(), None if the trie was built by loads()
+    cdef Py_buffer image
+
     def __cinit__(self):
         self.trie = NULL
+        self.mapping = None
 
     def __dealloc__(self):
         if self.trie is not NULL:
-            free(self.trie.root)
-            free(self.trie.chars)
+            if self.mapping is None:
+                free(self.trie.root)  # the chars are in the same block
+            else:
+                PyBuffer_Release(&self.image)
             free(self.trie)
             self.trie = NULL
             
@@ -106,6 +147,45 @@ cdef class FrozenCharTrie:
     def loads(self, stream):
         self.trie = trie_load(stream)
 
+    def save(self, path):
+        """ Write the trie as an image, see load """
+        cdef size_t size = self.trie.node_count * sizeof(Node) + self.trie.char_count
+        cdef size_t offset
+        cdef char* block = <char*>self.trie.root
+        with open(path, 'wb') as f:
+            f.write(IMAGE_HEADER.pack(IMAGE_MAGIC, IMAGE_VERSION, sizeof(Node),
+                                      self.trie.node_count, self.trie.char_count))
+            for offset in range(0, size, IMAGE_CHUNK_SIZE):
+                f.write(block[offset:min(offset + IMAGE_CHUNK_SIZE, size)])
+
+    def load(self, path):
+        """ Map an image written by save, nothing is copied: the pages are read when needed and
+        shared with every process that maps the same file. Raises ValueError if path is not an
+        image of this version.
+        """
+        cdef unsigned int node_count, char_count
+        cdef Py_ssize_t header_size = IMAGE_HEADER.size
+        cdef FrozenTrie* trie
+        with open(path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapping) < IMAGE_HEADER.size:
+            mapping.close()
+            raise ValueError("Not a trie image: {}".format(path))
+        magic, version, node_size, node_count, char_count = IMAGE_HEADER.unpack_from(mapping)
+        if magic != IMAGE_MAGIC or version != IMAGE_VERSION or node_size != sizeof(Node) or len(
+                mapping) != IMAGE_HEADER.size + node_count * node_size + char_count:
+            mapping.close()
+            raise ValueError("Not a trie image of this version: {}".format(path))
+
+        trie = <FrozenTrie*>malloc(sizeof(FrozenTrie))
+        PyObject_GetBuffer(mapping, &self.image, PyBUF_SIMPLE)
+        self.mapping = mapping
+        trie.root = <Node*>(<char*>self.image.buf + header_size)
+        trie.chars = <char*>(trie.root + node_count)
+        trie.node_count = node_count
+        trie.char_count = char_count
+        self.trie = trie
+
     def debug_print(self):
         trie_print(self.trie.root)
 
@@ -133,6 +213,307 @@ cdef class FrozenCharTrie:
         free(results)
         return r
 
+    def find_tokenstring(self, tokens, max_results=-1, bint count_only=False, bint with_values=False):
+        """ Find the keys of a tokenstring, tokens is a list of bytes (the chars allowed at each position).
+
+        The trie is walked depth-first with an explicit stack of (node, next char to try) for each
+        position. Keys are in the order of the chars of each position, at most max_results
+        are found (-1 for all). Returns the keys (decoded as latin-1), (key, value) pairs if with_values,
+        or their number if count_only.
+        """
+        cdef int length = len(tokens)
+        cdef long limit = max_results
+        cdef long count = 0
+        cdef int depth = 0
+        cdef unsigned char c
+        cdef char* found
+        cdef char* choices
+        cdef Node* child
+        cdef list out = []
+        if length == 0 or limit == 0:
+            return 0 if count_only else out
+
+        cdef list token_bytes = [bytes(t) for t in tokens]  # keeps the buffers alive
+        cdef const unsigned char** chars = <const unsigned char**>malloc(length * sizeof(char*))
+        cdef int* chars_len = <int*>malloc(length * sizeof(int))
+        cdef int* next_idx = <int*>malloc(length * sizeof(int))
+        cdef Node** nodes = <Node**>malloc(length * sizeof(Node*))
+        cdef char* key = <char*>malloc(length + 1)
+        try:
+            for depth in range(length):
+                chars[depth] = <const unsigned char*><char*>token_bytes[depth]
+                chars_len[depth] = len(token_bytes[depth])
+
+            depth = 0
+            nodes[0] = self.trie.root
+            next_idx[0] = 0
+            while depth >= 0:
+                choices = NODE_CHOICES(nodes[depth])
+                if next_idx[depth] == chars_len[depth] or choices is NULL:
+                    depth -= 1
+                    continue
+
+                c = chars[depth][next_idx[depth]]
+                next_idx[depth] += 1
+                if c == 0:
+                    continue
+                found = strchr(choices, c)
+                if found is NULL:
+                    continue
+                child = NODE_CHILDREN(nodes[depth]) + (found - choices)
+                key[depth] = <char>c
+
+                if depth == length - 1:
+                    if child.value != -1:
+                        count += 1
+                        if with_values == True:
+                            out.append((key[:length].decode('latin-1'), child.value))
+                        elif count_only == False:
+                            out.append(key[:length].decode('latin-1'))
+                        if limit >= 0 and count >= limit:
+                            break
+                else:
+                    depth += 1
+                    nodes[depth] = child
+                    next_idx[depth] = 0
+        finally:
+            free(chars)
+            free(chars_len)
+            free(next_idx)
+            free(nodes)
+            free(key)
+
+        return count if count_only else out
+
+    def find_prefixed(self, tokens):
+        """ Find the keys that start with a string of a tokenstring (tokens as in find_tokenstring), the strings included.
+
+        The tokens are walked depth-first as in find_tokenstring, then every key below where they end.
+        At each position chars are tried last to first, and a key comes before the keys below it.
+        Returns the keys (decoded as latin-1).
+        """
+        cdef int length = len(tokens)
+        cdef int capacity = length + 16
+        cdef int depth = 0
+        cdef unsigned char c
+        cdef char* found
+        cdef char* choices
+        cdef Node* child
+        cdef list out = []
+
+        cdef list token_bytes = [bytes(t) for t in tokens]  # keeps the buffers alive
+        cdef const unsigned char** chars = <const unsigned char**>malloc((length + 1) * sizeof(char*))
+        cdef int* chars_len = <int*>malloc((length + 1) * sizeof(int))
+        cdef int* next_idx = <int*>malloc(capacity * sizeof(int))
+        cdef Node** nodes = <Node**>malloc(capacity * sizeof(Node*))
+        cdef char* key = <char*>malloc(capacity)
+        try:
+            for depth in range(length):
+                chars[depth] = <const unsigned char*><char*>token_bytes[depth]
+                chars_len[depth] = len(token_bytes[depth])
+
+            # next_idx counts down the chars left to try at each position
+            depth = 0
+            nodes[0] = self.trie.root
+            choices = NODE_CHOICES(nodes[0])
+            if length != 0:
+                next_idx[0] = chars_len[0]
+            else:
+                next_idx[0] = 0 if choices is NULL else strlen(choices)
+            while depth >= 0:
+                choices = NODE_CHOICES(nodes[depth])
+                if next_idx[depth] == 0 or choices is NULL:
+                    depth -= 1
+                    continue
+
+                next_idx[depth] -= 1
+                if depth < length:
+                    c = chars[depth][next_idx[depth]]
+                    if c == 0:
+                        continue
+                    found = strchr(choices, c)
+                    if found is NULL:
+                        continue
+                else:
+                    found = choices + next_idx[depth]
+                    c = <unsigned char>found[0]
+                child = NODE_CHILDREN(nodes[depth]) + (found - choices)
+                key[depth] = <char>c
+
+                depth += 1
+                if depth == capacity:
+                    capacity *= 2
+                    next_idx = <int*>realloc(next_idx, capacity * sizeof(int))
+                    nodes = <Node**>realloc(nodes, capacity * sizeof(Node*))
+                    key = <char*>realloc(key, capacity)
+                nodes[depth] = child
+                if depth < length:
+                    next_idx[depth] = chars_len[depth]
+                else:
+                    if child.value != -1:
+                        out.append(key[:depth].decode('latin-1'))
+                    choices = NODE_CHOICES(child)
+                    next_idx[depth] = 0 if choices is NULL else strlen(choices)
+        finally:
+            free(chars)
+            free(chars_len)
+            free(next_idx)
+            free(nodes)
+            free(key)
+
+        return out
+
+    def find_tokenstrings(self, queries, bint with_values=False):
+        """ Find the keys of many tokenstrings at once, each is a list of bytes as in find_tokenstring.
+
+        The tokenstrings are put in a query trie, whose edges are the tokens (tokenstrings starting with
+        the same tokens share a path), and both tries are walked together: a trie-trie intersection.
+        Returns a list with what find_tokenstring returns for each tokenstring, in the same order.
+        """
+        cdef list out = [[] for _ in queries]
+        cdef int max_length = 0
+        cdef tuple query_root = ({}, [])  # (token -> child, positions of tokenstrings ending here)
+        cdef tuple query_node
+        for idx, tokens in enumerate(queries):
+            if len(tokens) == 0:
+                continue
+            query_node = query_root
+            for token in tokens:
+                query_node = query_node[0].setdefault(bytes(token), ({}, []))
+            query_node[1].append(idx)
+            max_length = max(max_length, len(tokens))
+
+        cdef char* key = <char*>malloc(max_length + 1)
+        try:
+            self._intersect(query_root, self.trie.root, 0, key, out, with_values)
+        finally:
+            free(key)
+        return out
+
+    cdef _intersect(self, tuple query_node, Node* node, int depth, char* key, list out, bint with_values):
+        """ walk the children of query_node (a node of the query trie) and node together, see find_tokenstrings """
+        cdef char* choices = NODE_CHOICES(node)
+        cdef char* found
+        cdef Node* child
+        cdef bytes token
+        cdef unsigned char c
+        cdef tuple query_child
+        cdef dict query_children
+        cdef list ending
+        if choices is NULL:
+            return
+
+        for token, query_child in (<dict>query_node[0]).items():
+            query_children = query_child[0]
+            ending = query_child[1]
+            for c in token:
+                if c == 0:
+                    continue
+                found = strchr(choices, c)
+                if found is NULL:
+                    continue
+                child = NODE_CHILDREN(node) + (found - choices)
+                key[depth] = <char>c
+
+                if len(ending) != 0 and child.value != -1:
+                    one_key = key[:depth + 1].decode('latin-1')
+                    if with_values:
+                        one_key = (one_key, child.value)
+                    for idx in ending:
+                        (<list>out[idx]).append(one_key)
+                if len(query_children) != 0:
+                    self._intersect(query_child, child, depth + 1, key, out, with_values)
+
+    def find_first(self, tokens):
+        """ Find the key of a tokenstring with the smallest value, see find_tokenstring.
+
+        Best-first: a node is explored in the order of the smallest value below it (min_value),
+        and a key in the order of its value, so the first key reached is the answer and the
+        search stops there. Returns (key, value), or None if no key.
+        """
+        cdef int length = len(tokens)
+        cdef SearchEntry* entries
+        cdef size_t* heap
+        cdef size_t capacity = 64, size = 0, heap_size = 0
+        cdef size_t top, idx, parent, i, smallest
+        cdef int depth, priority
+        cdef bytes allowed
+        cdef unsigned char c
+        cdef char* found
+        cdef char* choices
+        cdef Node* child
+        if length == 0 or self.trie.root.min_value == -1:
+            return None
+
+        cdef list token_bytes = [bytes(t) for t in tokens]  # keeps the buffers alive
+        cdef bytearray key = bytearray(length)
+        entries = <SearchEntry*>malloc(capacity * sizeof(SearchEntry))
+        heap = <size_t*>malloc(capacity * sizeof(size_t))
+        try:
+            entries[0] = SearchEntry(self.trie.root, 0, 0, 0, self.trie.root.min_value)
+            size, heap_size = 1, 1
+            heap[0] = 0
+            while heap_size != 0:
+                # pop the entry with the smallest (priority, idx)
+                top = heap[0]
+                heap_size -= 1
+                heap[0] = heap[heap_size]
+                i = 0
+                while True:
+                    smallest = i
+                    for idx in (2 * i + 1, 2 * i + 2):
+                        if idx < heap_size and _is_before(entries, heap[idx], heap[smallest]):
+                            smallest = idx
+                    if smallest == i:
+                        break
+                    heap[i], heap[smallest] = heap[smallest], heap[i]
+                    i = smallest
+
+                depth = entries[top].depth
+                if depth == length:
+                    idx = top
+                    while idx != 0:
+                        key[entries[idx].depth - 1] = entries[idx].c
+                        idx = entries[idx].parent
+                    return (bytes(key).decode('latin-1'), entries[top].priority)
+
+                choices = NODE_CHOICES(entries[top].node)
+                if choices is NULL:
+                    continue
+                allowed = token_bytes[depth]
+                for c in allowed:
+                    if c == 0:
+                        continue
+                    found = strchr(choices, c)
+                    if found is NULL:
+                        continue
+                    child = NODE_CHILDREN(entries[top].node) + (found - choices)
+                    priority = child.value if depth + 1 == length else child.min_value
+                    if priority == -1:
+                        continue
+
+                    if size == capacity:
+                        capacity *= 2
+                        entries = <SearchEntry*>realloc(entries, capacity * sizeof(SearchEntry))
+                        heap = <size_t*>realloc(heap, capacity * sizeof(size_t))
+                    entries[size] = SearchEntry(child, depth + 1, top, c, priority)
+                    # push
+                    i = heap_size
+                    heap[i] = size
+                    heap_size += 1
+                    size += 1
+                    while i != 0:
+                        parent = (i - 1) // 2
+                        if _is_before(entries, heap[parent], heap[i]):
+                            break
+                        heap[i], heap[parent] = heap[parent], heap[i]
+                        i = parent
+        finally:
+            free(entries)
+            free(heap)
+
+        return None
+
 cdef class TrieState:
 
     cdef Node **ptr_state
@@ -159,6 +540,13 @@ cdef class TrieState:
     def print_possible_next(self):
         node_print(self.ptr_state)
 
+    def next_chars(self):
+        # the chars (bytes, decoded as latin-1) that continue the current state
+        cdef char* choices = NODE_CHOICES(self.ptr_state[0])
+        if choices is NULL:
+            return ""
+        return choices.decode('latin-1')
+
     def is_leaf(self):
         if c_is_leaf(self.ptr_state) == 0:
             return False
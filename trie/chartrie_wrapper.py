@@ -6,47 +6,200 @@ class CharTrieWrapper():
     reference: https://github.com/pytries/datrie/tree/master/src
     """
 
-    def __init__(self, wordlist):
+    def __init__(self, wordlist, is_reversed=False):
         """
         Initialize a DATrie, given a wordlist addr. Read the wordlist and build the trie.
+        The value of each word is its index in the wordlist.
+        If is_reversed, the trie holds each word reversed, see set_reversed.
         """
         tmp = chartrie.CharTrie()
-        for word in wordlist.keys():
+        for word, idx in wordlist.items():
             if word == "":
                 continue
-            tmp[bytes(word.encode())] = 0
+            key = bytes(word.encode())
+            tmp[key[::-1] if is_reversed else key] = idx
         
         stream = tmp.dumps()
-        f = open('dump.trie', 'wb')
-        f.write(stream)
-        f.close()
         trie = chartrie.FrozenCharTrie()
         trie.loads(stream)
         self.trie = trie
+        self.reversed = None
 
-    def find(self, token_str):
+    @classmethod
+    def load(cls, addr):
+        """
+        Map a trie saved with save, instead of building it. Raises ValueError if addr is not a saved trie.
+        """
+        ret = cls.__new__(cls)
+        trie = chartrie.FrozenCharTrie()
+        trie.load(addr)
+        ret.trie = trie
+        ret.reversed = None
+        return ret
+
+    def save(self, addr):
+        """
+        Save the trie to addr, see load.
+        """
+        self.trie.save(addr)
+
+    @staticmethod
+    def _to_bytes(token_str):
+        """ the chars of each token as bytes, chars the trie can't hold (>= chr(256), chr(0)) are dropped """
+        return [
+            "".join(c for c in token.get_value()
+                    if "\x00" < c < "\u0100").encode('latin-1')
+            for token in token_str
+        ]
+
+    def set_reversed(self, reversed_trie):
+        """
+        Set the trie of the same wordlist with reversed words (built with is_reversed). Each token_str
+        is then walked from the end in it when that visits fewer nodes, see _is_backward.
+        """
+        self.reversed = reversed_trie
+
+    @staticmethod
+    def _get_walk_cost(tokens):
+        """ an upper bound of the nodes walked for tokens, the sum of the products of the sizes of the first tokens """
+        cost, product = 0, 1
+        for token in tokens:
+            product *= len(token)
+            cost += product
+        return cost
+
+    def _is_backward(self, tokens):
+        """ whether tokens (bytes of each token) are walked from the end, in the reversed trie """
+        return self.reversed is not None and self._get_walk_cost(
+            tokens[::-1]) < self._get_walk_cost(tokens)
+
+    @staticmethod
+    def _to_forward(tokens, found, with_values, max_results=-1):
+        """
+        The keys found in the reversed trie for tokens[::-1], reversed back. They are not in the
+        order the forward trie returns them, unless max_results keys are kept (-1 for all):
+        then they are sorted that way (by the position of each char in its token) and the first are kept.
+        """
+        if with_values:
+            found = [(key[::-1], value) for key, value in found]
+        else:
+            found = [key[::-1] for key in found]
+        if max_results < 0:
+            return found
+
+        ranks = [{c: rank for rank, c in enumerate(token)} for token in tokens]
+
+        def get_rank(item):
+            key = item[0] if with_values else item
+            return [r[c] for r, c in zip(ranks, key.encode('latin-1'))]
+
+        return sorted(found, key=get_rank)[:max_results]
+
+    def find(self, token_str, max_results=-1, with_values=False):
         """
         Given a token_str, return all the keys that are contained by the trie.
         A token_str here is a list of sets. [set(a,b), set(b,c), etc...]
+        The trie is walked in one native call (FrozenCharTrie.find_tokenstring), at most
+        max_results keys are returned (-1 for all). If with_values, (key, value) pairs are returned.
+        Keys found from the end (see set_reversed) are in another order, the first max_results are
+        still the ones the forward trie returns.
+        """
+        tokens = self._to_bytes(token_str)
+        if self._is_backward(tokens):
+            return self._to_forward(
+                tokens,
+                self.reversed.trie.find_tokenstring(tokens[::-1],
+                                                    with_values=with_values),
+                with_values, max_results)
+        return self.trie.find_tokenstring(tokens,
+                                          max_results,
+                                          with_values=with_values)
+
+    def find_many(self, token_strs, with_values=False):
+        """
+        Given a list of token_str, return the keys of each, same as find for each but in one walk of
+        the trie: token_strs sharing leading tokens share that part of the walk.
+        """
+        queries = [self._to_bytes(token_str) for token_str in token_strs]
+        is_backward = [self._is_backward(tokens) for tokens in queries]
+        forward = iter(
+            self.trie.find_tokenstrings([
+                tokens for tokens, b in zip(queries, is_backward) if b == False
+            ], with_values))
+        backward = iter(
+            self.reversed.trie.find_tokenstrings([
+                tokens[::-1] for tokens, b in zip(queries, is_backward) if b
+            ], with_values) if any(is_backward) else [])
+        return [
+            self._to_forward(tokens, next(backward), with_values)
+            if b else next(forward) for tokens, b in zip(queries, is_backward)
+        ]
+
+    def find_first(self, token_str):
+        """
+        Given a token_str, return (key, value) of the key with the smallest value (the earliest word), None if no key.
+        """
+        tokens = self._to_bytes(token_str)
+        if self._is_backward(tokens):
+            first = self.reversed.trie.find_first(tokens[::-1])
+            return None if first is None else (first[0][::-1], first[1])
+        return self.trie.find_first(tokens)
+
+    def get_value(self, key):
+        """
+        Return the value of a key found by the trie (the index of the word), None if not a key.
+        """
+        return self.trie[key.encode('latin-1')]
+
+    def count(self, token_str):
+        """
+        Given a token_str, return the number of keys that are contained by the trie, see find.
+        """
+        tokens = self._to_bytes(token_str)
+        if self._is_backward(tokens):
+            return self.reversed.trie.find_tokenstring(tokens[::-1],
+                                                       count_only=True)
+        return self.trie.find_tokenstring(tokens, count_only=True)
+
+    def find_automaton(self, automaton):
+        """
+        Given a compiled regex tokenstring (a RegexAutomaton), return all the keys that it matches.
+        The trie and the automaton are walked together, a branch stops as soon as the automaton
+        can't match, or the key would be too long.
         """
         out = []
-        q = []
-        q.append((chartrie.TrieState(self.trie), 0, []))
+        q = [(chartrie.TrieState(self.trie), automaton.initial, [])]
         while (len(q) != 0):
-            current_state, token_idx, trace = q.pop(0)
-            current_save = chartrie.TrieState(self.trie)
-            current_state.copy_to_state(current_save)
-            for c in token_str[token_idx].get_value():
-                if current_save.contains_next(c):
-                    if token_idx == len(token_str) - 1:
-                        if current_save.is_leaf():
-                            #print("".join(trace+[c]))
-                            out.append("".join(trace+[c]))
-                            pass
-                    else:
-                        q.append((current_save, token_idx + 1, trace+[c]))
-                        # For Efficiency Reasons
-                    
-                    current_save = chartrie.TrieState(self.trie)
-                    current_state.copy_to_state(current_save)
+            current_state, state, trace = q.pop()
+            if len(trace) + 1 >= automaton.max_len:
+                continue
+            for c in automaton.next_chars[state]:
+                current_save = chartrie.TrieState(self.trie)
+                current_state.copy_to_state(current_save)
+                if current_save.contains_next(c) == False:
+                    continue
+                next_state = automaton.step(state, c)
+                if next_state == automaton.DEAD:
+                    continue
+                if current_save.is_leaf() and automaton.is_accepting(
+                        next_state) and len(trace) + 1 >= automaton.min_len:
+                    out.append("".join(trace + [c]))
+                q.append((current_save, next_state, trace + [c]))
         return out
+
+    def find_prefixed(self, token_str):
+        """
+        Given a token_str, return all the keys that start with a string of token_str (the strings included).
+        token_str is walked as in find, then every key below where it ends is collected, in one
+        native call (FrozenCharTrie.find_prefixed).
+        """
+        out = self.trie.find_prefixed(self._to_bytes(token_str))
+
+        # keys are stored as utf-8, the chars walked are its bytes
+        ret = []
+        for key in out:
+            try:
+                ret.append(key.encode('latin-1').decode('utf-8'))
+            except UnicodeError:
+                pass
+        return ret
@@ -18,15 +18,18 @@ values[6] = VALUE // this word is legal
 
 Node* _add_root_node(){
     Node* trie = malloc(sizeof(Node));
-    trie->choices = NULL;
-    trie->children = NULL;
+    trie->choices = 0;
+    trie->children = 0;
     trie->value = EMPTY_VALUE;
+    trie->min_value = EMPTY_VALUE;
     return trie;
 }
 
 int _add_choice(Node* node, const char chr){
-    int insert_position;
-    char* choices = node->choices;
+    int insert_position, i;
+    char* choices = NODE_CHOICES(node);
+    Node* children = NODE_CHILDREN(node);
+    intptr_t moved = (intptr_t)children;
     if(choices != NULL){
         insert_position = strlen(choices);
         choices = realloc(choices, (insert_position+2) * sizeof(*choices));
@@ -36,11 +39,19 @@ int _add_choice(Node* node, const char chr){
     }
     choices[insert_position] = chr;
     choices[insert_position+1] = 0;
-    node->choices = choices;
-    node->children = (Node*)realloc(node->children, (insert_position+1) * sizeof(*node->children));
-    node->children[insert_position].choices = NULL;
-    node->children[insert_position].children = NULL;
-    node->children[insert_position].value = EMPTY_VALUE;
+    SET_NODE_CHOICES(node, choices);
+    children = (Node*)realloc(children, (insert_position+1) * sizeof(*children));
+    // offsets of the children are from where they were before realloc
+    moved -= (intptr_t)children;
+    for(i=0; i<insert_position; i++){
+        if(children[i].choices) children[i].choices += moved;
+        if(children[i].children) children[i].children += moved;
+    }
+    SET_NODE_CHILDREN(node, children);
+    children[insert_position].choices = 0;
+    children[insert_position].children = 0;
+    children[insert_position].value = EMPTY_VALUE;
+    children[insert_position].min_value = EMPTY_VALUE;
     return insert_position;
 }
 
@@ -55,16 +66,16 @@ int trie_find_word(Node *trie, const char* str){
     Node *next_pos = trie;
     const char* ptr = str;
     for(; *ptr; ptr++){
-        if(!next_pos || !next_pos->choices){
+        if(!next_pos || !NODE_CHOICES(next_pos)){
             return ~(ptr-str);
         }else{ // trying prefixes
-            char* choices = next_pos->choices;
+            char* choices = NODE_CHOICES(next_pos);
             char* found = strchr(choices, *ptr);
             if(found == NULL){
                 return ~(ptr-str);
             }else{
                 last_branch = (found - choices) / sizeof(*choices);
-                next_pos = next_pos->children + last_branch;
+                next_pos = NODE_CHILDREN(next_pos) + last_branch;
             }
         }
     }
@@ -84,12 +95,12 @@ int* trie_find_prefixes(Node *trie, const char* str){
         if(!next_pos){
             target[0] = counter;
             return target;
-        }else if(!next_pos->choices){
+        }else if(!NODE_CHOICES(next_pos)){
             target[++counter] = next_pos->value;
             target[0] = counter;
             return target;
         }else{ // trying prefixes
-            char* choices = next_pos->choices;
+            char* choices = NODE_CHOICES(next_pos);
             char* found = strchr(choices, *ptr);
             target[++counter] = next_pos->value;
             if(found == NULL){
@@ -97,7 +108,7 @@ int* trie_find_prefixes(Node *trie, const char* str){
                 return target;
             }else{
                 last_branch = (found - choices) / sizeof(*choices);
-                next_pos = next_pos->children + last_branch;
+                next_pos = NODE_CHILDREN(next_pos) + last_branch;
             }
         }
     }
@@ -113,7 +124,7 @@ Node* trie_add_word(Node *trie, const char* str){
     Node *next_pos = trie;
     const char* ptr;
     for(ptr = str; *ptr; ptr++){
-        char* choices = next_pos->choices;
+        char* choices = NODE_CHOICES(next_pos);
         char* found = NULL;
         if(choices != NULL){
             found = strchr(choices, *ptr);
@@ -123,7 +134,7 @@ Node* trie_add_word(Node *trie, const char* str){
         }else{
             last_branch = (found - choices) / sizeof(*choices);
         }
-        next_pos = next_pos->children+last_branch;
+        next_pos = NODE_CHILDREN(next_pos)+last_branch;
     }
     return next_pos;
 }
@@ -143,7 +154,7 @@ int contains_char(Node **ptr_node, int next){
     Node *node = *ptr_node;
 
     int last_branch=0;
-    char* choices = node->choices;
+    char* choices = NODE_CHOICES(node);
     if (!choices){
         return 0; //you can return null as well
     }
@@ -152,7 +163,7 @@ int contains_char(Node **ptr_node, int next){
         return 0; // you can return null as well
     }
     last_branch = (found - choices) / sizeof(*choices);
-    *ptr_node = (Node *)(node->children + last_branch);
+    *ptr_node = (Node *)(NODE_CHILDREN(node) + last_branch);
     return 1;
     
 }
@@ -162,7 +173,7 @@ void copy_to(Node **from_state, Node **to_state){
 }
 
 void node_print(Node **n){
-    printf("%s\n", (*n)->choices);
+    printf("%s\n", NODE_CHOICES(*n));
 }
 
 Node** initialize_state(Node *s){
@@ -182,20 +193,20 @@ int c_is_leaf(Node **ptr){
 /**** Modification Ends****/
 
 void _trie_print(Node* trie, int depth){
-    if(trie && trie->choices){
+    if(trie && NODE_CHOICES(trie)){
         char* c;
         int i = 0, j;
         if(trie->value != -1){
             printf(" -> %d\n", trie->value);
         }
-        for(c = trie->choices; *c; c++, i++){
+        for(c = NODE_CHOICES(trie); *c; c++, i++){
             if(i || trie->value != -1){
                 for(j=0; j<depth; j++){
                     printf(".");
                 }
             }
             printf("%c", *c);
-            _trie_print(trie->children+i, depth+1);
+            _trie_print(NODE_CHILDREN(trie)+i, depth+1);
         }
     }else{
         if(trie->value != -1){
@@ -210,16 +221,16 @@ void trie_print(Node* node){
 
 void trie_delete(Node* node){
     if(node){
-        Node* next = node->children;
-        char* c = node->choices;
+        Node* next = NODE_CHILDREN(node);
+        char* c = NODE_CHOICES(node);
         if(c){
             for(; *c; c++, next++){
-                if(next->choices != NULL){
+                if(NODE_CHOICES(next) != NULL){
                     trie_delete(next);
                 }
             }
-            free(node->choices);
-            free(node->children);
+            free(NODE_CHOICES(node));
+            free(NODE_CHILDREN(node));
         }
     }
 }
@@ -231,11 +242,11 @@ void trie_destroy(Trie* trie){
 }
 
 int node_size(Node* node){
-    if(node->choices){
-        int i, len_choices=strlen(node->choices), sum=1;
-        if(node->children){
+    if(NODE_CHOICES(node)){
+        int i, len_choices=strlen(NODE_CHOICES(node)), sum=1;
+        if(NODE_CHILDREN(node)){
             for(i=0; i<len_choices; i++){
-                Node* next = node->children + i;
+                Node* next = NODE_CHILDREN(node) + i;
                 sum += node_size(next);
             }
         }
@@ -252,16 +263,16 @@ int node_save(Node* node, char* stream){ // returns offset
             memcpy(stream+offset, &node->value, sizeof(node->value));
         }
         offset += sizeof(node->value);
-        if(node->choices){
-            int i, len = strlen(node->choices);
+        if(NODE_CHOICES(node)){
+            int i, len = strlen(NODE_CHOICES(node));
             if(stream){
-                memcpy(stream+offset, node->choices, len+1);
+                memcpy(stream+offset, NODE_CHOICES(node), len+1);
             }
             offset += len + 1;
             for(i=0; i<len; i++){
                 Node* subnode = NULL;
-                if(node->children){
-                    subnode = node->children + i;
+                if(NODE_CHILDREN(node)){
+                    subnode = NODE_CHILDREN(node) + i;
                 }else{
                 }
                 if(stream){
@@ -315,24 +326,28 @@ int node_load(Node* node, LoadPosition *position, char* stream){ // returns offs
     int offset = 0;
     memcpy(&node->value, stream + offset, sizeof(node->value));
     offset += sizeof(node->value);
+    node->min_value = node->value;
     if(*(stream+offset)){
         int i, len = strlen(stream + offset);
         memcpy(position->chars, stream + offset, len + 1);
         offset += len + 1;
         
-        node->choices = position->chars;
-        node->children = position->root;
+        SET_NODE_CHOICES(node, position->chars);
+        SET_NODE_CHILDREN(node, position->root);
 
         position->chars += len + 1;
         position->root += len;
         
         for(i=0; i<len; i++){
-            Node* child = node->children+i;
+            Node* child = NODE_CHILDREN(node)+i;
             offset += node_load(child, position, stream+offset);
+            if(child->min_value != EMPTY_VALUE && (node->min_value == EMPTY_VALUE || child->min_value < node->min_value)){
+                node->min_value = child->min_value;
+            }
         }
     }else{
-        node->children = NULL;
-        node->choices = NULL;
+        node->children = 0;
+        node->choices = 0;
         offset += 1;
     }
     return offset;
@@ -350,8 +365,8 @@ FrozenTrie* trie_load(char* stream){
     printf("Loading: %d bytes, %d chars, %d nodes\n", size, ftrie->char_count, ftrie->node_count);
 #endif
     fflush(stdout);
-    ftrie->root = malloc(ftrie->node_count * sizeof(Node));
-    ftrie->chars = malloc(ftrie->char_count);
+    ftrie->root = malloc(ftrie->node_count * sizeof(Node) + ftrie->char_count);
+    ftrie->chars = (char*)(ftrie->root + ftrie->node_count);
     lp.root = ftrie->root;
     lp.chars = ftrie->chars;
     root = lp.root++;
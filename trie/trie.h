@@ -9,14 +9,25 @@ choice_links[6] = {9641}
 values[6] = VALUE
 */
 
+#include <stdint.h>
+
 #pragma pack(push,1)
 
+// choices and children are offsets from the node (0 for none), not pointers: a frozen trie
+// is one block that can be saved as is, and mapped back at any address.
+// min_value is the smallest value in the subtree of the node, only kept by a frozen trie
 typedef struct Node {
     int value;
-    char *choices;
-    struct Node* children;
+    int min_value;
+    intptr_t choices;
+    intptr_t children;
 } Node;
 
+#define NODE_CHOICES(node) ((node)->choices ? (char*)(node) + (node)->choices : NULL)
+#define NODE_CHILDREN(node) ((node)->children ? (Node*)((char*)(node) + (node)->children) : NULL)
+#define SET_NODE_CHOICES(node, ptr) ((node)->choices = (ptr) ? (char*)(ptr) - (char*)(node) : 0)
+#define SET_NODE_CHILDREN(node, ptr) ((node)->children = (ptr) ? (char*)(ptr) - (char*)(node) : 0)
+
 typedef struct Trie {
     Node* root;
 } Trie;
@@ -30,7 +41,7 @@ typedef struct SerialTrie {
 } SerialTrie;
 
 typedef struct FrozenTrie {
-    Node* root;
+    Node* root; // one block, the nodes then the chars
     char* chars;
     unsigned int node_count; // == len(nodes)
     unsigned int char_count; // == len(chars)